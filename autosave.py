@@ -0,0 +1,98 @@
+"""Debounced autosave of the planner on a worker thread.
+
+Every change is already journaled by PlannerStorage when it happens. The
+autosaver folds the journal into a fresh snapshot shortly after a burst of
+changes settles. Each change restarts a ``root.after`` timer. When the timer
+fires, the Tk thread only rotates the journal segment and takes a shallow
+copy of the state. A BackgroundJob serializes that copy and writes it
+atomically (temp file + rename), so the Tk thread never waits on the disk
+and a crash mid-write leaves the previous snapshot and the journal intact.
+A failed write is retried with a growing delay until one succeeds; on_error
+is told once per run of failures.
+"""
+
+from background_jobs import BackgroundJob
+
+# Quiet period after the last change before the snapshot is written
+AUTOSAVE_DELAY_MS = 2000
+# Longest wait between retries of a failed write
+MAX_RETRY_DELAY_MS = 60000
+
+
+class Autosaver:
+    def __init__(
+        self, root, storage, capture, delay_ms=AUTOSAVE_DELAY_MS, on_error=None
+    ):
+        # capture() runs on the Tk thread and returns (tasks, goals) for the
+        # snapshot: data the Tk thread will not mutate afterwards. tasks may
+        # be a lazy iterable of task dicts; it is consumed on the worker.
+        self.root = root
+        self.storage = storage
+        self.capture = capture
+        self.delay_ms = delay_ms
+        self.on_error = on_error
+        self._after_id = None
+        self._job = None
+        self._dirty = False
+        # Delay before the next retry; 0 while the last write succeeded
+        self._retry_ms = 0
+
+    @property
+    def pending(self):
+        return self._after_id is not None or self._job is not None
+
+    def changed(self):
+        """Note a change; the snapshot is written once changes pause."""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+        self._after_id = self.root.after(self.delay_ms, self.save)
+
+    def save(self):
+        self._after_id = None
+        if self._job is not None:
+            # One write at a time; this burst is saved when it finishes
+            self._dirty = True
+            return
+        covered = self.storage.begin_compaction()
+        tasks, goals = self.capture()
+        self._job = BackgroundJob(
+            self.root,
+            lambda progress, cancel_event: self.storage.finish_compaction(
+                covered, tasks, goals
+            ),
+            on_done=self._finished,
+            on_error=self._failed,
+        ).start()
+
+    def close(self):
+        """Drop the pending timer and wait for a write in progress.
+
+        Changes not yet in a snapshot are still in the journal and are
+        replayed on the next start.
+        """
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        if self._job is not None:
+            self._job.join()
+            self._job = None
+
+    def _finished(self, _):
+        self._job = None
+        self._retry_ms = 0
+        if self._dirty:
+            self._dirty = False
+            self.changed()
+
+    def _failed(self, error):
+        self._job = None
+        # The journal still holds every change, including those made during
+        # the write, so the retry's snapshot covers them all
+        self._dirty = False
+        first_failure = not self._retry_ms
+        self._retry_ms = min(max(2 * self._retry_ms, self.delay_ms), MAX_RETRY_DELAY_MS)
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+        self._after_id = self.root.after(self._retry_ms, self.save)
+        if first_failure and self.on_error is not None:
+            self.on_error(error)
@@ -0,0 +1,95 @@
+"""Run slow work on a worker thread without blocking the Tk mainloop.
+
+The worker never touches Tk. Progress and completion are passed through a
+queue that the Tk thread drains from a ``root.after`` poll, so every callback
+runs on the Tk thread.
+"""
+
+import queue
+import threading
+
+
+class Cancelled(Exception):
+    """Raised inside a job once cancellation has been requested."""
+
+
+class BackgroundJob:
+    def __init__(
+        self,
+        root,
+        target,
+        on_done=None,
+        on_progress=None,
+        on_error=None,
+        on_cancel=None,
+        poll_ms=50,
+    ):
+        # target(progress, cancel_event) runs on the worker thread; it calls
+        # progress(fraction) as it goes and should raise Cancelled (or just
+        # return) once cancel_event is set.
+        self.root = root
+        self.target = target
+        self.on_done = on_done
+        self.on_progress = on_progress
+        self.on_error = on_error
+        self.on_cancel = on_cancel
+        self.poll_ms = poll_ms
+        self.cancel_event = threading.Event()
+        self.finished = False
+        self._events = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @property
+    def running(self):
+        return not self.finished
+
+    def start(self):
+        self._thread.start()
+        self.root.after(self.poll_ms, self._poll)
+        return self
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def join(self, timeout=None):
+        """Wait for the worker thread; only for shutdown, as it blocks Tk."""
+        self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            result = self.target(self._report_progress, self.cancel_event)
+        except Cancelled:
+            self._events.put(("cancelled", None))
+        except Exception as error:
+            self._events.put(("error", error))
+        else:
+            if self.cancel_event.is_set():
+                self._events.put(("cancelled", None))
+            else:
+                self._events.put(("done", result))
+
+    def _report_progress(self, fraction):
+        if self.cancel_event.is_set():
+            raise Cancelled()
+        self._events.put(("progress", fraction))
+
+    def _poll(self):
+        while True:
+            try:
+                kind, value = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                if self.on_progress:
+                    self.on_progress(value)
+                continue
+            self.finished = True
+            callback = {
+                "done": self.on_done,
+                "error": self.on_error,
+                "cancelled": self.on_cancel,
+            }[kind]
+            if callback:
+                callback(value)
+            return
+        self.root.after(self.poll_ms, self._poll)
@@ -0,0 +1 @@
+"""Benchmarks for the Daily Planner. Run them as ``python -m benchmarks.<name>``."""
@@ -0,0 +1,89 @@
+"""Platypus vs canvas PDF backend, side by side.
+
+For each row count the planner (tasks) and the invoice (billable days) are
+rendered with both backends, each as one table and streamed in PAGE_ROWS
+chunks. The best of ``--repeat`` runs is reported with the rows per second
+and the canvas backend's speedup over platypus in the same mode.
+
+    python -m benchmarks.bench_canvas --rows 10000,25000
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.datagen import make_billable_days, make_snapshot
+from generate_invoice import generate_invoice_pdf
+from pdf_canvas import BACKENDS, PLATYPUS
+from pdf_stream import PAGE_ROWS
+from planner_pdf import render_planner
+
+INVOICE_DATE = datetime(2025, 1, 1)
+
+
+def best_time(render, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        render()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", default="10000,25000")
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="planner-bench-")
+    pdf_path = os.path.join(workdir, "out.pdf")
+    try:
+        print(
+            f"{'document':>9} {'rows':>7} {'mode':>9} {'backend':>9} "
+            f"{'seconds':>8} {'rows/s':>9} {'speedup':>8}"
+        )
+        for count in (int(rows) for rows in args.rows.split(",")):
+            snapshot = make_snapshot(count)
+            work_entries = make_billable_days(count)
+            documents = (
+                (
+                    "planner",
+                    lambda chunk_rows, backend: render_planner(
+                        pdf_path, snapshot, chunk_rows=chunk_rows, backend=backend
+                    ),
+                ),
+                (
+                    "invoice",
+                    lambda chunk_rows, backend: generate_invoice_pdf(
+                        work_entries,
+                        10000,
+                        chunk_rows=chunk_rows,
+                        output_path=pdf_path,
+                        invoice_date=INVOICE_DATE,
+                        backend=backend,
+                    ),
+                ),
+            )
+            for document, render in documents:
+                for mode, chunk_rows in (("table", None), ("streamed", PAGE_ROWS)):
+                    seconds = {}
+                    for backend in BACKENDS:
+                        seconds[backend] = best_time(
+                            lambda: render(chunk_rows, backend), args.repeat
+                        )
+                        speedup = seconds[PLATYPUS] / seconds[backend]
+                        print(
+                            f"{document:>9} {count:>7} {mode:>9} {backend:>9} "
+                            f"{seconds[backend]:>8.2f} {count / seconds[backend]:>9,.0f} "
+                            f"{speedup:>7.1f}x"
+                        )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
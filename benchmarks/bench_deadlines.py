@@ -0,0 +1,71 @@
+"""Deadline queries: the sorted deadline index vs. reparsing every due date.
+
+For every size the store is filled once, then each deadline view (overdue,
+due today, due this week) and "next due" is answered from the index and by
+a scan that parses every task's due date string, as the table used to.
+
+    python -m benchmarks.bench_deadlines --sizes 100000,1000000
+"""
+
+import argparse
+import time
+from datetime import date
+
+from benchmarks.datagen import make_tasks
+from due_dates import DEADLINE_VIEWS, deadline_range, parse_due_date
+from task_store import TaskStore
+
+
+def scan_between(store, first, last):
+    low = float("-inf") if first is None else first
+    high = float("inf") if last is None else last
+    found = []
+    for record in store:
+        due = parse_due_date(record.due_date)
+        if due is not None and low <= due <= high:
+            found.append(record)
+    return found
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - started, len(result)
+
+
+def bench_size(count):
+    store = TaskStore()
+    started = time.perf_counter()
+    store.extend(make_tasks(count))
+    load = time.perf_counter() - started
+    today = date.today().toordinal()
+
+    rows = []
+    for view in DEADLINE_VIEWS:
+        first, last = deadline_range(view)
+        indexed, matches = timed(store.due_between, first, last)
+        scanned, _ = timed(scan_between, store, first, last)
+        rows.append((view, matches, indexed, scanned))
+    indexed, matches = timed(store.next_due, today)
+    scanned, _ = timed(scan_between, store, today, None)
+    rows.append(("Next due", matches, indexed, scanned))
+    return load, rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100000,1000000")
+    args = parser.parse_args(argv)
+
+    for count in (int(size) for size in args.sizes.split(",")):
+        load, rows = bench_size(count)
+        print(f"{count} tasks, loaded in {load:.2f}s")
+        for view, matches, indexed, scanned in rows:
+            print(
+                f"  {view:>10}: {matches:>8} tasks  index {indexed * 1e3:8.3f}ms  "
+                f"scan {scanned * 1e3:9.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Bulk import vs. adding the same rows one task at a time.
+
+Writes a CSV of ``size`` tasks (one in ten repeated) and measures:
+
+* batch: read_import + apply_import, i.e. a streamed parse, set dedup, one
+  TaskStore.extend, one journal write and one search index update
+* per-task: for every row, the duplicate check, journal write, store insert
+  and index update that "Add Task" does
+
+    python -m benchmarks.bench_import --sizes 1000,100000
+"""
+
+import argparse
+import csv
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.datagen import make_tasks
+from planner_import import apply_import, read_import
+from planner_io import TASK_FIELDS, iter_planner_rows, normalize_task
+from planner_storage import GOAL_TYPES, PlannerStorage
+from search_index import PlannerSearch
+from task_store import TaskStore
+
+
+def write_csv(path, count):
+    tasks = make_tasks(count)
+    with open(path, "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.DictWriter(csv_file, TASK_FIELDS)
+        writer.writeheader()
+        writer.writerows(tasks)
+        writer.writerows(tasks[::10])
+
+
+def planner(data_dir):
+    storage = PlannerStorage(data_dir, compact_after=float("inf"))
+    storage.load()
+    store = TaskStore()
+    goals = {goal_type: [] for goal_type in GOAL_TYPES}
+    return storage, store, goals, PlannerSearch(store, goals)
+
+
+def batch(path, data_dir):
+    storage, store, goals, search = planner(data_dir)
+    result = apply_import(read_import(path), store, goals, storage)
+    search.add_tasks(result.tasks)
+    storage.close()
+    return len(store)
+
+
+def per_task(path, data_dir):
+    storage, store, goals, search = planner(data_dir)
+    for row in iter_planner_rows(path):
+        task_info = normalize_task(row)
+        if (task_info["frequency"], task_info["task"]) in store:
+            continue
+        storage.add_task(task_info)
+        search.add_task(store.add(**task_info))
+    storage.close()
+    return len(store)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,100000")
+    args = parser.parse_args(argv)
+
+    for count in (int(size) for size in args.sizes.split(",")):
+        work_dir = tempfile.mkdtemp(prefix="planner-bench-")
+        try:
+            path = os.path.join(work_dir, "tasks.csv")
+            write_csv(path, count)
+            print(f"{count} tasks ({os.path.getsize(path) / 1024:.0f} KiB)")
+            for name, run in (("batch", batch), ("per-task", per_task)):
+                data_dir = os.path.join(work_dir, name)
+                started = time.perf_counter()
+                imported = run(path, data_dir)
+                elapsed = time.perf_counter() - started
+                print(f"  {name:>8}: {elapsed * 1e3:9.1f}ms  {imported} imported")
+        finally:
+            shutil.rmtree(work_dir)
+
+
+if __name__ == "__main__":
+    main()
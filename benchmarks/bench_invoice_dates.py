@@ -0,0 +1,64 @@
+"""Work-entry aggregation: the old three-pass path vs summarize_work_entries.
+
+The legacy path is what generate_invoice_pdf used to do: a set of raw date
+strings for the day count, then ``strptime`` on every entry while grouping
+into a defaultdict, then a sort. Entries are spread over two years, so date
+strings repeat heavily, as they do in real timesheet imports.
+
+    python -m benchmarks.bench_invoice_dates --entries 100000,1000000
+"""
+
+import argparse
+import time
+from collections import defaultdict
+from datetime import datetime
+
+from benchmarks.datagen import make_work_entries
+from generate_invoice import summarize_work_entries
+
+DAILY_RATE = 10000
+
+
+def legacy_summary(work_entries, daily_rate):
+    unique_dates = {entry[0] for entry in work_entries}
+    num_days = len(unique_dates)
+    total_amount = num_days * daily_rate
+
+    daily_summary = defaultdict(list)
+    for date_str, description in work_entries:
+        date_obj = datetime.strptime(date_str, "%d/%m/%y")
+        daily_summary[date_obj].append(description)
+
+    return num_days, total_amount, sorted(daily_summary.items())
+
+
+def best_of(repeat, function, *args):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", default="100000,1000000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'entries':>9} {'legacy s':>9} {'single-pass s':>14} {'speedup':>8}")
+    for count in (int(entries) for entries in args.entries.split(",")):
+        work_entries = make_work_entries(count)
+        legacy, expected = best_of(
+            args.repeat, legacy_summary, work_entries, DAILY_RATE
+        )
+        fast, summary = best_of(
+            args.repeat, summarize_work_entries, work_entries, DAILY_RATE
+        )
+        assert tuple(summary) == expected
+        print(f"{count:>9} {legacy:>9.3f} {fast:>14.3f} {legacy / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
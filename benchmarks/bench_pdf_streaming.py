@@ -0,0 +1,84 @@
+"""Memory and time of single-table vs streamed, chunked PDF export.
+
+For each row count the planner (tasks) and the invoice (billable days) are
+rendered once as one big table and once streamed in PAGE_ROWS-sized chunk
+tables. Wall time is measured without tracing; peak Python memory is taken
+from a second, traced run. Streamed peaks still grow slowly with the row
+count because ReportLab keeps the compressed page streams in memory until
+the file is saved; the story itself stays a few pages long.
+
+    python -m benchmarks.bench_pdf_streaming --rows 1000,5000,10000
+"""
+
+import argparse
+import gc
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.datagen import make_billable_days, make_snapshot
+from pdf_stream import PAGE_ROWS
+from planner_pdf import render_planner
+
+
+def render_invoice(work_entries, chunk_rows):
+    from generate_invoice import generate_invoice_pdf
+
+    generate_invoice_pdf(work_entries, 10000, chunk_rows=chunk_rows)
+
+
+def timed(render):
+    gc.collect()
+    started = time.perf_counter()
+    render()
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    tracemalloc.start()
+    render()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", default="1000,5000,10000")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="planner-bench-")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        print(f"{'document':>9} {'rows':>7} {'mode':>9} {'seconds':>8} {'peak MB':>8}")
+        for count in (int(rows) for rows in args.rows.split(",")):
+            snapshot = make_snapshot(count)
+            work_entries = make_billable_days(count)
+            cases = [
+                ("planner", "table", lambda: render_planner("p.pdf", snapshot)),
+                (
+                    "planner",
+                    "streamed",
+                    lambda: render_planner("p.pdf", snapshot, chunk_rows=PAGE_ROWS),
+                ),
+                ("invoice", "table", lambda: render_invoice(work_entries, None)),
+                (
+                    "invoice",
+                    "streamed",
+                    lambda: render_invoice(work_entries, PAGE_ROWS),
+                ),
+            ]
+            for document, mode, render in cases:
+                elapsed, peak = timed(render)
+                print(
+                    f"{document:>9} {count:>7} {mode:>9} {elapsed:>8.2f}"
+                    f" {peak / 2**20:>8.1f}"
+                )
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
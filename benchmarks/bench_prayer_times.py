@@ -0,0 +1,51 @@
+"""Prayer time lookups: memoized year table vs. computing each day.
+
+Reports the cost of precomputing one year for a location, a day lookup from
+the memoized table, and computing a day's times from scratch.
+
+    python -m benchmarks.bench_prayer_times --lookups 100000
+"""
+
+import argparse
+import time
+from datetime import date
+
+from prayer_times import DEFAULT_SETTINGS, compute_times, day_times, year_table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lookups", type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    year = date.today().year
+    first = date(year, 1, 1).toordinal()
+    days = [first + number % 365 for number in range(args.lookups)]
+
+    year_table.cache_clear()
+    started = time.perf_counter()
+    table = year_table(DEFAULT_SETTINGS, year)
+    precompute = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for day in days:
+        day_times(day)
+    lookup = (time.perf_counter() - started) / len(days)
+
+    sample = days[:1000]
+    started = time.perf_counter()
+    for day in sample:
+        compute_times(date.fromordinal(day), DEFAULT_SETTINGS)
+    compute = (time.perf_counter() - started) / len(sample)
+
+    print(f"{DEFAULT_SETTINGS}")
+    print(
+        f"  year table: {precompute * 1e3:8.2f}ms, "
+        f"{table.itemsize * len(table)} bytes"
+    )
+    print(f"      lookup: {lookup * 1e6:8.2f}us/day")
+    print(f"     compute: {compute * 1e6:8.2f}us/day")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Throughput of quantity extraction from invoice work descriptions.
+
+For each size this times, on a cold parse cache:
+
+* uncached: read_description on every description
+* iter_work_items: streaming the ``(date, WorkItem)`` records of a ledger
+* summarize_materials: the per-size material totals
+
+It does this for ledger-like descriptions, where few distinct texts repeat,
+and for descriptions that are nearly all distinct, the cache's worst case.
+
+    python -m benchmarks.bench_quantities --sizes 100000,1000000
+"""
+
+import argparse
+import random
+import time
+from collections import deque
+
+from benchmarks.datagen import PIPE_SIZES, make_work_entries
+from work_quantities import (
+    iter_work_items,
+    parse_description,
+    read_description,
+    summarize_materials,
+)
+
+
+def distinct_entries(count, seed=0):
+    """Work entries whose descriptions almost never repeat."""
+    rng = random.Random(seed)
+    return [
+        (
+            "1/1/25",
+            f"{rng.randint(1, 100_000)} joints for {rng.choice(PIPE_SIZES)} pipes, "
+            f"{rng.randint(1, 100_000)} t joints for {rng.choice(PIPE_SIZES)}",
+        )
+        for _ in range(count)
+    ]
+
+
+def uncached(work_entries):
+    for _, description in work_entries:
+        read_description(description)
+
+
+def stream(work_entries):
+    # Consume the generator without keeping the records
+    deque(iter_work_items(work_entries), maxlen=0)
+
+
+def summarize(work_entries):
+    summarize_materials(description for _, description in work_entries)
+
+
+def timed(function, work_entries):
+    parse_description.cache_clear()
+    started = time.perf_counter()
+    function(work_entries)
+    return time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100000,1000000")
+    args = parser.parse_args(argv)
+
+    cases = (
+        ("uncached", uncached),
+        ("iter_work_items", stream),
+        ("summarize_materials", summarize),
+    )
+    print(
+        f"{'descriptions':>12} {'kind':<9} {'case':<20} {'time':>9} {'per second':>12}"
+    )
+    for count in (int(size) for size in args.sizes.split(",")):
+        for kind, work_entries in (
+            ("ledger", make_work_entries(count)),
+            ("distinct", distinct_entries(count)),
+        ):
+            for name, function in cases:
+                seconds = timed(function, work_entries)
+                print(
+                    f"{count:>12} {kind:<9} {name:<20} {seconds:8.2f}s "
+                    f"{count / seconds:>12,.0f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
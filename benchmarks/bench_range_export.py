@@ -0,0 +1,95 @@
+"""Rendering a year of daily planners, shared vs. per-day work.
+
+Three ways of producing ``--days`` daily planners (365 by default):
+
+* one PDF: render_planner_range, with one page (or more) per day
+* per-day files, shared: render_planner_days
+* per-day files, naive: for every day, rescan every task to find the ones
+  due that day, then call render_planner, which rebuilds the legend, goal
+  and prayer tables each time
+
+    python -m benchmarks.bench_range_export --days 365 --tasks 60
+"""
+
+import argparse
+import calendar
+import os
+import tempfile
+import time
+from datetime import date
+
+from benchmarks.datagen import make_tasks
+from due_dates import parse_due_date
+from planner_pdf import render_planner, render_planner_days, render_planner_range
+from planner_snapshot import PlannerSnapshot
+
+
+def due_on(task_info, when):
+    # The recurrence rule, applied one task at a time
+    if task_info.frequency == "Daily":
+        return True
+    due = parse_due_date(task_info.due_date)
+    if task_info.frequency == "Weekly":
+        weekday = 0 if due is None else date.fromordinal(due).weekday()
+        return weekday == when.weekday()
+    day = 1 if due is None else date.fromordinal(due).day
+    month_length = calendar.monthrange(when.year, when.month)[1]
+    return day == when.day or (when.day == month_length and day > month_length)
+
+
+def naive_days(out_dir, snapshot, first, last):
+    for day in range(first, last + 1):
+        when = date.fromordinal(day)
+        day_snapshot = snapshot._replace(
+            date=when.isoformat(),
+            tasks_by_frequency=tuple(
+                (frequency, tuple(row for row in rows if due_on(row, when)))
+                for frequency, rows in snapshot.tasks_by_frequency
+            ),
+        )
+        render_planner(
+            os.path.join(out_dir, f"DailyPlanner_{when.isoformat()}.pdf"),
+            day_snapshot,
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--tasks", type=int, default=60)
+    args = parser.parse_args(argv)
+
+    snapshot = PlannerSnapshot.from_dicts(
+        make_tasks(args.tasks),
+        {"Week": ["Ship it"], "Month": ["Review"], "Year": ["Grow"]},
+    )
+    first = date.today().toordinal()
+    last = first + args.days - 1
+
+    with tempfile.TemporaryDirectory(prefix="planner-bench-") as out_dir:
+        runs = (
+            (
+                "one PDF",
+                lambda: render_planner_range(
+                    os.path.join(out_dir, "range.pdf"), snapshot, first, last
+                ),
+            ),
+            (
+                "per-day, shared",
+                lambda: render_planner_days(out_dir, snapshot, first, last),
+            ),
+            ("per-day, naive", lambda: naive_days(out_dir, snapshot, first, last)),
+        )
+        print(f"{args.days} days, {args.tasks} tasks")
+        for name, run in runs:
+            started = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - started
+            print(
+                f"  {name:>16}: {elapsed:7.2f}s  "
+                f"({elapsed / args.days * 1e3:6.1f} ms/day)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Expanding recurring tasks over a month and a year.
+
+For every size this compares:
+
+* plans: the per-day plans from the recurrence buckets, as a tuple
+* lazy: streaming every occurrence through the generator
+* materialized: building the full list of occurrences up front
+
+and reports the time and peak traced memory of each.
+
+    python -m benchmarks.bench_recurrence --sizes 1000,10000
+"""
+
+import argparse
+import time
+import tracemalloc
+from datetime import date
+
+from benchmarks.datagen import make_tasks
+from recurrence import Recurrence
+from task_store import FREQUENCIES, TaskStore
+
+
+def measure(function):
+    tracemalloc.start()
+    started = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def bench(count, days):
+    store = TaskStore()
+    store.extend(make_tasks(count))
+    recurrence = Recurrence(
+        (frequency, store.frequency_tasks(frequency)) for frequency in FREQUENCIES
+    )
+    first = date.today().toordinal()
+    last = first + days - 1
+
+    return {
+        "plans": measure(lambda: tuple(recurrence.expand(first, last))),
+        "lazy": measure(lambda: sum(1 for _ in recurrence.occurrences(first, last))),
+        "materialized": measure(lambda: list(recurrence.occurrences(first, last))),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000")
+    args = parser.parse_args(argv)
+
+    for count in (int(size) for size in args.sizes.split(",")):
+        for days in (31, 365):
+            print(f"{count} tasks over {days} days")
+            for name, (elapsed, peak) in bench(count, days).items():
+                print(
+                    f"  {name:>14}: {elapsed * 1e3:9.2f}ms  "
+                    f"peak {peak / 1024 / 1024:8.2f} MiB"
+                )
+
+
+if __name__ == "__main__":
+    main()
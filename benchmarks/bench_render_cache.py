@@ -0,0 +1,84 @@
+"""Save/close latency of the planner PDF with the render cache.
+
+For each size this times "Save as PDF" as the app runs it (snapshot capture
+plus render_planner with a RenderCache):
+
+* miss: nothing cached yet, so the PDF is built and stored
+* hit: unchanged planner, same output file (the close-after-save case)
+* hit, new file: unchanged planner, output file removed first
+* no cache: render_planner alone, for comparison
+
+    python -m benchmarks.bench_render_cache --sizes 100,1000,10000
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from benchmarks.datagen import make_goals, make_tasks
+from planner_pdf import render_planner
+from planner_snapshot import PlannerSnapshot
+from render_cache import RenderCache
+from task_store import TaskStore
+
+
+def save(store, goals, pdf_path, cache):
+    snapshot = PlannerSnapshot.capture(store, goals)
+    render_planner(pdf_path, snapshot, cache=cache)
+
+
+def timed(function, repeat, before=None):
+    times = []
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        started = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000,10000")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    work_dir = tempfile.mkdtemp(prefix="planner-bench-")
+    try:
+        pdf_path = os.path.join(work_dir, "DailyPlanner.pdf")
+        cache = RenderCache(os.path.join(work_dir, "cache"))
+        print(
+            f"{'tasks':>7} {'miss':>10} {'hit':>10} {'hit, new':>10} {'no cache':>10}"
+        )
+        for count in (int(size) for size in args.sizes.split(",")):
+            store = TaskStore()
+            store.extend(make_tasks(count))
+            goals = make_goals(30)
+            results = (
+                timed(
+                    lambda: save(store, goals, pdf_path, cache),
+                    args.repeat,
+                    before=cache.clear,
+                ),
+                timed(lambda: save(store, goals, pdf_path, cache), args.repeat),
+                timed(
+                    lambda: save(store, goals, pdf_path, cache),
+                    args.repeat,
+                    before=lambda: os.remove(pdf_path),
+                ),
+                timed(lambda: save(store, goals, pdf_path, None), 1),
+            )
+            print(
+                f"{count:>7} "
+                + " ".join(f"{seconds * 1e3:8.1f}ms" for seconds in results)
+            )
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == "__main__":
+    main()
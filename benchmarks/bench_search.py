@@ -0,0 +1,92 @@
+"""Type-ahead latency of the task search index.
+
+For every size the store and search index are built, then each query is
+"typed" one character at a time. Every keystroke runs a search and reads
+the first screenful of results, as the task table does. Also reported are
+the index build time, the cost of keeping the index up to date on
+add/delete, and a plain scan over all tasks for comparison.
+
+    python -m benchmarks.bench_search --sizes 1000,100000
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks.datagen import make_tasks
+from search_index import PlannerSearch, tokenize
+from task_store import TaskStore
+
+QUERIES = ("task 12345", "12:00", "task 9", "nothing here")
+SCREEN_ROWS = 30
+
+
+def scan(store, query):
+    words = tokenize(query)
+    return [
+        record
+        for record in store.sorted_tasks()
+        if all(
+            any(token.startswith(word) for token in tokenize(record.task))
+            or any(token.startswith(word) for token in tokenize(record.schedule))
+            for word in words
+        )
+    ]
+
+
+def bench_size(count):
+    store = TaskStore()
+    store.extend(make_tasks(count))
+    started = time.perf_counter()
+    search = PlannerSearch(store, {"Week": [], "Month": [], "Year": []})
+    build = time.perf_counter() - started
+
+    keystrokes = []
+    for query in QUERIES:
+        for length in range(1, len(query) + 1):
+            started = time.perf_counter()
+            search.find_tasks(query[:length])[:SCREEN_ROWS]
+            keystrokes.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for number in range(100):
+        record = store.add(f"Extra task {number}", schedule="9:00")
+        search.add_task(record)
+        search.remove_task(store.remove(*record.key))
+    update = (time.perf_counter() - started) / 200
+
+    started = time.perf_counter()
+    scan(store, QUERIES[0])
+    full_scan = time.perf_counter() - started
+
+    return {
+        "build": build,
+        "keystroke median": statistics.median(keystrokes),
+        "keystroke max": max(keystrokes),
+        "add/delete": update,
+        "scan": full_scan,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,100000")
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'tasks':>10} {'build':>10} {'key med':>10} {'key max':>10} "
+        f"{'add/del':>10} {'scan':>10}"
+    )
+    for count in (int(size) for size in args.sizes.split(",")):
+        result = bench_size(count)
+        print(
+            f"{count:>10} {result['build']:>9.3f}s "
+            f"{result['keystroke median'] * 1e3:>8.3f}ms "
+            f"{result['keystroke max'] * 1e3:>8.3f}ms "
+            f"{result['add/delete'] * 1e6:>8.1f}us "
+            f"{result['scan'] * 1e3:>8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
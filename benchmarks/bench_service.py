@@ -0,0 +1,233 @@
+"""Load test of planner_service over localhost.
+
+Starts the service in a child process on a free port, with a throwaway data
+and cache directory, seeds it with tasks and goals, then runs ``--clients``
+concurrent clients. Each client keeps one HTTP/1.1 connection open and
+sends requests picked at random from ``--mix`` until ``--requests`` have
+been sent in total. Client-side latencies and throughput are printed per
+request kind, followed by the service's own ``/metrics``.
+
+    python -m benchmarks.bench_service --clients 32 --requests 2000
+    python -m benchmarks.bench_service --url http://127.0.0.1:8765
+
+With ``--url`` an already running service is used instead (and seeded, so
+point it at a scratch data directory).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import quote, urlsplit
+
+from benchmarks.datagen import make_billable_days, make_goals, make_tasks
+from planner_service import percentile
+from task_store import FREQUENCIES
+
+REQUESTS = ("list", "search", "add", "done", "planner", "invoice")
+# How often each kind of request is sent by default
+DEFAULT_MIX = "list=50,search=20,add=15,done=10,planner=3,invoice=2"
+SEED_GOALS = 30
+INVOICE_DAYS = 60
+INVOICE_ENTRIES = [list(entry) for entry in make_billable_days(INVOICE_DAYS)]
+
+
+async def call(connection, method, path, data=None):
+    """Send one request on a kept-alive connection; returns (status, body)."""
+    reader, writer = connection
+    body = b"" if data is None else json.dumps(data).encode("utf-8")
+    writer.write(
+        (
+            f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+        ).encode("latin-1")
+        + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if not line.strip():
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+def parse_mix(text):
+    kinds, weights = [], []
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        kinds.append(kind.strip())
+        weights.append(float(weight or 1))
+    unknown = set(kinds) - set(REQUESTS)
+    if unknown:
+        raise ValueError(f"Unknown request kind: {', '.join(sorted(unknown))}")
+    return kinds, weights
+
+
+def request_for(kind, rng, counter, task_count):
+    """(method, path, body) of one request of ``kind``."""
+    if kind == "list":
+        return "GET", f"/tasks?offset={rng.randrange(0, 500)}&limit=40", None
+    if kind == "search":
+        return "GET", f"/tasks?query=task+{rng.randrange(1, 100)}&limit=40", None
+    if kind == "add":
+        return "POST", "/tasks", {"task": f"Load task {counter}", "due_date": "1/1"}
+    if kind == "done":
+        # The seeded tasks, with the frequencies make_tasks gave them
+        number = rng.randrange(max(task_count, 1))
+        task = quote(f"Task {number}", safe="")
+        frequency = FREQUENCIES[number % len(FREQUENCIES)]
+        return "PATCH", f"/tasks/{frequency}/{task}", {"done": rng.random() < 0.5}
+    if kind == "planner":
+        return "POST", "/planner.pdf", {}
+    return (
+        "POST",
+        "/invoice.pdf",
+        {"work_entries": INVOICE_ENTRIES, "daily_rate": 10000, "client": "Load"},
+    )
+
+
+async def seed(host, port, task_count):
+    connection = await asyncio.open_connection(host, port)
+    try:
+        for goal_type, goals_list in make_goals(SEED_GOALS).items():
+            for goal in goals_list:
+                await call(
+                    connection, "POST", "/goals", {"goal_type": goal_type, "goal": goal}
+                )
+        for task_info in make_tasks(task_count):
+            await call(connection, "POST", "/tasks", task_info)
+    finally:
+        connection[1].close()
+
+
+async def client(host, port, args, kinds, weights, remaining, results, seed_number):
+    rng = random.Random(seed_number)
+    connection = await asyncio.open_connection(host, port)
+    try:
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            kind = rng.choices(kinds, weights)[0]
+            method, path, data = request_for(
+                kind, rng, f"{seed_number}-{remaining[0]}", args.tasks
+            )
+            started = time.perf_counter()
+            status, _ = await call(connection, method, path, data)
+            results.setdefault(kind, []).append(
+                (time.perf_counter() - started, status >= 400)
+            )
+    finally:
+        connection[1].close()
+
+
+async def load_test(host, port, args):
+    kinds, weights = parse_mix(args.mix)
+    await seed(host, port, args.tasks)
+    results = {}
+    remaining = [args.requests]
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(
+            client(host, port, args, kinds, weights, remaining, results, number)
+            for number in range(args.clients)
+        )
+    )
+    elapsed = time.perf_counter() - started
+
+    total = sum(len(samples) for samples in results.values())
+    print(
+        f"{total} requests from {args.clients} clients in {elapsed:.2f}s "
+        f"({total / elapsed:.1f} req/s)"
+    )
+    print(
+        f"  {'kind':<8} {'count':>6} {'errors':>6} {'req/s':>8} "
+        f"{'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}"
+    )
+    for kind in kinds:
+        samples = results.get(kind, [])
+        times = sorted(seconds for seconds, _ in samples)
+        errors = sum(failed for _, failed in samples)
+        print(
+            f"  {kind:<8} {len(samples):>6} {errors:>6} {len(samples) / elapsed:>8.1f} "
+            + " ".join(
+                f"{percentile(times, fraction) * 1e3:7.1f}ms"
+                for fraction in (0.50, 0.95, 0.99, 1.0)
+            )
+        )
+
+    connection = await asyncio.open_connection(host, port)
+    try:
+        _, body = await call(connection, "GET", "/metrics")
+    finally:
+        connection[1].close()
+    metrics = json.loads(body)
+    print(f"service ({metrics['workers']} render workers):")
+    for route, stats in metrics["routes"].items():
+        print(
+            f"  {route:<22} {stats['count']:>6} "
+            f"p50 {stats['p50_ms']:7.1f}ms p99 {stats['p99_ms']:7.1f}ms"
+        )
+
+
+def start_service(work_dir, workers):
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "planner_service.py",
+            "--port",
+            "0",
+            "--workers",
+            str(workers),
+            "--data-dir",
+            os.path.join(work_dir, "data"),
+            "--cache-dir",
+            os.path.join(work_dir, "cache"),
+        ],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    line = process.stdout.readline()
+    if not line.startswith("Serving on "):
+        process.kill()
+        raise RuntimeError(f"The service did not start: {line!r}")
+    return process, line.split()[-1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="use a running service instead")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--tasks", type=int, default=1000, help="tasks seeded first")
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    work_dir = tempfile.mkdtemp(prefix="planner-bench-")
+    process = None
+    try:
+        url = args.url
+        if url is None:
+            process, url = start_service(work_dir, args.workers)
+        address = urlsplit(url)
+        asyncio.run(load_test(address.hostname, address.port, args))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        shutil.rmtree(work_dir)
+
+
+if __name__ == "__main__":
+    main()
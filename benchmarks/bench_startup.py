@@ -0,0 +1,109 @@
+"""Cold-start cost of the planner: import time and time to first window.
+
+Each measurement runs in a fresh interpreter so nothing is cached in-process:
+
+* ``python -X importtime`` on ``daily_planner_app`` (what the GUI pays before
+  the window exists) and on ``planner_pdf`` (the ReportLab stack that is
+  now loaded lazily);
+* time to first window: build ``DailyPlannerApp`` on an empty data
+  directory and process events until the window has been drawn. This part
+  needs a display and is skipped without one.
+
+    python -m benchmarks.bench_startup --runs 5 [--json startup.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+FIRST_WINDOW_SNIPPET = """
+import time
+started = time.perf_counter()
+import tkinter as tk
+from daily_planner_app import DailyPlannerApp
+root = tk.Tk()
+app = DailyPlannerApp(root)
+root.update()
+print(time.perf_counter() - started)
+root.destroy()
+"""
+
+
+def import_time(module):
+    """Return (cumulative seconds, imported module names) for ``module``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = 0
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = [field.strip() for field in line[len("import time:") :].split("|")]
+        if not fields[1].isdigit():
+            continue  # header line
+        name = fields[2].strip()
+        modules.append(name)
+        if name == module:
+            cumulative = int(fields[1]) / 1e6
+    return cumulative, modules
+
+
+def first_window_time(data_dir):
+    env = dict(os.environ, DAILY_PLANNER_DATA=data_dir)
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_WINDOW_SNIPPET],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--json", help="also write the results (in seconds) to this file"
+    )
+    args = parser.parse_args(argv)
+
+    results = {}
+    for module in ("daily_planner_app", "planner_pdf"):
+        timings = []
+        for _ in range(args.runs):
+            seconds, modules = import_time(module)
+            timings.append(seconds)
+        results[f"import {module}"] = statistics.median(timings)
+        if module == "daily_planner_app":
+            results["reportlab imported at startup"] = any(
+                name.startswith("reportlab") for name in modules
+            )
+
+    with tempfile.TemporaryDirectory(prefix="planner-bench-") as data_dir:
+        timings = [first_window_time(data_dir) for _ in range(args.runs)]
+    timings = [seconds for seconds in timings if seconds is not None]
+    results["first window"] = statistics.median(timings) if timings else None
+
+    for name, value in results.items():
+        if value is None:
+            value = "n/a (no display)"
+        elif isinstance(value, float):
+            value = f"{value * 1e3:.1f} ms"
+        print(f"{name:>32}: {value}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as json_file:
+            json.dump(results, json_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Startup and mutation latency of PlannerStorage from 10 to 1M records.
+
+For every size the benchmark writes a snapshot holding that many tasks plus a
+journal tail, then measures:
+
+* startup: ``PlannerStorage.load()`` followed by ``TaskStore.extend()``
+* append: the mean cost of journaling one add_task/delete_task/set_goal
+* rewrite: what a single mutation would cost if the whole planner were
+  rewritten instead of journaled (shown for comparison)
+
+    python -m benchmarks.bench_storage --sizes 10,1000,100000,1000000
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.datagen import make_tasks
+from planner_storage import PlannerStorage, write_snapshot
+from task_store import TaskStore
+
+
+def bench_size(count, tail, mutations):
+    data_dir = tempfile.mkdtemp(prefix="planner-bench-")
+    try:
+        tasks = make_tasks(count)
+        goals = {"Week": ["Ship it"], "Month": [], "Year": []}
+
+        started = time.perf_counter()
+        write_snapshot(os.path.join(data_dir, "snapshot.json"), 0, tasks, goals)
+        rewrite = time.perf_counter() - started
+
+        storage = PlannerStorage(data_dir, compact_after=float("inf"))
+        storage.load()
+        for number in range(tail):
+            storage.set_goal("Week", f"Tail goal {number}")
+        storage.close()
+
+        started = time.perf_counter()
+        storage = PlannerStorage(data_dir, compact_after=float("inf"))
+        saved_tasks, saved_goals = storage.load()
+        TaskStore().extend(saved_tasks)
+        startup = time.perf_counter() - started
+
+        extra = make_tasks(count + mutations)[count:]
+        started = time.perf_counter()
+        for task_info in extra:
+            storage.add_task(task_info)
+            storage.delete_task(task_info["frequency"], task_info["task"])
+        append = (time.perf_counter() - started) / (2 * mutations)
+        storage.close()
+        return startup, append, rewrite
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10,1000,100000,1000000")
+    parser.add_argument("--tail", type=int, default=1000, help="journal records")
+    parser.add_argument("--mutations", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    print(f"{'records':>10} {'startup ms':>12} {'append us':>10} {'rewrite ms':>11}")
+    for count in (int(size) for size in args.sizes.split(",")):
+        startup, append, rewrite = bench_size(count, args.tail, args.mutations)
+        print(
+            f"{count:>10} {startup * 1e3:>12.1f} {append * 1e6:>10.1f}"
+            f" {rewrite * 1e3:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Per-row cost of building the planner story, before and after the shared theme.
+
+The legacy path rebuilds the sample stylesheet for every Paragraph and a new
+coloured-dot Paragraph per row, as save_as_pdf used to. The shared path is
+planner_pdf.build_story with the module-level styles from pdf_theme. Only
+story construction is measured; doc.build is the same for both.
+
+    python -m benchmarks.bench_styles --tasks 10000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph
+
+from benchmarks.datagen import make_snapshot
+from planner_pdf import build_story
+from task_store import IMPORTANCE_COLORS
+
+
+def legacy_rows(snapshot):
+    rows = []
+    for frequency, frequency_tasks in snapshot.tasks_by_frequency:
+        for task_info in frequency_tasks:
+            importance_color = IMPORTANCE_COLORS[task_info.importance]
+            dot = f"<font color='{importance_color}'>\u25cf</font>"
+            rows.append(
+                [
+                    frequency,
+                    Paragraph(task_info.task, getSampleStyleSheet()["Normal"]),
+                    task_info.due_date,
+                    task_info.schedule,
+                    Paragraph(dot, getSampleStyleSheet()["Normal"]),
+                ]
+            )
+    return rows
+
+
+def measure(build, snapshot):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build(snapshot)
+    elapsed = time.perf_counter() - started
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, retained, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    snapshot = make_snapshot(args.tasks)
+    count = args.tasks
+    print(f"{count} tasks")
+    print(f"{'path':>8} {'us/row':>8} {'retained B/row':>15} {'peak B/row':>11}")
+    for name, build in (("legacy", legacy_rows), ("shared", build_story)):
+        elapsed, retained, peak = measure(build, snapshot)
+        print(
+            f"{name:>8} {elapsed / count * 1e6:>8.1f} {retained / count:>15.0f}"
+            f" {peak / count:>11.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
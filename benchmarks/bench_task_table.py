@@ -0,0 +1,100 @@
+"""Scroll and insert latency of the virtual task table at 1k to 1M tasks.
+
+For every size the task store is filled, the table is shown and then:
+
+* scroll: jump to random offsets and redraw the visible window
+* insert: add one task to the store and refresh the table, as "Add Task"
+  does (journaling aside)
+
+Timings include ``update_idletasks()`` so Tk's own redraw is counted. The
+benchmark needs a display and exits without measuring when there is none.
+
+    python -m benchmarks.bench_task_table --sizes 1000,100000,1000000
+"""
+
+import argparse
+import random
+import statistics
+import time
+import tkinter as tk
+
+from benchmarks.datagen import make_tasks
+from daily_planner_app import task_row, task_row_id
+from task_store import IMPORTANCE_COLORS, TaskStore
+from virtual_table import VirtualTable
+
+
+def bench_size(root, count, operations):
+    store = TaskStore()
+    store.extend(make_tasks(count))
+
+    frame = tk.Frame(root)
+    frame.pack(expand=True, fill="both")
+    table = VirtualTable(
+        frame,
+        columns=("Frequency", "Task", "Due Date", "Schedule"),
+        render_row=task_row,
+        row_id=task_row_id,
+        show="headings",
+    )
+    for importance_color in IMPORTANCE_COLORS.values():
+        table.tree.tag_configure(importance_color, background=importance_color)
+    table.pack(expand=True, fill="both")
+
+    started = time.perf_counter()
+    table.set_source(store.sorted_tasks())
+    root.update()
+    first_draw = time.perf_counter() - started
+
+    rng = random.Random(count)
+    scroll = []
+    for _ in range(operations):
+        started = time.perf_counter()
+        table.scroll_to(rng.randrange(len(store)))
+        root.update_idletasks()
+        scroll.append(time.perf_counter() - started)
+
+    insert = []
+    for task_info in make_tasks(count + operations)[count:]:
+        task_info["task"] += " (new)"
+        started = time.perf_counter()
+        store.add(**task_info)
+        table.refresh()
+        root.update_idletasks()
+        insert.append(time.perf_counter() - started)
+
+    frame.destroy()
+    return {
+        "first draw": first_draw,
+        "scroll": statistics.median(scroll),
+        "insert": statistics.median(insert),
+        "rows in tree": len(table.rows),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,100000,1000000")
+    parser.add_argument("--operations", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as error:
+        print(f"Skipping the task table benchmark: {error}")
+        return
+    root.geometry("800x600")
+
+    print(f"{'tasks':>10} {'first draw':>12} {'scroll':>10} {'insert':>10} {'rows':>6}")
+    for count in (int(size) for size in args.sizes.split(",")):
+        result = bench_size(root, count, args.operations)
+        print(
+            f"{count:>10} {result['first draw'] * 1e3:>10.2f}ms "
+            f"{result['scroll'] * 1e3:>8.3f}ms {result['insert'] * 1e3:>8.3f}ms "
+            f"{result['rows in tree']:>6}"
+        )
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
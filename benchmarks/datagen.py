@@ -0,0 +1,89 @@
+"""Deterministic synthetic data shared by the benchmarks.
+
+Every generator returns the same data for the same arguments, so timings
+from different runs and machines describe the same work.
+"""
+
+import random
+from datetime import date, timedelta
+
+from planner_snapshot import PlannerSnapshot
+from planner_storage import GOAL_TYPES
+from task_store import FREQUENCIES, IMPORTANCE_LEVELS, TaskStore
+
+CLIENTS = ("Mwala Water", "Kitui County", "Athi Works", "Tana Utilities")
+PROJECTS = ("transmission line", "pump station", "reservoir")
+PIPE_SIZES = ("90mm", "110mm", "160mm", "225mm")
+
+
+def make_tasks(count, frequencies=FREQUENCIES, importance_levels=IMPORTANCE_LEVELS):
+    """Task dicts cycling through the given frequencies and importance levels."""
+    return [
+        {
+            "task": f"Task {number}",
+            "due_date": f"{number % 28 + 1}/{number % 12 + 1}",
+            "schedule": f"{number % 12 + 1}:00",
+            "importance": importance_levels[number % len(importance_levels)],
+            "frequency": frequencies[number % len(frequencies)],
+        }
+        for number in range(count)
+    ]
+
+
+def make_goals(count):
+    """Goals spread evenly over the goal types."""
+    goals = {goal_type: [] for goal_type in GOAL_TYPES}
+    for number in range(count):
+        goals[GOAL_TYPES[number % len(GOAL_TYPES)]].append(f"Goal {number}")
+    return goals
+
+
+def make_snapshot(task_count, goal_count=0):
+    store = TaskStore()
+    store.extend(make_tasks(task_count))
+    return PlannerSnapshot.capture(store, make_goals(goal_count))
+
+
+def make_work_entries(count, days=730, seed=0):
+    """Invoice work entries on random days of a two-year span.
+
+    Date strings repeat heavily, as they do in real timesheet imports.
+    """
+    rng = random.Random(seed)
+    start = date(2024, 1, 1)
+    dates = [
+        f"{day.day}/{day.month}/{day:%y}"
+        for day in (start + timedelta(days=number) for number in range(days))
+    ]
+    return [(rng.choice(dates), description(rng)) for _ in range(count)]
+
+
+def make_billable_days(days):
+    """One work entry on each of ``days`` consecutive days."""
+    start = date(2000, 1, 1)
+    return [
+        ((start + timedelta(days=number)).strftime("%d/%m/%y"), "6 joints for 225mm")
+        for number in range(days)
+    ]
+
+
+def make_ledger(count, days=365, seed=0):
+    """Ledger rows (dicts with client, project, date, description)."""
+    rng = random.Random(seed)
+    return [
+        {
+            "client": rng.choice(CLIENTS),
+            "project": rng.choice(PROJECTS),
+            "date": date_text,
+            "description": text,
+        }
+        for date_text, text in make_work_entries(count, days, seed)
+    ]
+
+
+def description(rng):
+    first, second = rng.sample(PIPE_SIZES, 2)
+    return (
+        f"{rng.randint(1, 9)} joints for {first} pipes, "
+        f"{rng.randint(1, 4)} joints for {second}"
+    )
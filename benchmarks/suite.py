@@ -0,0 +1,362 @@
+"""Regression benchmark suite: fixed cases at a chosen scale, with a baseline.
+
+Every case builds its data with benchmarks.datagen, so runs are comparable.
+A case's setup is not timed and is redone before every repeat, so cases
+that mutate their data always start from the same state. The runner
+reports the median and best time of ``--repeat`` runs, then makes one more
+run under tracemalloc for the peak Python memory.
+
+Cases:
+
+* task_table.update: what update_task_table does, without Tk. It runs
+  PlannerSearch.find_tasks with the default filters and renders the rows
+  of a screenful of the table.
+* task_table.search: the same, for a typed query and a frequency filter.
+* task_table.refresh_tk: VirtualTable.refresh on a real Treeview. It only
+  runs with a display, e.g. under ``xvfb-run``.
+* add_task.batch: the duplicate check, journal-free store insert and search
+  index update of "Add Task", for 1000 new tasks.
+* save_as_pdf.table / save_as_pdf.streamed: render_planner as one table,
+  and in page-sized tables.
+* invoice.summary: summarize_work_entries over a ledger-sized entry list.
+* invoice.pdf: generate_invoice_pdf with one entry per billable day.
+* save_as_pdf.canvas / invoice.pdf_canvas: the same PDFs from the canvas
+  backend (see pdf_canvas).
+
+Nothing else needs a display.
+
+    python -m benchmarks.suite --scale small --save benchmarks/baselines/small.json
+    python -m benchmarks.suite --scale small --baseline benchmarks/baselines/small.json
+
+Timings only compare on the machine that made them, so baselines are kept
+per machine in benchmarks/baselines/, which git ignores.
+
+With ``--baseline`` every case is compared with the stored run. The best
+time is compared rather than the median, as it is the least noisy. The
+exit status is 1 if the peak memory or the best time grew by more than
+``--threshold``. A time difference only counts beyond the noise of the two
+runs: a millisecond, or the gap between the median and the best time of
+either run if that is larger. Comparisons need at least
+MIN_COMPARE_REPEAT repeats, as a single run is too noisy to judge.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+
+from benchmarks.datagen import (
+    make_billable_days,
+    make_goals,
+    make_snapshot,
+    make_tasks,
+    make_work_entries,
+)
+from pdf_stream import PAGE_ROWS
+from search_index import PlannerSearch
+from task_store import TaskStore
+
+# Sizes per scale: tasks in the model, task rows in a PDF, billable days on
+# an invoice, and work entries to summarize
+SCALES = {
+    "small": {"tasks": 1_000, "pdf_rows": 200, "days": 100, "entries": 10_000},
+    "medium": {"tasks": 10_000, "pdf_rows": 1_000, "days": 500, "entries": 100_000},
+    "large": {"tasks": 100_000, "pdf_rows": 5_000, "days": 2_000, "entries": 1_000_000},
+}
+# Rows of the task table in view, as on a typical window
+SCREEN_ROWS = 40
+# Tasks added by the add_task case
+ADDED_TASKS = 1_000
+# Time differences below this are noise, whatever the ratio
+NOISE_S = 0.001
+# Fewest repeats a run compared with a baseline may have
+MIN_COMPARE_REPEAT = 5
+
+# setup(sizes, work_dir) -> state, untimed; run(state) is timed
+Case = namedtuple("Case", "name setup run")
+
+
+def planner(count):
+    store = TaskStore()
+    store.extend(make_tasks(count))
+    goals = make_goals(30)
+    return store, PlannerSearch(store, goals)
+
+
+def table_window(search, **filters):
+    from daily_planner_app import task_row, task_row_id
+
+    rows = search.find_tasks(**filters)
+    return [(task_row_id(item), task_row(item)) for item in rows[:SCREEN_ROWS]]
+
+
+def default_filters(query=""):
+    return {
+        "query": query,
+        "frequency": None,
+        "importance": None,
+        "due_from": None,
+        "due_to": None,
+    }
+
+
+def add_tasks(state):
+    store, search, new_tasks = state
+    for task_info in new_tasks:
+        if (task_info["frequency"], task_info["task"]) in store:
+            continue
+        search.add_task(store.add(**task_info))
+
+
+def setup_tk_table(sizes, work_dir):
+    import tkinter as tk
+
+    from daily_planner_app import task_row, task_row_id
+    from virtual_table import VirtualTable
+
+    root = tk.Tk()
+    root.withdraw()
+    store, search = planner(sizes["tasks"])
+    table = VirtualTable(
+        root, ("Frequency", "Task", "Due Date", "Schedule"), task_row, task_row_id
+    )
+    table.visible_rows = SCREEN_ROWS
+    table.source = search.find_tasks(**default_filters())
+    return root, table
+
+
+def refresh_tk_table(state):
+    root, table = state
+    # Scroll a screen down and back, so rows are replaced both ways
+    for offset in (SCREEN_ROWS, 0):
+        table.offset = offset
+        table.refresh()
+    root.update_idletasks()
+
+
+def render_planner_pdf(chunk_rows, backend="platypus"):
+    def run(state):
+        from planner_pdf import render_planner
+
+        snapshot, work_dir = state
+        render_planner(
+            os.path.join(work_dir, "planner.pdf"),
+            snapshot,
+            chunk_rows=chunk_rows,
+            backend=backend,
+        )
+
+    return run
+
+
+def render_invoice(backend="platypus"):
+    def run(state):
+        from generate_invoice import generate_invoice_pdf
+
+        work_entries, work_dir = state
+        generate_invoice_pdf(
+            work_entries,
+            10000,
+            chunk_rows=PAGE_ROWS,
+            output_path=os.path.join(work_dir, "invoice.pdf"),
+            backend=backend,
+        )
+
+    return run
+
+
+def summarize(work_entries):
+    from generate_invoice import summarize_work_entries
+
+    summarize_work_entries(work_entries, 10000)
+
+
+CASES = (
+    Case(
+        "task_table.update",
+        lambda sizes, work_dir: planner(sizes["tasks"])[1],
+        lambda search: table_window(search, **default_filters()),
+    ),
+    Case(
+        "task_table.search",
+        lambda sizes, work_dir: planner(sizes["tasks"])[1],
+        lambda search: table_window(
+            search, **{**default_filters("task 1"), "frequency": "Weekly"}
+        ),
+    ),
+    Case("task_table.refresh_tk", setup_tk_table, refresh_tk_table),
+    Case(
+        "add_task.batch",
+        lambda sizes, work_dir: (
+            *planner(sizes["tasks"]),
+            make_tasks(sizes["tasks"] + ADDED_TASKS)[-ADDED_TASKS:],
+        ),
+        add_tasks,
+    ),
+    Case(
+        "save_as_pdf.table",
+        lambda sizes, work_dir: (make_snapshot(sizes["pdf_rows"], 30), work_dir),
+        render_planner_pdf(None),
+    ),
+    Case(
+        "save_as_pdf.streamed",
+        lambda sizes, work_dir: (make_snapshot(sizes["pdf_rows"], 30), work_dir),
+        render_planner_pdf(PAGE_ROWS),
+    ),
+    Case(
+        "save_as_pdf.canvas",
+        lambda sizes, work_dir: (make_snapshot(sizes["pdf_rows"], 30), work_dir),
+        render_planner_pdf(None, "canvas"),
+    ),
+    Case(
+        "invoice.summary",
+        lambda sizes, work_dir: make_work_entries(sizes["entries"]),
+        summarize,
+    ),
+    Case(
+        "invoice.pdf",
+        lambda sizes, work_dir: (make_billable_days(sizes["days"]), work_dir),
+        render_invoice(),
+    ),
+    Case(
+        "invoice.pdf_canvas",
+        lambda sizes, work_dir: (make_billable_days(sizes["days"]), work_dir),
+        render_invoice("canvas"),
+    ),
+)
+
+
+def has_display():
+    return bool(os.environ.get("DISPLAY")) or sys.platform in ("win32", "darwin")
+
+
+def measure(case, sizes, work_dir, repeat):
+    times = []
+    for _ in range(repeat):
+        state = case.setup(sizes, work_dir)
+        gc.collect()
+        started = time.perf_counter()
+        case.run(state)
+        times.append(time.perf_counter() - started)
+        del state
+
+    state = case.setup(sizes, work_dir)
+    gc.collect()
+    tracemalloc.start()
+    case.run(state)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "median_s": round(statistics.median(times), 6),
+        "min_s": round(min(times), 6),
+        "peak_bytes": peak,
+    }
+
+
+def run_suite(scale, repeat=5, names=None):
+    """Run the cases (all, or those in ``names``) and return the results dict."""
+    sizes = SCALES[scale]
+    results = {
+        "scale": scale,
+        "sizes": sizes,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cases": {},
+    }
+    work_dir = tempfile.mkdtemp(prefix="planner-bench-")
+    try:
+        for case in CASES:
+            if names and case.name not in names:
+                continue
+            if case.name.endswith("_tk") and not has_display():
+                print(f"  {case.name:<24} skipped (no display)")
+                continue
+            result = measure(case, sizes, work_dir, repeat)
+            results["cases"][case.name] = result
+            print(
+                f"  {case.name:<24} {result['median_s'] * 1e3:10.2f}ms median "
+                f"{result['min_s'] * 1e3:10.2f}ms best "
+                f"{result['peak_bytes'] / 1024 / 1024:8.2f} MiB peak"
+            )
+    finally:
+        shutil.rmtree(work_dir)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print each case against ``baseline``; return the names that regressed."""
+    regressed = []
+    if baseline.get("scale") != results["scale"]:
+        print(
+            f"warning: baseline scale {baseline.get('scale')!r} "
+            f"differs from {results['scale']!r}"
+        )
+    for name, result in results["cases"].items():
+        old = baseline.get("cases", {}).get(name)
+        if old is None:
+            print(f"  {name:<24} new case, no baseline")
+            continue
+        changes = []
+        worse = False
+        # A run's median - best shows how much its timings wander
+        time_noise = max(
+            NOISE_S,
+            result["median_s"] - result["min_s"],
+            old["median_s"] - old["min_s"],
+        )
+        for field, label, floor in (
+            ("min_s", "time", time_noise),
+            ("peak_bytes", "memory", 0),
+        ):
+            change = result[field] / old[field] - 1 if old[field] else 0.0
+            changes.append(f"{label} {change:+7.1%}")
+            worse = worse or (change > threshold and result[field] - old[field] > floor)
+        print(f"  {name:<24} {'  '.join(changes)}{'  REGRESSED' if worse else ''}")
+        if worse:
+            regressed.append(name)
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--case", action="append", help="run only this case")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare with results saved earlier")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="allowed growth of time or memory before a case counts as regressed",
+    )
+    args = parser.parse_args(argv)
+    if args.baseline and args.repeat < MIN_COMPARE_REPEAT:
+        parser.error(f"--baseline needs --repeat {MIN_COMPARE_REPEAT} or more")
+
+    print(f"{args.scale} scale: {SCALES[args.scale]}")
+    results = run_suite(args.scale, args.repeat, args.case)
+    if args.save:
+        os.makedirs(os.path.dirname(args.save) or ".", exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as json_file:
+            json.dump(results, json_file, indent=2, sort_keys=True)
+            json_file.write("\n")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as json_file:
+            baseline = json.load(json_file)
+        print(f"against {args.baseline} (threshold {args.threshold:.0%}):")
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,47 +1,136 @@
+import argparse
 import tkinter as tk
-from tkinter import ttk, messagebox
-from reportlab.lib.pagesizes import letter
+from tkinter import ttk, filedialog, messagebox
+import datetime
 import os
-from datetime import datetime
-from reportlab.platypus import (
-    SimpleDocTemplate,
-    Table,
-    TableStyle,
-    Paragraph,
-    Spacer,
-)
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.units import inch
+import threading
 from tkinter import N, S, E, W
-from datetime import datetime
+import instrumentation
+from autosave import Autosaver
+from background_jobs import BackgroundJob
+from goal_progress import GoalProgress, progress_text
+from planner_import import apply_import, read_import
+from planner_snapshot import PlannerSnapshot
+from due_dates import DEADLINE_VIEWS, EXPORT_RANGES, deadline_range, parse_due_date
+from planner_storage import PlannerStorage
+from render_cache import RenderCache
+from search_index import PlannerSearch
+from task_store import FREQUENCIES, IMPORTANCE_COLORS, IMPORTANCE_LEVELS, TaskStore
+from virtual_table import VirtualTable
+
+# Delay before the PDF renderer is imported in the background after startup
+RENDERER_PREWARM_MS = 500
+
+
+def load_renderer():
+    """Import the ReportLab-backed PDF renderer on first use.
+
+    ReportLab is by far the slowest import of the app and is only needed to
+    save a PDF, so it stays out of the startup path.
+    """
+    import planner_pdf
+
+    return planner_pdf
+
+
+def task_row(task_info):
+    values = (
+        task_info.frequency,
+        task_info.task,
+        task_info.due_date,
+        task_info.schedule,
+        task_info.importance,
+        goal_label(task_info.goal) if task_info.goal else "",
+        "Yes" if task_info.done else "",
+    )
+    return values, (IMPORTANCE_COLORS.get(task_info.importance, ""),)
+
+
+def task_row_id(task_info):
+    return f"task{task_info.uid}"
+
+
+def goal_label(goal):
+    goal_type, goal = goal
+    return f"{goal_type}: {goal}"
+
+
+def goal_row_id(goal):
+    goal_type, goal = goal
+    return f"goal:{goal_type}:{goal}"
 
 
 class DailyPlannerApp:
     def __init__(self, root):
         self.root = root
         self.root.title("Daily Planner")
-        self.tasks = {"Daily": [], "Weekly": [], "Monthly": []}
+        self.tasks = TaskStore()
         self.goals = {"Week": [], "Month": [], "Year": []}
 
+        # Restore the planner from the snapshot and journal on disk
+        self.storage = PlannerStorage()
+        saved_tasks, saved_goals = self.storage.load()
+        self.tasks.extend(saved_tasks)
+        for goal_type, goals_list in saved_goals.items():
+            self.goals.setdefault(goal_type, []).extend(goals_list)
+        self.search = PlannerSearch(self.tasks, self.goals)
+        # Done/total counts per goal, kept up to date as tasks change
+        self.goal_progress = GoalProgress(self.goals, self.tasks.records())
+        self.autosave = Autosaver(
+            self.root,
+            self.storage,
+            self.capture_for_save,
+            on_error=self.autosave_failed,
+        )
+        # Unchanged planners are served from here instead of re-rendered
+        self.render_cache = RenderCache()
+        self.render_job = None
+        self.import_job = None
+        self.closing = False
+        self.saved_on_close = False
+
         # Save plans when the program is closed
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
 
         self.create_gui()
 
+        # Warm up the PDF renderer once the window is up and idle
+        self.root.after(
+            RENDERER_PREWARM_MS,
+            lambda: self.root.after_idle(self.prewarm_renderer),
+        )
+
+    def prewarm_renderer(self):
+        threading.Thread(target=load_renderer, daemon=True).start()
+
     def on_closing(self):
+        if self.closing:
+            return
+        self.closing = True
+        self.continue_closing()
+
+    def continue_closing(self):
+        if self.render_job is not None:
+            # Wait for the pending render without blocking the mainloop; it
+            # calls back in here when it finishes
+            return
         # Check if there are any tasks or goals before saving
-        if not self.tasks_empty() or not self.goals_empty():
+        if not self.saved_on_close and (
+            not self.tasks_empty() or not self.goals_empty()
+        ):
             # Save plans when the program is closed
-            self.save_as_pdf()
+            self.saved_on_close = True
+            # Always today's planner, whatever the export options are set to
+            self.save_as_pdf(pdf_range="Today", per_day=False, fast=False)
+            return
+        if self.import_job is not None:
+            self.import_job.cancel()
+        self.autosave.close()
+        self.storage.close()
         self.root.destroy()
 
     def tasks_empty(self):
-        for frequency, tasks in self.tasks.items():
-            if tasks:
-                return False
-        return True
+        return not self.tasks
 
     def goals_empty(self):
         for goals_list in self.goals.values():
@@ -49,11 +138,29 @@ class DailyPlannerApp:
                 return False
         return True
 
+    def capture_for_save(self):
+        # Cheap shallow copies on the Tk thread; the dicts are built and
+        # written by the autosave worker.
+        records = self.tasks.records()
+        goals = {
+            goal_type: list(goals_list) for goal_type, goals_list in self.goals.items()
+        }
+        return (record.to_dict() for record in records), goals
+
+    def autosave_failed(self, error):
+        messagebox.showwarning(
+            "Autosave Failed",
+            f"Could not save the planner: {error}\n"
+            "Your changes are kept in the journal and will be restored. "
+            "Autosave keeps retrying in the background.",
+        )
+
     def create_gui(self):
         self.create_task_frame()
         self.create_goal_frame()
         self.create_pdf_frame()
         self.create_task_table()
+        self.update_goal_choices()
         self.update_goal_table()
         self.update_task_table()
 
@@ -103,126 +210,321 @@ class DailyPlannerApp:
         importance_menu.config(width=15)
         importance_menu.grid(row=4, column=1, padx=10, pady=5, sticky="w")
 
+        task_goal_label = ttk.Label(task_frame, text="Goal:")
+        task_goal_label.grid(row=5, column=0, padx=10, pady=5, sticky="e")
+
+        # "None" followed by every goal; see update_goal_choices
+        self.goal_choices = [None]
+        self.task_goal_menu = ttk.Combobox(task_frame, state="readonly", width=18)
+        self.task_goal_menu.grid(row=5, column=1, padx=10, pady=5, sticky="w")
+
         self.add_button = ttk.Button(task_frame, text="Add Task", command=self.add_task)
-        self.add_button.grid(row=5, column=0, columnspan=2, padx=10, pady=10)
+        self.add_button.grid(row=6, column=0, columnspan=2, padx=10, pady=10)
 
         self.delete_button = ttk.Button(
             task_frame, text="Delete Task", command=self.delete_task
         )
-        self.delete_button.grid(row=6, column=0, columnspan=2, padx=10, pady=5)
+        self.delete_button.grid(row=7, column=0, columnspan=2, padx=10, pady=5)
+
+        self.done_button = ttk.Button(
+            task_frame, text="Toggle Done", command=self.toggle_task_done
+        )
+        self.done_button.grid(row=8, column=0, columnspan=2, padx=10, pady=5)
+
+        self.attach_button = ttk.Button(
+            task_frame, text="Attach to Goal", command=self.attach_task
+        )
+        self.attach_button.grid(row=9, column=0, columnspan=2, padx=10, pady=5)
+
+        self.import_button = ttk.Button(
+            task_frame, text="Import...", command=self.import_tasks
+        )
+        self.import_button.grid(row=10, column=0, columnspan=2, padx=10, pady=5)
+
+        self.import_progress = ttk.Progressbar(task_frame, maximum=100, length=150)
+        self.import_progress.grid(row=11, column=0, columnspan=2, padx=10, pady=5)
 
     def create_pdf_frame(self):
         pdf_frame = ttk.LabelFrame(self.root, text="PDF Actions")
         pdf_frame.pack(padx=10, pady=10, fill="both", expand="True")
 
+        self.pdf_range_var = tk.StringVar(value="Today")
+        ttk.OptionMenu(pdf_frame, self.pdf_range_var, "Today", *EXPORT_RANGES).pack(
+            padx=10, pady=5
+        )
+
+        self.pdf_per_day_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            pdf_frame, text="One file per day", variable=self.pdf_per_day_var
+        ).pack(padx=10, pady=5)
+
+        # Draws the task and goal tables straight onto the page; much faster
+        # for planners with thousands of tasks
+        self.pdf_fast_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            pdf_frame, text="Fast renderer", variable=self.pdf_fast_var
+        ).pack(padx=10, pady=5)
+
         self.save_pdf_button = ttk.Button(
             pdf_frame, text="Save as PDF", command=self.save_as_pdf
         )
         self.save_pdf_button.pack(padx=10, pady=10)
 
+        self.pdf_progress = ttk.Progressbar(pdf_frame, maximum=100, length=150)
+        self.pdf_progress.pack(padx=10, pady=5)
+
+        self.cancel_pdf_button = ttk.Button(
+            pdf_frame, text="Cancel", command=self.cancel_pdf, state="disabled"
+        )
+        self.cancel_pdf_button.pack(padx=10, pady=5)
+
     def create_task_table(self):
         table_frame = ttk.LabelFrame(self.root, text="Task List")
         table_frame.pack(padx=5, pady=5, fill="both", expand=True, side="right")
 
-        self.task_table = ttk.Treeview(
+        self.create_search_frame(table_frame)
+
+        # Only the rows in view are materialized; see virtual_table
+        self.task_view = VirtualTable(
             table_frame,
-            columns=("Frequency", "Task", "Due Date", "Schedule", "Importance"),
+            columns=(
+                "Frequency",
+                "Task",
+                "Due Date",
+                "Schedule",
+                "Importance",
+                "Goal",
+                "Done",
+            ),
+            render_row=task_row,
+            row_id=task_row_id,
             show="headings",
         )
+        self.task_table = self.task_view.tree
 
         self.task_table.heading("Frequency", text="Frequency")
         self.task_table.heading("Task", text="Task")
         self.task_table.heading("Due Date", text="Due Date")
         self.task_table.heading("Schedule", text="Schedule")
         self.task_table.heading("Importance", text="Importance")
+        self.task_table.heading("Goal", text="Goal")
+        self.task_table.heading("Done", text="Done")
 
         self.task_table.column("Frequency", width=75)
         self.task_table.column("Task", width=150)
         self.task_table.column("Due Date", width=100)
         self.task_table.column("Schedule", width=100)
         self.task_table.column("Importance", width=60, anchor="center")
+        self.task_table.column("Goal", width=120)
+        self.task_table.column("Done", width=40, anchor="center")
 
-        self.task_table.pack(padx=5, pady=5, expand=True, fill="both")
+        for importance_color in IMPORTANCE_COLORS.values():
+            self.task_table.tag_configure(
+                importance_color, background=importance_color, foreground="Black"
+            )
+
+        self.task_view.pack(padx=5, pady=5, expand=True, fill="both")
         # Additional options to expand the LabelFrame
         table_frame.grid_columnconfigure(0, weight=1)
         table_frame.grid_rowconfigure(0, weight=1)
 
-    def update_task_table(self):
-        self.task_table.delete(*self.task_table.get_children())
-        sorted_tasks = []
-
-        for frequency, tasks in self.tasks.items():
-            sorted_tasks.extend(tasks)
-
-        sorted_tasks.sort(
-            key=lambda task: (
-                {"Low": 0, "Medium": 1, "High": 2}[task["importance"]],
-                task["due_date"],
-            )
+    def create_search_frame(self, parent):
+        search_frame = ttk.Frame(parent)
+        search_frame.pack(padx=5, pady=5, fill="x")
+
+        ttk.Label(search_frame, text="Search:").grid(row=0, column=0, sticky="e")
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
+        search_entry.grid(row=0, column=1, columnspan=3, padx=5, pady=2, sticky="we")
+
+        self.filter_frequency_var = tk.StringVar(value="All")
+        ttk.OptionMenu(
+            search_frame, self.filter_frequency_var, "All", "All", *FREQUENCIES
+        ).grid(row=0, column=4, padx=5, pady=2)
+
+        self.filter_importance_var = tk.StringVar(value="All")
+        ttk.OptionMenu(
+            search_frame, self.filter_importance_var, "All", "All", *IMPORTANCE_LEVELS
+        ).grid(row=0, column=5, padx=5, pady=2)
+
+        ttk.Label(search_frame, text="Due from:").grid(row=1, column=0, sticky="e")
+        self.due_from_var = tk.StringVar()
+        ttk.Entry(search_frame, textvariable=self.due_from_var, width=10).grid(
+            row=1, column=1, padx=5, pady=2, sticky="w"
+        )
+        ttk.Label(search_frame, text="to:").grid(row=1, column=2, sticky="e")
+        self.due_to_var = tk.StringVar()
+        ttk.Entry(search_frame, textvariable=self.due_to_var, width=10).grid(
+            row=1, column=3, padx=5, pady=2, sticky="w"
         )
 
-        for task_info in sorted_tasks:
-            importance = task_info["importance"]
-            importance_color = {"Low": "green", "Medium": "yellow", "High": "red"}.get(
-                importance, ""
-            )
+        self.deadline_var = tk.StringVar(value="Any due date")
+        ttk.OptionMenu(
+            search_frame,
+            self.deadline_var,
+            "Any due date",
+            "Any due date",
+            *DEADLINE_VIEWS,
+        ).grid(row=1, column=4, padx=5, pady=2)
+
+        self.next_due_label = ttk.Label(search_frame)
+        self.next_due_label.grid(row=2, column=0, columnspan=6, padx=5, sticky="w")
+        search_frame.columnconfigure(1, weight=1)
+
+        # Results follow every keystroke and filter change
+        for var in (
+            self.search_var,
+            self.filter_frequency_var,
+            self.filter_importance_var,
+            self.due_from_var,
+            self.due_to_var,
+            self.deadline_var,
+        ):
+            var.trace_add("write", self.apply_search)
 
-            self.task_table.insert(
-                "",
-                "end",
-                values=(
-                    task_info["frequency"],
-                    task_info["task"],
-                    task_info["due_date"],
-                    task_info.get("schedule"),
-                ),
-                tags=(importance_color,),
-            )
-            self.task_table.tag_configure(
-                importance_color, background=importance_color, foreground="Black"
+    def apply_search(self, *_):
+        self.update_task_table()
+        self.update_goal_table()
+
+    def task_filters(self):
+        frequency = self.filter_frequency_var.get()
+        importance = self.filter_importance_var.get()
+        due_from = parse_due_date(self.due_from_var.get())
+        due_to = parse_due_date(self.due_to_var.get())
+        if self.deadline_var.get() in DEADLINE_VIEWS:
+            # Narrow the typed range to the chosen deadline view
+            first, last = deadline_range(self.deadline_var.get())
+            if first is not None:
+                due_from = first if due_from is None else max(due_from, first)
+            if last is not None:
+                due_to = last if due_to is None else min(due_to, last)
+        return {
+            "query": self.search_var.get(),
+            "frequency": None if frequency == "All" else frequency,
+            "importance": None if importance == "All" else importance,
+            "due_from": due_from,
+            "due_to": due_to,
+        }
+
+    @instrumentation.timed("app.update_task_table")
+    def update_task_table(self):
+        self.task_view.set_source(self.search.find_tasks(**self.task_filters()))
+        next_due = self.tasks.next_due(datetime.date.today().toordinal())
+        if next_due:
+            self.next_due_label.config(
+                text=f"Next due: {next_due[0].task} ({next_due[0].due_date})"
             )
+        else:
+            self.next_due_label.config(text="Nothing due")
 
     def delete_task(self):
-        selected_item = self.task_table.selection()
-        if not selected_item:
+        selected_task = self.task_view.selected()
+        if selected_task is None:
             messagebox.showwarning(
                 "No Task Selected", "Please select a task to delete."
             )
             return
 
-        item = self.task_table.item(selected_item)
-        frequency = item["values"][0]
-        task = item["values"][1]  # Change to index 1 to get the task name
-
-        if frequency in self.tasks and any(
-            task_info["task"] == task for task_info in self.tasks[frequency]
-        ):
-            for task_info in self.tasks[frequency]:
-                if task_info["task"] == task:
-                    self.tasks[frequency].remove(task_info)
-                    self.update_task_table()
-                    return
+        frequency, task = selected_task.key
+
+        if (frequency, task) in self.tasks:
+            self.storage.delete_task(frequency, task)
+            record = self.tasks.remove(frequency, task)
+            self.search.remove_task(record)
+            self.goal_progress.remove_task(record)
+            self.task_view.select(None)
+            self.autosave.changed()
+            self.update_task_table()
+            if record.goal is not None:
+                self.update_goal_table()
         else:
             messagebox.showwarning(
                 "Task Not Found",
                 "The selected task was not found in the specified frequency.",
             )
 
+    def selected_task(self):
+        """The selected task's record, or None after warning the user."""
+        selected_task = self.task_view.selected()
+        if selected_task is None or selected_task.key not in self.tasks:
+            messagebox.showwarning("No Task Selected", "Please select a task first.")
+            return None
+        return selected_task
+
+    def toggle_task_done(self):
+        selected_task = self.selected_task()
+        if selected_task is None:
+            return
+        frequency, task = selected_task.key
+        done = not selected_task.done
+        self.storage.set_task_done(frequency, task, done)
+        record, was_done = self.tasks.set_done(frequency, task, done)
+        self.goal_progress.marked(record, was_done)
+        self.autosave.changed()
+        self.task_view.refresh()
+        if record.goal is not None:
+            self.update_goal_table()
+
+    def attach_task(self):
+        selected_task = self.selected_task()
+        if selected_task is None:
+            return
+        frequency, task = selected_task.key
+        goal = self.chosen_goal()
+        if goal == selected_task.goal:
+            return
+        self.storage.attach_task(frequency, task, goal)
+        record, previous_goal = self.tasks.attach(frequency, task, goal)
+        self.goal_progress.moved(record, previous_goal)
+        self.autosave.changed()
+        self.task_view.refresh()
+        self.update_goal_table()
+
+    def chosen_goal(self):
+        """The ``(goal_type, goal)`` picked in the task frame, or None."""
+        index = self.task_goal_menu.current()
+        return self.goal_choices[index] if index > 0 else None
+
+    def update_goal_choices(self):
+        # Read the choice before the list changes under the combobox's index
+        chosen = self.chosen_goal()
+        self.goal_choices = [None] + [
+            (goal_type, goal)
+            for goal_type, goals_list in self.goals.items()
+            for goal in goals_list
+        ]
+        self.task_goal_menu["values"] = ["None"] + [
+            goal_label(goal) for goal in self.goal_choices[1:]
+        ]
+        self.task_goal_menu.current(
+            self.goal_choices.index(chosen) if chosen in self.goal_choices else 0
+        )
+
     def delete_goal(self):
-        selected_item = self.goal_table.selection()
-        if not selected_item:
+        selected_goal = self.goal_view.selected()
+        if selected_goal is None:
             messagebox.showwarning(
                 "No Goal Selected", "Please select a goal to delete."
             )
             return
 
-        item = self.goal_table.item(selected_item)
-        goal_type = item["values"][0]
-        goal = item["values"][1]
+        goal_type, goal = selected_goal
 
-        if goal in self.goals[goal_type]:
+        if self.search.has_goal(goal_type, goal):
+            # The journal's delete_goal detaches the goal's tasks on replay,
+            # so they are only detached in memory here
+            self.storage.delete_goal(goal_type, goal)
             self.goals[goal_type].remove(goal)
+            self.search.remove_goal(goal_type, goal)
+            attached = self.goal_progress.remove_goal(goal_type, goal)
+            for record in attached:
+                self.tasks.attach(record.frequency, record.task, None)
+            self.goal_view.select(None)
+            self.autosave.changed()
+            self.update_goal_choices()
             self.update_goal_table()
+            if attached:
+                self.task_view.refresh()
 
     def add_task(self):
         task = self.task_entry.get().strip()
@@ -235,257 +537,197 @@ class DailyPlannerApp:
             messagebox.showwarning("Empty Task", "Please enter a task before adding.")
             return
 
-        for existing_task in self.tasks[frequency]:
-            if existing_task["task"] == task:
-                messagebox.showinfo(
-                    "Task Already Added", f"The task '{task}' has already been added."
-                )
-                return
-
-        self.tasks[frequency].append(
-            {
-                "task": task,
-                "due_date": due_date,
-                "schedule": schedule,
-                "importance": importance,
-                "frequency": frequency,
-            }
-        )
+        if (frequency, task) in self.tasks:
+            messagebox.showinfo(
+                "Task Already Added", f"The task '{task}' has already been added."
+            )
+            return
+
+        task_info = {
+            "task": task,
+            "due_date": due_date,
+            "schedule": schedule,
+            "importance": importance,
+            "frequency": frequency,
+        }
+        goal = self.chosen_goal()
+        if goal is not None:
+            task_info["goal_type"], task_info["goal"] = goal
+        self.storage.add_task(task_info)
+        record = self.tasks.add(**task_info)
+        self.search.add_task(record)
+        self.goal_progress.add_task(record)
+        self.autosave.changed()
         self.task_entry.delete(0, tk.END)
         self.due_date_entry.delete(0, tk.END)
         self.schedule_entry.delete(0, tk.END)
         self.update_task_table()
+        if goal is not None:
+            self.update_goal_table()
 
-    def save_as_pdf(self):
+    def import_tasks(self):
+        path = filedialog.askopenfilename(
+            title="Import Tasks and Goals",
+            filetypes=(
+                ("Planner files", "*.csv *.json *.jsonl"),
+                ("All files", "*.*"),
+            ),
+        )
+        if not path:
+            return
+
+        def finished():
+            self.import_job = None
+            self.import_button.config(state="normal")
+            self.import_progress["value"] = 0
+
+        def done(batch):
+            finished()
+            # One batch into the model, the journal and the index, then a
+            # single refresh of each table
+            result = apply_import(batch, self.tasks, self.goals, self.storage)
+            self.search.add_tasks(result.tasks)
+            for goal_type, goal in result.goals:
+                self.search.add_goal(goal_type, goal)
+                self.goal_progress.add_goal(goal_type, goal)
+            self.goal_progress.add_tasks(result.tasks)
+            if result.tasks or result.goals:
+                self.autosave.changed()
+                self.update_goal_choices()
+                self.update_task_table()
+                self.update_goal_table()
+            message = (
+                f"Imported {len(result.tasks)} tasks and {len(result.goals)} goals."
+            )
+            if result.skipped:
+                message += f"\nSkipped {result.skipped} duplicate or invalid rows."
+            for number, reason in batch.errors:
+                message += f"\nRow {number}: {reason}"
+            messagebox.showinfo("Import Finished", message)
+
+        def failed(error):
+            finished()
+            messagebox.showerror("Import Failed", f"Could not import {path}: {error}")
+
+        def progress(fraction):
+            self.import_progress["value"] = fraction * 100
+
+        self.import_button.config(state="disabled")
+        self.import_job = BackgroundJob(
+            self.root,
+            lambda report, cancel_event: read_import(path, report, cancel_event),
+            on_done=done,
+            on_progress=progress,
+            on_error=failed,
+            on_cancel=lambda _: finished(),
+        ).start()
+
+    def save_as_pdf(self, pdf_range=None, per_day=None, fast=None):
+        """Render the planner in the background; unset options come from the GUI."""
         if self.tasks_empty() and self.goals_empty():
             messagebox.showinfo("Nothing to Save", "No tasks or goals to save.")
             return
 
-        file_name = f"DailyPlanner_{datetime.now().strftime('%Y-%m-%d')}.pdf"
-        pdf_path = os.path.join(os.getcwd(), file_name)
-
-        doc = SimpleDocTemplate(pdf_path, pagesize=letter)
-        story = []
-
-        # Explanation Table
-        data = [["Importance", "Color"], ["Low", "•"], ["Medium", "•"], ["High", "•"]]
-
-        table = Table(data)
-
-        table.setStyle(
-            TableStyle(
-                [
-                    ("BOTTOMPADDING", (0, 0), (-1, 0), 20),
-                    ("TEXTCOLOR", (1, 1), (1, 1), colors.green),
-                    ("TEXTCOLOR", (1, 2), (1, 2), colors.yellow),
-                    ("TEXTCOLOR", (1, 3), (1, 3), colors.red),
-                    ("FONTSIZE", (1, 1), (1, -1), 15),
-                    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                    ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                ]
+        if self.render_job is not None:
+            messagebox.showinfo(
+                "PDF In Progress", "The planner is still being saved as a PDF."
             )
-        )
+            return
 
-        # Create a two-column grid for the header section (day and explanation table)
-        header_grid = [
-            [
-                Paragraph(
-                    f"Daily Planner: {datetime.now().strftime('%Y-%m-%d')}",
-                    getSampleStyleSheet()["Title"],
-                ),
-                table,
-            ]
-        ]
-        header_table = Table(header_grid, colWidths=[3 * inch, 2 * inch])
-        header_table.setStyle(
-            TableStyle(
-                [
-                    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                ]
-            )
+        # The worker renders a frozen copy, so edits made meanwhile are safe
+        snapshot = PlannerSnapshot.capture(
+            self.tasks, self.goals, progress=self.goal_progress
         )
-        story.append(header_table)
-
-        # Spacer
-        story.append(Spacer(1, 20))
-
-        # Sort tasks by importance (High first, Low last) and then by due date
-        sorted_tasks = []
-        for frequency, tasks in self.tasks.items():
-            sorted_tasks.extend(
-                sorted(
-                    tasks,
-                    key=lambda x: ("High", "Medium", "Low").index(x["importance"]),
+        renderer = load_renderer()
+        if fast is None:
+            fast = self.pdf_fast_var.get()
+        if pdf_range is None:
+            pdf_range = self.pdf_range_var.get()
+        if per_day is None:
+            per_day = self.pdf_per_day_var.get()
+        backend = renderer.CANVAS if fast else renderer.PLATYPUS
+        out_dir = os.getcwd()
+        if pdf_range == "Today":
+            file_name = renderer.planner_file_name(snapshot)
+
+            def render(report, cancel_event):
+                renderer.render_planner(
+                    os.path.join(out_dir, file_name),
+                    snapshot,
+                    report,
+                    cancel_event,
+                    cache=self.render_cache,
+                    backend=backend,
                 )
-            )
 
-        # Print tasks in separate tables for daily, weekly, and monthly
-        for frequency in ["Daily", "Weekly", "Monthly"]:
-            frequency_tasks = [
-                task for task in sorted_tasks if task["frequency"] == frequency
-            ]
-            if frequency_tasks:
-                # Create a table header
-                task_data = [
-                    ["Frequency", "Task", "Due Date", "Schedule", "Importance"]
-                ]
-                for task_info in frequency_tasks:
-                    importance = task_info["importance"]
-                    importance_color = {
-                        "Low": "green",
-                        "Medium": "yellow",
-                        "High": "red",
-                    }.get(importance, "")
-
-                    dot = f"<font color='{importance_color}'>\u25CF</font>"
-                    task_data.append(
-                        [
-                            frequency,
-                            Paragraph(
-                                task_info["task"], getSampleStyleSheet()["Normal"]
-                            ),
-                            task_info["due_date"],
-                            task_info.get("schedule", ""),
-                            Paragraph(
-                                dot, getSampleStyleSheet()["Normal"]
-                            ),  # Insert the colored dot
-                        ]
-                    )
-
-                # Create the tasks table
-                tasks_table = Table(
-                    task_data,
-                    colWidths=[
-                        1.5 * inch,
-                        2.5 * inch,
-                        1 * inch,
-                        1.5 * inch,
-                        1.5 * inch,
-                    ],
-                )  # Adjust column widths
-                tasks_table.setStyle(
-                    TableStyle(
-                        [
-                            ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
-                            ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-                            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                            ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                            ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                            ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                        ]
-                    )
-                )
-                story.append(
-                    Paragraph(frequency, getSampleStyleSheet()["Heading1"])
-                )  # Add frequency as a heading
-                story.append(tasks_table)
-                story.append(Spacer(1, 20))  # Add space between tables
-
-        # Spacer
-        story.append(Spacer(1, 20))  # Adds 20 units of vertical space
-
-        # Add a title above the goal table
-        goal_title = Paragraph("Goals", getSampleStyleSheet()["Heading1"])
-        story.append(goal_title)
-
-        # Goals Table
-        goal_data = [["Goal Type", "Goal"]]
-        for goal_type, goals_list in self.goals.items():
-            for goal in goals_list:
-                goal_data.append(
-                    [
-                        goal_type,
-                        Paragraph(
-                            goal, getSampleStyleSheet()["Normal"]
-                        ),  # Wrap goal in a Paragraph
-                    ]
+        elif per_day:
+            first, last = deadline_range(pdf_range)
+            file_name = f"{last - first + 1} daily PDF files"
+
+            def render(report, cancel_event):
+                renderer.render_planner_days(
+                    out_dir,
+                    snapshot,
+                    first,
+                    last,
+                    report,
+                    cancel_event,
+                    cache=self.render_cache,
+                    backend=backend,
                 )
 
-        goals_table = Table(goal_data, colWidths=[1.5 * inch, 4 * inch])
-        goals_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-                    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                    ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                    ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                ]
-            )
-        )
-        story.append(goals_table)
-        # Spacer
-        story.append(Spacer(1, 20))
-
-        # Prayer Schedule Table
-        prayer_names = ["Fajr", "Dhuhr", "Asr", "Maghrib", "Isha"]
-        prayer_times = ["5:00 AM", "1:00 PM", "4:30 PM", "7:19 PM", "8:39 PM"]
-        Nwafel = ["2 before", "4 before and 2 after", "-", "2 after", "2 after"]
-
-        prayer_schedule_data = [
-            ["prayer Name", "prayer Time", "Nwafel", "Done", "Nwafel Done?"]
-        ]
-        for name, time, _ in zip(prayer_names, prayer_times, Nwafel):
-            prayer_schedule_data.append([name, time, _])
-
-        prayer_schedule_table = Table(
-            prayer_schedule_data,
-            colWidths=[1.5 * inch, 1.5 * inch, 1.5 * inch, 1.5 * inch, 1.5 * inch],
-        )
-        prayer_schedule_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-                    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                    ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                    ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                ]
-            )
-        )
-        story.append(Paragraph("prayer Schedule", getSampleStyleSheet()["Heading1"]))
-        story.append(prayer_schedule_table)
-
-        # Spacer
-        story.append(Spacer(1, 20))
-
-        # Sunnah Prayers
-        sunnah_prayers = [
-            {"name": "Duha", "scheduled_time": "8:00 AM"},
-            {"name": "Tahajjud", "scheduled_time": "4:00 AM"},
-            {"name": "shroq", "scheduled_time": "7:30 AM"},
-        ]
-        sunnah_data = [["Sunnah prayer", "Scheduled Time", "Done"]]
-        for prayer in sunnah_prayers:
-            sunnah_data.append([prayer["name"], prayer["scheduled_time"], ""])
-
-        sunnah_table = Table(sunnah_data, colWidths=[2 * inch, 2 * inch, 1 * inch])
-        sunnah_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-                    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                    ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                    ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                ]
-            )
-        )
-        story.append(Paragraph("Sunnah Prayers", getSampleStyleSheet()["Heading1"]))
-        story.append(sunnah_table)
-
-        doc.build(story)
+        else:
+            first, last = deadline_range(pdf_range)
+            file_name = renderer.range_file_name(first, last)
+
+            def render(report, cancel_event):
+                renderer.render_planner_range(
+                    os.path.join(out_dir, file_name),
+                    snapshot,
+                    first,
+                    last,
+                    report,
+                    cancel_event,
+                    cache=self.render_cache,
+                    backend=backend,
+                )
 
-        messagebox.showinfo("PDF Saved", f"Planner saved as {file_name}")
+        def finished(message_title, message):
+            self.render_job = None
+            self.save_pdf_button.config(state="normal")
+            self.cancel_pdf_button.config(state="disabled")
+            self.pdf_progress["value"] = 0
+            if message_title:
+                messagebox.showinfo(message_title, message)
+            if self.closing:
+                self.continue_closing()
+
+        def done(_):
+            finished("PDF Saved", f"Planner saved as {file_name}")
+
+        def failed(error):
+            finished("PDF Not Saved", f"Could not save the planner: {error}")
+
+        def cancelled(_):
+            finished(None, None)
+
+        def progress(fraction):
+            self.pdf_progress["value"] = fraction * 100
+
+        self.save_pdf_button.config(state="disabled")
+        self.cancel_pdf_button.config(state="normal")
+        self.render_job = BackgroundJob(
+            self.root,
+            render,
+            on_done=done,
+            on_progress=progress,
+            on_error=failed,
+            on_cancel=cancelled,
+        ).start()
+
+    def cancel_pdf(self):
+        if self.render_job is not None:
+            self.render_job.cancel()
 
     def create_goal_frame(self):
         goal_frame = ttk.LabelFrame(self.root, text="Set Goal")
@@ -523,33 +765,40 @@ class DailyPlannerApp:
         goal_table_frame.columnconfigure(0, weight=1)
         goal_table_frame.rowconfigure(0, weight=1)
 
-        # Goal Table
-        self.goal_table = ttk.Treeview(
-            goal_table_frame, columns=("Goal Type", "Goal"), show="headings"
+        # Goal Table; like the task list, only the rows in view exist
+        self.goal_view = VirtualTable(
+            goal_table_frame,
+            columns=("Goal Type", "Goal", "Progress"),
+            render_row=self.goal_row,
+            row_id=goal_row_id,
+            show="headings",
         )
+        self.goal_table = self.goal_view.tree
         self.goal_table.heading("Goal Type", text="Goal Type")
         self.goal_table.heading("Goal", text="Goal")
+        self.goal_table.heading("Progress", text="Progress")
 
-        self.goal_table.column("Goal Type", width=300)
+        self.goal_table.column("Goal Type", width=150)
         self.goal_table.column("Goal", width=300)
+        self.goal_table.column("Progress", width=150, anchor="center")
 
-        self.goal_table.pack(fill="both", expand=True, padx=5, pady=5)
+        self.goal_view.pack(fill="both", expand=True, padx=5, pady=5)
 
         self.delete_goal_button = ttk.Button(
             goal_frame, text="Delete Goal", command=self.delete_goal
         )
         self.delete_goal_button.grid(row=4, column=0, columnspan=2, padx=10, pady=5)
 
+    def goal_row(self, goal):
+        goal_type, goal = goal
+        progress = self.goal_progress.progress(goal_type, goal)
+        instrumentation.count("goal_table.rows_rendered")
+        return (goal_type, goal, progress_text(progress)), ()
+
+    @instrumentation.timed("app.update_goal_table")
     def update_goal_table(self):
-        self.goal_table.delete(*self.goal_table.get_children())
-        for goal_type, goals_list in self.goals.items():
-            for goal in goals_list:
-                delete_button = ttk.Button(
-                    self.goal_table, text="Delete", command=self.delete_goal
-                )
-                self.goal_table.insert(
-                    "", "end", values=(goal_type, goal), tags=("delete_button",)
-                )
+        # Rows whose progress changed are edited in place by the refresh
+        self.goal_view.set_source(self.search.find_goals(self.search_var.get()))
 
     def set_goal(self):
         goal_type = self.goal_type_var.get()
@@ -559,18 +808,26 @@ class DailyPlannerApp:
             messagebox.showwarning("Empty Goal", "Please enter a goal before setting.")
             return
         # Check if the goal already exists
-        if goal in self.goals[goal_type]:
+        if self.search.has_goal(goal_type, goal):
             messagebox.showinfo(
                 "Goal Already Added",
                 f"The goal '{goal}' for '{goal_type}' has already been set.",
             )
             return
+        self.storage.set_goal(goal_type, goal)
         self.goals[goal_type].append(goal)
+        self.search.add_goal(goal_type, goal)
+        self.goal_progress.add_goal(goal_type, goal)
+        self.autosave.changed()
         self.goal_entry.delete(0, tk.END)
+        self.update_goal_choices()
         self.update_goal_table()
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Daily planner")
+    instrumentation.add_arguments(parser)
+    instrumentation.configure_from(parser.parse_args())
     root = tk.Tk()
     root.geometry("1000x800")  # Adjust the dimensions as needed
     app = DailyPlannerApp(root)
@@ -0,0 +1,62 @@
+"""Reading the free-form due dates typed into the planner.
+
+Due dates are entered day first, like the invoice work dates: ``d/m``,
+``d/m/yy`` or ``d/m/yyyy``. ISO ``yyyy-mm-dd`` is accepted too. A date
+without a year falls in the current year. Parsed dates are date ordinals
+(``date.toordinal()``), which compare and subtract as plain integers.
+"""
+
+import calendar
+from datetime import date, datetime
+from functools import lru_cache
+
+DUE_DATE_FORMATS = ("%d/%m/%y", "%d/%m/%Y", "%Y-%m-%d")
+# Named deadline ranges offered by the task list; see deadline_range
+DEADLINE_VIEWS = ("Overdue", "Today", "This week")
+# Named day ranges the planner can be exported for
+EXPORT_RANGES = ("Today", "This week", "This month")
+
+
+def parse_due_date(text, today=None):
+    """Return the date ordinal of ``text``, or None if it is not a date."""
+    today = today or date.today()
+    return _parse(text.strip(), today.year)
+
+
+@lru_cache(maxsize=4096)
+def _parse(text, year):
+    if not text:
+        return None
+    parts = text.split("/")
+    if len(parts) == 2:
+        try:
+            return date(year, int(parts[1]), int(parts[0])).toordinal()
+        except ValueError:
+            return None
+    for date_format in DUE_DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).toordinal()
+        except ValueError:
+            continue
+    return None
+
+
+def deadline_range(view, today=None):
+    """Return the inclusive ``(first, last)`` date ordinals of a named range.
+
+    ``view`` is one of DEADLINE_VIEWS or EXPORT_RANGES; a bound of None
+    leaves the range open.
+    """
+    today = (today or date.today()).toordinal()
+    if view == "Overdue":
+        return None, today - 1
+    if view == "Today":
+        return today, today
+    if view == "This week":
+        monday = today - date.fromordinal(today).weekday()
+        return monday, monday + 6
+    if view == "This month":
+        when = date.fromordinal(today)
+        first = when.replace(day=1).toordinal()
+        return first, first + calendar.monthrange(when.year, when.month)[1] - 1
+    raise ValueError(f"Unknown deadline view: {view!r}")
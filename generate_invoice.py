@@ -0,0 +1,213 @@
+import os
+from datetime import datetime
+from collections import namedtuple
+from itertools import chain
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer
+from reportlab.lib.units import inch
+import instrumentation
+from pdf_canvas import CANVAS, PLATYPUS, GridRows, WrappedText, build_canvas, check_backend
+from pdf_stream import FlowableStream, table_chunks
+from pdf_theme import HEADING_STYLE, INVOICE_ROWS_STYLE, INVOICE_TABLE_STYLE, NORMAL_STYLE
+from work_quantities import summarize_materials, unit_price
+
+INVOICE_HEADER = ["Date", "Description", "Rate (KES)", "Days", "Amount (KES)"]
+INVOICE_COL_WIDTHS = [1 * inch, 3 * inch, 1 * inch, 0.7 * inch, 1 * inch]
+# Per-unit invoices bill the material quantities found in the descriptions
+UNIT_HEADER = ["Size", "Item", "Unit Price (KES)", "Quantity", "Amount (KES)"]
+UNIT_COL_WIDTHS = [1.4 * inch, 2.6 * inch, 1.1 * inch, 0.7 * inch, 1 * inch]
+MATERIALS_HEADER = ["Size", "Item", "Quantity"]
+MATERIALS_COL_WIDTHS = [1.5 * inch, 3 * inch, 1 * inch]
+WORK_DATE_FORMAT = "%d/%m/%y"
+
+# days: billable days; total: days * rate; daily: [(date, [description, ...]), ...] by date
+WorkSummary = namedtuple("WorkSummary", "days total daily")
+
+def summarize_work_entries(work_entries, daily_rate, date_format=WORK_DATE_FORMAT):
+    """Aggregates work entries into billable days, per-day descriptions and a total.
+
+    Single pass over the entries. Each distinct date string is parsed once:
+    the cache maps it straight to the description list of its day, so
+    repeated dates cost one dict lookup. Different spellings of the same
+    day ("1/5/25", "01/05/25") land in one list and count as one day.
+    """
+    by_date_str = {}
+    by_day = {}
+    for date_str, description in work_entries:
+        descriptions = by_date_str.get(date_str)
+        if descriptions is None:
+            day = datetime.strptime(date_str, date_format)
+            descriptions = by_day.get(day)
+            if descriptions is None:
+                descriptions = by_day[day] = []
+            by_date_str[date_str] = descriptions
+        descriptions.append(description)
+
+    num_days = len(by_day)
+    return WorkSummary(num_days, num_days * daily_rate, sorted(by_day.items()))
+
+@instrumentation.timed("invoice_pdf.generate")
+def generate_invoice_pdf(work_entries, daily_rate, client_name="[Client Name]",
+                         project_name="Mwala cluster water project (transmission line)", chunk_rows=None,
+                         output_path="invoice.pdf", invoice_date=None, materials=False, unit_prices=None, backend=PLATYPUS):
+    """Generates a PDF invoice based on the work entries and daily rate.
+
+    With chunk_rows (e.g. PAGE_ROWS) the rows are streamed into the document
+    as page-sized tables with repeated headers, which keeps memory bounded
+    for invoices with many thousands of days.
+
+    materials adds a table of the quantity of each item per size found in
+    the descriptions (see work_quantities). With unit_prices, a dict of
+    price per item or per (item, size), the invoice bills those quantities
+    per unit instead of per day; an item without a price is a ValueError.
+    Items without a quantity and description parts that could not be read
+    as quantities are counted in a note under the table.
+
+    backend="canvas" draws the invoice table straight onto the page (see
+    pdf_canvas), which is several times faster for long invoices; its rows
+    are always streamed, and chunk_rows only repeats the header per page.
+
+    Returns the number of billable days and the total amount.
+    """
+    check_backend(backend)
+
+    doc = SimpleDocTemplate(output_path, pagesize=letter)
+    invoice_date = invoice_date or datetime.now()
+    story = []
+
+    # --- Header Information ---
+    ptext = f"**INVOICE**"
+    story.append(Paragraph(ptext, HEADING_STYLE))
+    story.append(Spacer(1, 0.2 * inch))
+
+    ptext = f"**Invoice To:** {client_name}"
+    story.append(Paragraph(ptext, NORMAL_STYLE))
+    ptext = f"**Project:** {project_name}"
+    story.append(Paragraph(ptext, NORMAL_STYLE))
+    ptext = f"**Invoice Date:** {invoice_date.strftime('%d/%m/%Y')}"
+    story.append(Paragraph(ptext, NORMAL_STYLE))
+    ptext = f"**Payment Terms:** Due upon receipt"
+    story.append(Paragraph(ptext, NORMAL_STYLE))
+    ptext = f"**Currency:** KES"
+    story.append(Paragraph(ptext, NORMAL_STYLE))
+    story.append(Spacer(1, 0.4 * inch))
+
+    # --- Calculate Totals and Prepare Data for Table ---
+    num_days, total_amount, sorted_summary = summarize_work_entries(work_entries, daily_rate)
+    material_summary = None
+    if materials or unit_prices is not None:
+        material_summary = summarize_materials(description for _, description in work_entries)
+    header, col_widths = INVOICE_HEADER, INVOICE_COL_WIDTHS
+    if unit_prices is not None:
+        header, col_widths = UNIT_HEADER, UNIT_COL_WIDTHS
+        priced_rows, total_amount = price_materials(material_summary.rows, unit_prices)
+
+    def table_rows():
+        if unit_prices is not None:
+            yield from priced_rows
+            yield ["", "", "", "**Total**", f"**{total_amount:,.2f}**"]
+            return
+        for date, descriptions in sorted_summary:
+            if backend == CANVAS:
+                # Paragraph shows the line breaks as spaces too
+                description = WrappedText(" ".join(descriptions))
+            else:
+                description = Paragraph("\n".join(descriptions), NORMAL_STYLE)
+            yield [
+                date.strftime("%d/%m/%Y"),
+                description,
+                f"{daily_rate:,.2f}",
+                "1",
+                f"{daily_rate:,.2f}"
+            ]
+        yield ["", "", "", "**Total**", f"**{total_amount:,.2f}**"]
+
+    def closing():
+        yield Spacer(1, 0.4 * inch)
+
+        if materials and unit_prices is None:
+            yield Paragraph("**Materials**", NORMAL_STYLE)
+            yield Spacer(1, 0.1 * inch)
+            table = Table([MATERIALS_HEADER] + [list(row) for row in material_summary.rows], colWidths=MATERIALS_COL_WIDTHS, repeatRows=1)
+            table.setStyle(INVOICE_ROWS_STYLE)
+            yield table
+            yield Spacer(1, 0.2 * inch)
+        if material_summary is not None and (material_summary.unquantified or material_summary.unparsed):
+            counted = "billed" if unit_prices is not None else "counted"
+            if material_summary.unquantified:
+                yield Paragraph(f"{material_summary.unquantified} items without a quantity are not {counted}.", NORMAL_STYLE)
+            if material_summary.unparsed:
+                yield Paragraph(f"{material_summary.unparsed} description parts that are not quantities of material are not {counted}.", NORMAL_STYLE)
+            yield Spacer(1, 0.2 * inch)
+
+        # --- Notes Section ---
+        ptext = "**Notes:** Thank you for your business."
+        yield Paragraph(ptext, NORMAL_STYLE)
+
+    # --- Create the Table ---
+    if backend == CANVAS:
+        table = GridRows(header, table_rows(), col_widths, header_color=colors.whitesmoke, shade_last=False, repeat_header=bool(chunk_rows))
+        with instrumentation.span("invoice_pdf.build"):
+            build_canvas(output_path, instrumentation.timed_iter("invoice_pdf.story", chain(story, [table], closing())))
+    elif chunk_rows:
+        tables = table_chunks(header, table_rows(), col_widths, INVOICE_ROWS_STYLE, chunk_rows, last_style=INVOICE_TABLE_STYLE)
+        with instrumentation.span("invoice_pdf.build"):
+            doc.build(FlowableStream(instrumentation.timed_iter("invoice_pdf.story", chain(story, tables, closing()))))
+    else:
+        with instrumentation.span("invoice_pdf.story"):
+            rows = list(table_rows())
+            table = Table([header] + rows, colWidths=col_widths)
+            table.setStyle(INVOICE_TABLE_STYLE)
+            story.append(table)
+            story.extend(closing())
+        instrumentation.count("pdf.table_rows", len(rows))
+        with instrumentation.span("invoice_pdf.build"):
+            doc.build(story)
+    instrumentation.count("pdf.files")
+    instrumentation.count("pdf.bytes_written", os.path.getsize(output_path))
+    return num_days, total_amount
+
+def price_materials(material_rows, unit_prices):
+    """Table rows and total of per-unit billing for (size, item, quantity) rows."""
+    rows = []
+    total = 0
+    unpriced = []
+    for size, item, quantity in material_rows:
+        price = unit_price(unit_prices, item, size)
+        if price is None:
+            unpriced.append(f"{item} ({size})")
+            continue
+        amount = price * quantity
+        total += amount
+        rows.append([size, item, f"{price:,.2f}", str(quantity), f"{amount:,.2f}"])
+    if unpriced:
+        raise ValueError(f"No unit price for: {', '.join(unpriced)}")
+    return rows, total
+
+# --- Define your data ---
+DAILY_RATE = 10000
+WORK_ENTRIES = [
+    ("26/4/25", "6 joints for 225mm pipes"),
+    ("28/4/25", "7 joints for 225mm pipes, 2 joints for 90mm"),
+    ("29/4/25", "2 joints reducer for 110mm to 90mm, 4 joints for 225mm pipes"),
+    ("30/4/25", "6 joints for 225mm pipes"),
+    ("1/5/25", "3 joints for 225mm pipes"),
+    ("2/5/25", "5 joints for 225mm pipes"),
+    ("3/5/25", "1 joint for 90mm, 2 joints for 225mm pipes"),
+    ("5/5/25", "1 joint for 225mm pipes, 1 joint for 110mm pipes, joints for 160mm pipes"),
+    ("6/5/25", "4 joints for 160mm pipes, 3 t joints for 225mm pipes"),
+    ("7/5/25", "8 joints for 160mm pipes, 3 joints for 225mm pipes"),
+    ("8/5/25", "6 joints for 160mm pipes, 2 joints for reducer 160mm to 110mm, 2 joints for 110mm pipes"),
+    ("9/5/25", "5 joints for 110mm pipes"),
+    ("10/5/25", "5 joints for 110mm pipes"),
+    ("13/5/25", "4 joints for 110mm pipes"),
+    ("14/5/25", "6 joints for 110mm pipes"),
+    ("15/5/25", "3 joints for 110mm pipes"),
+]
+
+if __name__ == "__main__":
+    instrumentation.configure_from()
+    # --- Generate the PDF Invoice ---
+    generate_invoice_pdf(WORK_ENTRIES, DAILY_RATE, client_name="[Client Name]", project_name="Mwala cluster water project (transmission line)")
+    print("Invoice generated successfully as 'invoice.pdf'")
@@ -0,0 +1,83 @@
+"""Progress of each goal from the tasks attached to it.
+
+Every goal keeps the set of its attached tasks and a count of those done.
+The counts are updated as tasks are added, removed, attached, detached or
+marked done, so a goal's progress is read in O(1) and never by scanning
+the tasks. Goals are ``(goal_type, goal)`` pairs, as in Task.goal.
+"""
+
+from collections import namedtuple
+
+# done: attached tasks marked done; total: attached tasks
+Progress = namedtuple("Progress", "done total")
+
+
+def progress_text(progress):
+    """``3/4 (75%)``, or ``-`` for a goal without tasks."""
+    if not progress.total:
+        return "-"
+    return (
+        f"{progress.done}/{progress.total} "
+        f"({progress.done * 100 // progress.total}%)"
+    )
+
+
+class GoalProgress:
+    def __init__(self, goals, tasks=()):
+        # goals maps goal type -> goal list; tasks are Task records
+        self._tasks = {}
+        self._done = {}
+        for goal_type, goals_list in goals.items():
+            for goal in goals_list:
+                self.add_goal(goal_type, goal)
+        self.add_tasks(tasks)
+
+    def add_goal(self, goal_type, goal):
+        key = (goal_type, goal)
+        if key not in self._tasks:
+            self._tasks[key] = set()
+            self._done[key] = 0
+
+    def remove_goal(self, goal_type, goal):
+        """Forget a goal; returns the records that were attached to it."""
+        key = (goal_type, goal)
+        del self._done[key]
+        return list(self._tasks.pop(key))
+
+    def add_task(self, record):
+        members = self._tasks.get(record.goal)
+        if members is not None:
+            members.add(record)
+            self._done[record.goal] += record.done
+
+    def add_tasks(self, records):
+        for record in records:
+            self.add_task(record)
+
+    def remove_task(self, record):
+        members = self._tasks.get(record.goal)
+        if members is not None and record in members:
+            members.remove(record)
+            self._done[record.goal] -= record.done
+
+    def moved(self, record, previous_goal):
+        """Note that ``record.goal`` changed from ``previous_goal``."""
+        members = self._tasks.get(previous_goal)
+        if members is not None and record in members:
+            members.remove(record)
+            self._done[previous_goal] -= record.done
+        self.add_task(record)
+
+    def marked(self, record, was_done):
+        """Note that ``record.done`` changed from ``was_done``."""
+        members = self._tasks.get(record.goal)
+        if members is not None and record in members:
+            self._done[record.goal] += record.done - was_done
+
+    def progress(self, goal_type, goal):
+        key = (goal_type, goal)
+        return Progress(self._done.get(key, 0), len(self._tasks.get(key, ())))
+
+    def tasks(self, goal_type, goal):
+        """The records attached to a goal, in no particular order."""
+        return list(self._tasks.get((goal_type, goal), ()))
@@ -0,0 +1,322 @@
+"""Timing spans, counters and optional profiling, written as a JSON report.
+
+Instrumentation is off by default and then costs one attribute check per
+span. It is switched on by setting ``PLANNER_INSTRUMENT`` to the path of the
+report (or by the ``--instrument`` flag of the app, the service and the
+batch scripts); the report is written there when the process exits.
+``PLANNER_PROFILE`` (or ``--profile``) adds ``cprofile`` and/or
+``tracemalloc`` capture, comma separated:
+
+    PLANNER_INSTRUMENT=run.json PLANNER_PROFILE=cprofile python daily_planner_app.py
+
+* spans: ``with span("name"):``, the ``@timed("name")`` decorator, or
+  ``timed_iter("name", iterable)`` for time spent producing the items of a
+  lazy story. Each name reports its count, total, mean and max in ms.
+* counters: ``count("name", amount)``, e.g. rows rendered or bytes written.
+* cprofile: profiles the thread that enabled it (the Tk thread in the app);
+  the top functions by cumulative time go in the report and the full stats
+  next to it as ``<report>.prof``. Worker threads show up through spans.
+* tracemalloc: the peak traced memory and the top allocating lines.
+
+The report is JSON with sorted keys, so two runs can be compared with any
+diff tool, or with ``python -m instrumentation diff old.json new.json``,
+which prints the change of every span and counter. Work done in child
+processes (the batch scripts' process pools) is not collected.
+"""
+
+import argparse
+import atexit
+import functools
+import io
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+REPORT_ENV = "PLANNER_INSTRUMENT"
+PROFILE_ENV = "PLANNER_PROFILE"
+PROFILERS = ("cprofile", "tracemalloc")
+# Entries kept in the report for each profiler
+TOP_ENTRIES = 25
+
+_NO_SPAN = nullcontext()
+
+
+class Instruments:
+    def __init__(self):
+        self.enabled = False
+        self.report_path = None
+        self._lock = threading.Lock()
+        self._spans = {}
+        self._counters = {}
+        self._profiler = None
+        self._tracing = False
+        self._started = time.perf_counter()
+
+    def configure(self, report_path=None, profile=()):
+        """Start collecting; the report is written to ``report_path`` at exit."""
+        unknown = set(profile) - set(PROFILERS)
+        if unknown:
+            raise ValueError(f"Unknown profiler: {', '.join(sorted(unknown))}")
+        # The profilers are imported only when asked for, to keep them out of
+        # the start-up time of every app and script that imports this module
+        import cProfile
+        import tracemalloc
+
+        if report_path and self.report_path is None:
+            atexit.register(self._write_at_exit)
+        self.report_path = report_path or self.report_path
+        self.enabled = True
+        if "cprofile" in profile and self._profiler is None:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        if "tracemalloc" in profile and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+
+    def reset(self):
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+        self._started = time.perf_counter()
+
+    def span(self, name):
+        """Context manager timing the block under ``name``."""
+        if not self.enabled:
+            return _NO_SPAN
+        return self._span(name)
+
+    @contextmanager
+    def _span(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - started)
+
+    def add_time(self, name, seconds):
+        with self._lock:
+            stats = self._spans.get(name)
+            if stats is None:
+                self._spans[name] = [1, seconds, seconds]
+            else:
+                stats[0] += 1
+                stats[1] += seconds
+                if seconds > stats[2]:
+                    stats[2] = seconds
+
+    def count(self, name, amount=1):
+        if self.enabled:
+            with self._lock:
+                self._counters[name] = self._counters.get(name, 0) + amount
+
+    def timed(self, name):
+        """Decorator timing every call of the function under ``name``."""
+
+        def decorate(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                with self._span(name):
+                    return function(*args, **kwargs)
+
+            return wrapper
+
+        return decorate
+
+    def timed_iter(self, name, iterable):
+        """Yield from ``iterable``, timing only the work of producing items.
+
+        The time the consumer spends between items is not included, so for
+        a story streamed into ``doc.build`` this is the story construction
+        and the build span minus it is the layout.
+        """
+        if not self.enabled:
+            yield from iterable
+            return
+        iterator = iter(iterable)
+        spent = 0.0
+        calls = 0
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    spent += time.perf_counter() - started
+                    calls += 1
+                yield item
+        finally:
+            if calls:
+                self.add_time(name, spent)
+
+    def report(self):
+        """The collected spans, counters and profiles as a JSON-ready dict."""
+        import platform
+
+        with self._lock:
+            spans = {
+                name: {
+                    "count": calls,
+                    "total_ms": round(total * 1e3, 3),
+                    "mean_ms": round(total / calls * 1e3, 3),
+                    "max_ms": round(longest * 1e3, 3),
+                }
+                for name, (calls, total, longest) in self._spans.items()
+            }
+            counters = dict(self._counters)
+        report = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "wall_ms": round((time.perf_counter() - self._started) * 1e3, 3),
+            "spans": spans,
+            "counters": counters,
+        }
+        if self._profiler is not None:
+            report["cprofile"] = self._profile_entries()
+        if self._tracing:
+            report["tracemalloc"] = self._memory_entries()
+        return report
+
+    def write_report(self, path=None):
+        path = path or self.report_path
+        if self._profiler is not None:
+            self._profiler.dump_stats(os.path.splitext(path)[0] + ".prof")
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as report_file:
+            json.dump(self.report(), report_file, indent=2, sort_keys=True)
+            report_file.write("\n")
+        os.replace(temp_path, path)
+        return path
+
+    def _write_at_exit(self):
+        if self._profiler is not None:
+            self._profiler.disable()
+        self.write_report()
+
+    def _profile_entries(self):
+        import pstats
+
+        stats = pstats.Stats(self._profiler, stream=io.StringIO())
+        entries = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+        return [
+            {
+                "function": f"{os.path.basename(file_name)}:{line}({function})",
+                "calls": calls,
+                "own_ms": round(own * 1e3, 3),
+                "cumulative_ms": round(cumulative * 1e3, 3),
+            }
+            for (file_name, line, function), (_, calls, own, cumulative, _) in entries[
+                :TOP_ENTRIES
+            ]
+        ]
+
+    def _memory_entries(self):
+        import tracemalloc
+
+        peak = tracemalloc.get_traced_memory()[1]
+        top = tracemalloc.take_snapshot().statistics("lineno")[:TOP_ENTRIES]
+        return {
+            "peak_bytes": peak,
+            "top": [
+                {
+                    "line": f"{os.path.basename(stat.traceback[0].filename)}:"
+                    f"{stat.traceback[0].lineno}",
+                    "bytes": stat.size,
+                    "blocks": stat.count,
+                }
+                for stat in top
+            ],
+        }
+
+
+INSTRUMENTS = Instruments()
+configure = INSTRUMENTS.configure
+span = INSTRUMENTS.span
+count = INSTRUMENTS.count
+timed = INSTRUMENTS.timed
+timed_iter = INSTRUMENTS.timed_iter
+report = INSTRUMENTS.report
+write_report = INSTRUMENTS.write_report
+
+
+def add_arguments(parser):
+    """Add ``--instrument`` and ``--profile`` to an argparse parser."""
+    parser.add_argument(
+        "--instrument",
+        metavar="REPORT",
+        help="write timing spans and counters to this JSON file at exit",
+    )
+    parser.add_argument(
+        "--profile",
+        default="",
+        help=f"comma-separated profilers to add to the report: {', '.join(PROFILERS)}",
+    )
+
+
+def configure_from(args=None, environ=os.environ):
+    """Configure from parsed ``add_arguments`` flags, else the environment.
+
+    Called by the command line entry points only. Pool workers inherit the
+    environment, so in a child process this does nothing; otherwise every
+    worker would overwrite the parent's report when it exits.
+    """
+    import multiprocessing
+
+    if multiprocessing.parent_process() is not None:
+        return
+    report_path = getattr(args, "instrument", None) or environ.get(REPORT_ENV)
+    profile = getattr(args, "profile", None) or environ.get(PROFILE_ENV, "")
+    if report_path:
+        configure(report_path, [name for name in profile.split(",") if name])
+
+
+def diff_reports(old, new):
+    """Yield ``(kind, name, old value, new value)`` for spans and counters."""
+    for kind, field in (("spans", "total_ms"), ("counters", None)):
+        old_items = old.get(kind, {})
+        new_items = new.get(kind, {})
+        for name in sorted(set(old_items) | set(new_items)):
+            values = []
+            for items in (old_items, new_items):
+                value = items.get(name)
+                if field and value is not None:
+                    value = value[field]
+                values.append(value)
+            yield (kind, name, *values)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two instrumentation reports.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    diff_parser = subparsers.add_parser("diff", help="show the change per span/counter")
+    diff_parser.add_argument("old")
+    diff_parser.add_argument("new")
+    args = parser.parse_args(argv)
+
+    reports = []
+    for path in (args.old, args.new):
+        with open(path, encoding="utf-8") as report_file:
+            reports.append(json.load(report_file))
+    for kind, name, old_value, new_value in diff_reports(*reports):
+        unit = "ms" if kind == "spans" else ""
+        if old_value is None or new_value is None:
+            change = "only in new" if old_value is None else "only in old"
+        elif old_value:
+            change = f"{(new_value - old_value) / old_value:+.1%}"
+        else:
+            change = "n/a"
+        print(
+            f"{kind[:-1]:>7} {name:<32} {old_value!s:>12}{unit} "
+            f"-> {new_value!s:>12}{unit}  {change}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
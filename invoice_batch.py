@@ -0,0 +1,285 @@
+"""Batch invoicing: one invoice per client, project and period from a ledger.
+
+The ledger is a CSV file with ``client``, ``project``, ``date`` (d/m/yy) and
+``description`` columns. It is read once, row by row, and grouped as it
+goes. Invoices are then rendered in a process pool. Only a few groups are
+handed to the pool at a time, so at most a handful of invoice stories exist
+at once however large the ledger is. Every invoice gets a unique file name,
+and a manifest describing them is returned and written next to the PDFs.
+
+    python invoice_batch.py ledger.csv --out invoices --daily-rate 10000
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+
+from generate_invoice import WORK_DATE_FORMAT, generate_invoice_pdf
+import instrumentation
+from pdf_canvas import BACKENDS, PLATYPUS
+from pdf_stream import PAGE_ROWS
+from work_quantities import unit_prices_from_json
+
+PERIODS = ("month", "all")
+MANIFEST_NAME = "manifest.json"
+
+
+def group_ledger(rows, period="month", errors=None):
+    """Group ledger rows in a single pass.
+
+    Returns ``{(client, project, period): [(date, description), ...]}`` with
+    the groups in the order they first appear. A row whose date is not
+    d/m/yy is left out; if ``errors`` is a list, ``(row number, row, message)``
+    is appended to it for each such row, numbered from 1.
+    """
+    groups = defaultdict(list)
+    # Ledgers repeat the same dates over and over; parse each string once
+    periods = {}
+    for number, row in enumerate(rows, 1):
+        date_str = row["date"].strip()
+        invoice_period = periods.get(date_str)
+        if invoice_period is None:
+            try:
+                work_date = datetime.strptime(date_str, WORK_DATE_FORMAT)
+            except ValueError:
+                if errors is not None:
+                    errors.append(
+                        (number, row, f"date must be d/m/yy, not {date_str!r}")
+                    )
+                continue
+            invoice_period = "all" if period == "all" else work_date.strftime("%Y-%m")
+            periods[date_str] = invoice_period
+        key = (row["client"].strip(), row["project"].strip(), invoice_period)
+        groups[key].append((date_str, row["description"].strip()))
+    return groups
+
+
+def read_ledger(path):
+    """Yield the rows of a ledger CSV file as dicts."""
+    with open(path, newline="", encoding="utf-8") as ledger_file:
+        yield from csv.DictReader(ledger_file)
+
+
+def slugify(text):
+    return re.sub(r"[^A-Za-z0-9]+", "-", text).strip("-").lower() or "invoice"
+
+
+def invoice_file_names(keys):
+    """Map each (client, project, period) to a unique PDF file name."""
+    used = set()
+    names = {}
+    for client, project, period in keys:
+        base = f"invoice_{slugify(client)}_{slugify(project)}_{period}"
+        name = f"{base}.pdf"
+        number = 1
+        while name in used:
+            number += 1
+            name = f"{base}-{number}.pdf"
+        used.add(name)
+        names[(client, project, period)] = name
+    return names
+
+
+def render_invoice(
+    work_entries,
+    daily_rate,
+    client,
+    project,
+    pdf_path,
+    chunk_rows,
+    materials=False,
+    unit_prices=None,
+    backend=PLATYPUS,
+):
+    started = time.perf_counter()
+    days, total = generate_invoice_pdf(
+        work_entries,
+        daily_rate,
+        client_name=client,
+        project_name=project,
+        chunk_rows=chunk_rows,
+        output_path=pdf_path,
+        materials=materials,
+        unit_prices=unit_prices,
+        backend=backend,
+    )
+    return days, total, time.perf_counter() - started
+
+
+def generate_invoices(
+    ledger_rows,
+    out_dir,
+    daily_rate,
+    period="month",
+    workers=None,
+    chunk_rows=PAGE_ROWS,
+    materials=False,
+    unit_prices=None,
+    backend=PLATYPUS,
+):
+    """Render one invoice per (client, project, period) found in ``ledger_rows``.
+
+    ``materials``, ``unit_prices`` and ``backend`` are passed on to
+    generate_invoice_pdf.
+
+    Returns the manifest: a list of dicts with the client, project, period,
+    file path, number of ledger entries, billable days, total and render
+    time of every invoice, in ledger order. An invoice that could not be
+    rendered has a None path and an ``error`` instead of days, total and
+    time; the others are still rendered. A ledger row with a bad date is
+    skipped and gets its own entry after the invoices, with a None period
+    and path, its ``row`` number and an ``error``. The manifest is also
+    written to ``manifest.json`` in ``out_dir``.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    bad_rows = []
+    groups = group_ledger(ledger_rows, period, bad_rows)
+    names = invoice_file_names(groups)
+    workers = workers or os.cpu_count() or 1
+    manifest = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        keys = iter(list(groups))
+        exhausted = False
+        while pending or not exhausted:
+            # Keep only a couple of invoices per worker in flight
+            while not exhausted and len(pending) < 2 * workers:
+                key = next(keys, None)
+                if key is None:
+                    exhausted = True
+                    break
+                client, project, _ = key
+                pdf_path = os.path.join(out_dir, names[key])
+                work_entries = groups.pop(key)
+                future = pool.submit(
+                    render_invoice,
+                    work_entries,
+                    daily_rate,
+                    client,
+                    project,
+                    pdf_path,
+                    chunk_rows,
+                    materials,
+                    unit_prices,
+                    backend,
+                )
+                pending[future] = (key, pdf_path, len(work_entries))
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                key, pdf_path, entry_count = pending.pop(future)
+                client, project, invoice_period = key
+                entry = manifest[key] = {
+                    "client": client,
+                    "project": project,
+                    "period": invoice_period,
+                    "path": pdf_path,
+                    "entries": entry_count,
+                }
+                try:
+                    days, total, seconds = future.result()
+                except Exception as error:
+                    # One bad group must not cost the rest of the batch
+                    if os.path.exists(pdf_path):
+                        os.remove(pdf_path)
+                    entry["path"] = None
+                    entry["error"] = str(error) or repr(error)
+                    continue
+                entry["days"] = days
+                entry["total"] = total
+                entry["seconds"] = round(seconds, 4)
+
+    entries = [manifest[key] for key in names]
+    entries.extend(
+        {
+            "client": row["client"].strip(),
+            "project": row["project"].strip(),
+            "period": None,
+            "path": None,
+            "entries": 1,
+            "row": number,
+            "error": message,
+        }
+        for number, row, message in bad_rows
+    )
+    with open(os.path.join(out_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(entries, f, indent=2)
+    return entries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Render one invoice per client, project and period from a ledger."
+    )
+    parser.add_argument("ledger", help="CSV with client,project,date,description")
+    parser.add_argument("--out", default="invoices", help="output directory")
+    parser.add_argument("--daily-rate", type=float, default=10000)
+    parser.add_argument("--period", choices=PERIODS, default="month")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument(
+        "--materials",
+        action="store_true",
+        help="add the quantity of each item per size found in the descriptions",
+    )
+    parser.add_argument(
+        "--unit-prices",
+        help="JSON file of item -> price (or item -> {size: price}); "
+        "bills the quantities per unit instead of per day",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default=PLATYPUS,
+        help="PDF renderer; canvas is much faster for long invoices",
+    )
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args(argv)
+    instrumentation.configure_from(args)
+
+    unit_prices = None
+    if args.unit_prices:
+        with open(args.unit_prices, encoding="utf-8") as prices_file:
+            unit_prices = unit_prices_from_json(json.load(prices_file))
+
+    started = time.perf_counter()
+    manifest = generate_invoices(
+        read_ledger(args.ledger),
+        args.out,
+        args.daily_rate,
+        args.period,
+        args.workers,
+        materials=args.materials,
+        unit_prices=unit_prices,
+        backend=args.backend,
+    )
+    elapsed = time.perf_counter() - started
+    failed = 0
+    for entry in manifest:
+        if "error" in entry:
+            failed += 1
+            print(
+                f"  FAILED  {entry['client']} / {entry['project']} / "
+                f"{entry['period'] or 'row %d' % entry['row']}: {entry['error']}",
+                file=sys.stderr,
+            )
+    generated = len(manifest) - failed
+    print(
+        f"Generated {generated} invoices in {elapsed:.2f}s "
+        f"({generated / elapsed if elapsed else 0:.2f} invoices/sec)"
+        + (f", {failed} failed" if failed else "")
+        + f"; manifest: {os.path.join(args.out, MANIFEST_NAME)}"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,364 @@
+"""Fast PDF backend that draws grid tables straight onto a pdfgen canvas.
+
+Platypus builds a Table by measuring every cell, every row and every split
+candidate before anything is drawn. The grid tables of the planner and the
+invoice do not need any of that: their columns are fixed, every cell is
+one font, and almost every row is a single line. CanvasDocument lays such a
+story out itself. A GridRows item stands in for a grid Table. Its column
+positions are computed once, and each row is measured with stringWidth and
+only wrapped when its text is wider than its column. Rows are drawn a page
+at a time: one background rectangle per colour, the text, then the grid
+lines. Everything else in the story (titles, headings, small tables) is an
+ordinary flowable, wrapped and drawn on the same canvas.
+
+The geometry matches SimpleDocTemplate on a letter page and the grid table
+styles in pdf_theme: 1 inch margins, 6 point frame padding, 6/3 point cell
+padding, 10 point Helvetica on a 12 point leading. A grid that continues on
+a new page repeats its header only when asked to, as platypus tables do.
+Cell text is drawn as it is, never parsed as Paragraph markup.
+"""
+
+from collections import namedtuple
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.pdfbase.pdfmetrics import getFont, stringWidth
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import PageBreak
+
+import instrumentation
+from background_jobs import Cancelled
+
+PLATYPUS = "platypus"
+CANVAS = "canvas"
+BACKENDS = (PLATYPUS, CANVAS)
+
+# SimpleDocTemplate's frame on a letter page
+FRAME_PADDING = 6
+FRAME_LEFT = inch + FRAME_PADDING
+FRAME_BOTTOM = inch + FRAME_PADDING
+FRAME_WIDTH = letter[0] - 2 * FRAME_LEFT
+FRAME_TOP = letter[1] - inch - FRAME_PADDING
+# Frame's tolerance when deciding whether a flowable fits
+FUZZ = 1e-6
+
+# The grid table styles of pdf_theme
+FONT = "Helvetica"
+HEADER_FONT = "Helvetica-Bold"
+# Paragraph draws symbols such as the importance dot in this font
+MARK_FONT = "ZapfDingbats"
+FONT_SIZE = 10
+LEADING = 12
+CELL_PADDING = 6
+CELL_TOP_PADDING = 3
+CELL_BOTTOM_PADDING = 3
+HEADER_BOTTOM_PADDING = 12
+HEADER_HEIGHT = CELL_TOP_PADDING + LEADING + HEADER_BOTTOM_PADDING
+# Text no longer than its column's width over this always fits unmeasured
+MAX_CHAR_WIDTH = max(getFont(FONT).widths) * FONT_SIZE / 1000
+# A Paragraph line may squeeze each of its spaces by this fraction to fit
+SPACE_SHRINKAGE = ParagraphStyle.defaults["spaceShrinkage"]
+# Widths of centred cell text remembered per document; dates, times and
+# amounts repeat down a column
+WIDTH_CACHE_SIZE = 4096
+HEADER_BACKGROUND = colors.grey
+ROW_BACKGROUND = colors.beige
+GRID_COLOR = colors.black
+GRID_WIDTH = 1
+
+
+class WrappedText(str):
+    """Cell text that is left aligned and wrapped to its column, like a Paragraph."""
+
+    __slots__ = ()
+
+
+# A MARK_FONT glyph drawn left aligned in its own colour, like importance_dot
+Mark = namedtuple("Mark", "glyph color")
+
+
+def check_backend(backend):
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Unknown PDF backend {backend!r}; expected one of {', '.join(BACKENDS)}"
+        )
+    return backend
+
+
+class GridRows:
+    """A grid table for CanvasDocument: ``header`` over an iterable of rows.
+
+    Plain cells are centred and split at newlines, WrappedText cells are
+    wrapped and Mark cells are drawn in their colour. With ``shade_last``
+    False the final row (an invoice total) has no background.
+    ``repeat_header`` draws the header again on every page the grid
+    continues on.
+    """
+
+    def __init__(
+        self,
+        header,
+        rows,
+        col_widths,
+        header_color=colors.white,
+        shade_last=True,
+        repeat_header=False,
+    ):
+        self.header = header
+        self.rows = rows
+        self.header_color = header_color
+        self.shade_last = shade_last
+        self.repeat_header = repeat_header
+        self.width = sum(col_widths)
+        # Centred in the frame, as Table's default hAlign; wider tables
+        # overhang both margins equally
+        self.left = FRAME_LEFT + (FRAME_WIDTH - self.width) / 2
+        edges = [self.left]
+        for col_width in col_widths:
+            edges.append(edges[-1] + col_width)
+        self.edges = edges
+        # (centre, left text edge, text width) per column
+        self.columns = [
+            (left + col_width / 2, left + CELL_PADDING, col_width - 2 * CELL_PADDING)
+            for left, col_width in zip(edges, col_widths)
+        ]
+
+
+def cell_lines(value, text_width):
+    """``(left aligned, lines)`` of a cell, or the Mark itself."""
+    kind = type(value)
+    if kind is WrappedText:
+        # Measuring is much cheaper than splitting, and most text fits
+        if (
+            len(value) * MAX_CHAR_WIDTH <= text_width
+            or stringWidth(value, FONT, FONT_SIZE) <= text_width
+        ):
+            return True, (value,)
+        return True, wrap_text(value, text_width)
+    if kind is Mark:
+        return value
+    value = str(value)
+    return False, value.split("\n") if "\n" in value else (value,)
+
+
+def wrap_text(text, width):
+    """Break ``text`` into lines of at most ``width``, as a Paragraph does.
+
+    Whitespace runs collapse to one space, and a line is broken where
+    adding the next word would not fit even with its spaces squeezed by
+    SPACE_SHRINKAGE. A word wider than the column gets a line to itself.
+    """
+    space = stringWidth(" ", FONT, FONT_SIZE)
+    shrink = space * SPACE_SHRINKAGE
+    lines = []
+    line = []
+    line_width = -space
+    for word in text.split():
+        word_width = stringWidth(word, FONT, FONT_SIZE)
+        line_width += space + word_width
+        if line and line_width > width + shrink * len(line):
+            lines.append(" ".join(line))
+            line = []
+            line_width = word_width
+        line.append(word)
+    lines.append(" ".join(line))
+    return lines
+
+
+class CanvasDocument:
+    """Lays out a story of flowables and GridRows onto letter pages."""
+
+    def __init__(self, path, cancel_event=None):
+        self.canvas = Canvas(path, pagesize=letter)
+        self.cancel_event = cancel_event
+        self.pages = 1
+        self.y = FRAME_TOP
+        self.at_top = True
+        self.widths = {}
+
+    def check_cancelled(self):
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise Cancelled()
+
+    def new_page(self):
+        self.check_cancelled()
+        self.canvas.showPage()
+        self.pages += 1
+        self.y = FRAME_TOP
+        self.at_top = True
+
+    def add(self, flowable):
+        if isinstance(flowable, GridRows):
+            self.grid(flowable)
+        elif isinstance(flowable, PageBreak):
+            self.new_page()
+        else:
+            self.flowable(flowable)
+
+    def flowable(self, flowable):
+        """Draw a platypus flowable, splitting it across pages like a Frame."""
+        pending = [flowable]
+        while pending:
+            flowable = pending.pop(0)
+            space_before = 0 if self.at_top else flowable.getSpaceBefore()
+            available = self.y - space_before - FRAME_BOTTOM
+            width, height = flowable.wrap(FRAME_WIDTH, available)
+            if height > available + FUZZ:
+                parts = flowable.split(FRAME_WIDTH, available)
+                if parts:
+                    flowable = parts[0]
+                    width, height = flowable.wrap(FRAME_WIDTH, available)
+                    pending[:0] = parts[1:]
+                elif not self.at_top:
+                    self.new_page()
+                    pending.insert(0, flowable)
+                    continue
+            # Unsplittable and too tall even for an empty page: drawn anyway
+            # rather than lost
+            y = self.y - space_before - height
+            flowable.drawOn(self.canvas, FRAME_LEFT, y, _sW=FRAME_WIDTH - width)
+            self.y = y - flowable.getSpaceAfter()
+            self.at_top = False
+            if pending:
+                self.new_page()
+
+    def grid(self, grid):
+        """Draw ``grid`` from the current position, page by page."""
+        segment = []
+        header = True
+        available = self.y - FRAME_BOTTOM - HEADER_HEIGHT
+        rows = iter(grid.rows)
+        row = next(rows, None)
+        count = 0
+        while row is not None:
+            next_row = next(rows, None)
+            cells = [
+                cell_lines(value, text_width)
+                for value, (_, _, text_width) in zip(row, grid.columns)
+            ]
+            height = (
+                max(1 if type(cell) is Mark else len(cell[1]) for cell in cells)
+                * LEADING
+                + CELL_TOP_PADDING
+                + CELL_BOTTOM_PADDING
+            )
+            # The header and at least one row go together on a page
+            if height > available + FUZZ and (segment or not self.at_top):
+                if segment:
+                    self.draw_segment(grid, segment, header)
+                    header = grid.repeat_header
+                self.new_page()
+                segment = []
+                available = self.y - FRAME_BOTTOM - (HEADER_HEIGHT if header else 0)
+            segment.append((height, cells, grid.shade_last or next_row is not None))
+            available -= height
+            count += 1
+            row = next_row
+        instrumentation.count("pdf.table_rows", count)
+        if not segment and available < -FUZZ and not self.at_top:
+            # A table without rows is just its header
+            self.new_page()
+        self.draw_segment(grid, segment, header)
+
+    def draw_segment(self, grid, segment, header=True):
+        """Draw the ``segment`` rows of ``grid`` below ``self.y``, under its header."""
+        canvas = self.canvas
+        left = grid.left
+        top = self.y
+        header_bottom = top - HEADER_HEIGHT if header else top
+        bottom = header_bottom - sum(height for height, _, _ in segment)
+        shaded_bottom = bottom
+        if segment and not segment[-1][2]:
+            shaded_bottom += segment[-1][0]
+
+        if header:
+            canvas.setFillColor(HEADER_BACKGROUND)
+            canvas.rect(
+                left, header_bottom, grid.width, HEADER_HEIGHT, stroke=0, fill=1
+            )
+            canvas.setFillColor(grid.header_color)
+            canvas.setFont(HEADER_FONT, FONT_SIZE, LEADING)
+            baseline = header_bottom + HEADER_BOTTOM_PADDING + LEADING - FONT_SIZE
+            for (centre, _, _), text in zip(grid.columns, grid.header):
+                canvas.drawCentredString(centre, baseline, text)
+        if shaded_bottom < header_bottom:
+            canvas.setFillColor(ROW_BACKGROUND)
+            canvas.rect(
+                left,
+                shaded_bottom,
+                grid.width,
+                header_bottom - shaded_bottom,
+                stroke=0,
+                fill=1,
+            )
+
+        # One text object for every cell of the page, instead of one per
+        # string as drawString makes
+        text = canvas.beginText()
+        text.setFont(FONT, FONT_SIZE, LEADING)
+        text.setFillColor(GRID_COLOR)
+        move_to = text.setTextOrigin
+        draw = text.textLine
+        widths = self.widths
+        if len(widths) > WIDTH_CACHE_SIZE:
+            widths.clear()
+        marks = []
+        boundaries = [top, header_bottom] if header else [top]
+        row_top = header_bottom
+        for height, cells, _ in segment:
+            row_bottom = row_top - height
+            boundaries.append(row_bottom)
+            # Bottom aligned, like both string and Paragraph cells
+            baseline = row_bottom + CELL_BOTTOM_PADDING - FONT_SIZE
+            for (centre, text_left, _), cell in zip(grid.columns, cells):
+                if type(cell) is Mark:
+                    marks.append((cell, text_left, baseline + LEADING))
+                    continue
+                left_aligned, lines = cell
+                y = baseline + len(lines) * LEADING
+                for line in lines:
+                    if left_aligned:
+                        move_to(text_left, y)
+                    else:
+                        width = widths.get(line)
+                        if width is None:
+                            width = widths[line] = stringWidth(line, FONT, FONT_SIZE)
+                        move_to(centre - width / 2, y)
+                    draw(line)
+                    y -= LEADING
+            row_top = row_bottom
+
+        # All in one font, rather than a switch to it and back per mark
+        text.setFont(MARK_FONT, FONT_SIZE, LEADING)
+        color = None
+        for mark, x, y in marks:
+            if mark.color != color:
+                color = mark.color
+                text.setFillColor(color)
+            move_to(x, y)
+            draw(mark.glyph)
+        # The text object's colours must not outlive it
+        canvas.saveState()
+        canvas.drawText(text)
+        canvas.restoreState()
+
+        canvas.setStrokeColor(GRID_COLOR)
+        canvas.setLineWidth(GRID_WIDTH)
+        canvas.lines(
+            [(left, y, grid.edges[-1], y) for y in boundaries]
+            + [(x, top, x, bottom) for x in grid.edges]
+        )
+        self.y = bottom
+        self.at_top = False
+
+
+def build_canvas(path, story, cancel_event=None):
+    """Lay ``story`` out into a PDF at ``path``; returns the number of pages."""
+    document = CanvasDocument(path, cancel_event)
+    for flowable in story:
+        document.add(flowable)
+    document.check_cancelled()
+    document.canvas.save()
+    return document.pages
@@ -0,0 +1,71 @@
+"""Streaming helpers for building very large PDFs with bounded memory.
+
+``FlowableStream`` lets ``doc.build`` pull flowables from a generator instead
+of a fully built story list, and ``table_chunks`` turns a stream of rows into
+fixed-size tables that each repeat the header. Together they keep only a few
+pages' worth of flowables alive no matter how many rows are exported, and
+ReportLab never has to split one giant table page by page.
+"""
+
+from itertools import islice
+
+from reportlab.platypus import Table
+
+import instrumentation
+
+# Rows per chunk table; roughly one letter page of single-line rows
+PAGE_ROWS = 30
+
+
+class FlowableStream(list):
+    """A story list that is refilled from an iterator as ``doc.build`` consumes it.
+
+    ``doc.build`` only looks at the front of the story (and a little ahead
+    for keep-with-next), so a short buffer is enough.
+    """
+
+    def __init__(self, flowables, lookahead=4):
+        super().__init__()
+        self._source = iter(flowables)
+        self._lookahead = lookahead
+
+    def _fill(self, size):
+        while self._source is not None and list.__len__(self) < size:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+
+    def __len__(self):
+        self._fill(self._lookahead)
+        return list.__len__(self)
+
+    def __getitem__(self, index):
+        if isinstance(index, int) and index >= 0:
+            self._fill(index + 1)
+        elif isinstance(index, slice) or index < 0:
+            self._fill(float("inf"))
+        return list.__getitem__(self, index)
+
+
+def table_chunks(
+    header, rows, col_widths, style, chunk_rows=PAGE_ROWS, last_style=None
+):
+    """Yield Tables of at most ``chunk_rows`` rows from the ``rows`` iterable.
+
+    Every chunk starts with ``header`` (and repeats it if it still has to be
+    split across pages). ``last_style``, when given, is used for the final
+    chunk, e.g. for a total row that must not be shaded.
+    """
+    rows = iter(rows)
+    chunk = list(islice(rows, chunk_rows))
+    while True:
+        next_chunk = list(islice(rows, chunk_rows))
+        is_last = not next_chunk
+        table = Table([header] + chunk, colWidths=col_widths, repeatRows=1)
+        instrumentation.count("pdf.table_rows", len(chunk))
+        table.setStyle(last_style if is_last and last_style is not None else style)
+        yield table
+        if is_last:
+            return
+        chunk = next_chunk
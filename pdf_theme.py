@@ -0,0 +1,90 @@
+"""Shared ReportLab styles for the planner and invoice PDFs.
+
+The stylesheet and table styles are built once at import and reused by every
+render. Nothing here is mutated after import, so the objects can be shared
+between documents and worker threads.
+"""
+
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph, TableStyle
+
+from pdf_canvas import Mark
+from task_store import IMPORTANCE_COLORS
+
+STYLES = getSampleStyleSheet()
+TITLE_STYLE = STYLES["Title"]
+HEADING_STYLE = STYLES["Heading1"]
+NORMAL_STYLE = STYLES["Normal"]
+
+# Grey header row over beige rows: tasks, goals, prayers and sunnah tables
+GRID_TABLE_COMMANDS = (
+    ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
+    ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
+    ("GRID", (0, 0), (-1, -1), 1, colors.black),
+)
+GRID_TABLE_STYLE = TableStyle(list(GRID_TABLE_COMMANDS))
+
+# Same look for the invoice, whose last row (the total) stays unshaded
+INVOICE_TABLE_COMMANDS = (
+    ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
+    ("BACKGROUND", (0, 1), (-1, -2), colors.beige),
+    ("GRID", (0, 0), (-1, -1), 1, colors.black),
+)
+INVOICE_TABLE_STYLE = TableStyle(list(INVOICE_TABLE_COMMANDS))
+# Invoice chunks before the one holding the total are shaded throughout
+INVOICE_ROWS_STYLE = TableStyle(
+    list(INVOICE_TABLE_COMMANDS) + [("BACKGROUND", (0, -1), (-1, -1), colors.beige)]
+)
+
+# Importance legend shown next to the planner title
+LEGEND_TABLE_STYLE = TableStyle(
+    [
+        ("BOTTOMPADDING", (0, 0), (-1, 0), 20),
+        ("TEXTCOLOR", (1, 1), (1, 1), colors.green),
+        ("TEXTCOLOR", (1, 2), (1, 2), colors.yellow),
+        ("TEXTCOLOR", (1, 3), (1, 3), colors.red),
+        ("FONTSIZE", (1, 1), (1, -1), 15),
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+        ("GRID", (0, 0), (-1, -1), 1, colors.black),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
+    ]
+)
+HEADER_LAYOUT_STYLE = TableStyle([("ALIGN", (0, 0), (-1, -1), "LEFT")])
+
+
+def importance_dot(importance):
+    """Return the shared coloured-dot Paragraph for an importance level.
+
+    Rows with the same importance reuse one Paragraph, so the markup is
+    parsed once per level instead of once per row.
+    """
+    return _IMPORTANCE_DOTS[importance]
+
+
+_IMPORTANCE_DOTS = {
+    importance: Paragraph(
+        f"<font color='{importance_color}'>\u25cf</font>", NORMAL_STYLE
+    )
+    for importance, importance_color in IMPORTANCE_COLORS.items()
+}
+
+
+def importance_mark(importance):
+    """The canvas backend's counterpart of importance_dot."""
+    return _IMPORTANCE_MARKS[importance]
+
+
+_IMPORTANCE_MARKS = {
+    importance: Mark("\u25cf", colors.toColor(importance_color))
+    for importance, importance_color in IMPORTANCE_COLORS.items()
+}
@@ -0,0 +1,129 @@
+"""Headless batch rendering of planner PDFs, e.g. nightly for every staff member.
+
+Each input is a planner data file (see planner_io). The files are rendered
+with the same layout as "Save as PDF" across a process pool, and a timing
+line is printed per file followed by the overall throughput. Nothing here
+imports tkinter, so it runs on servers without a display.
+
+    python planner_batch.py staff/*.json --out pdfs --workers 8
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import instrumentation
+from pdf_canvas import BACKENDS, PLATYPUS
+from pdf_stream import PAGE_ROWS
+from planner_io import load_planner_file
+from planner_pdf import render_planner
+from planner_snapshot import PlannerSnapshot
+
+
+def output_paths(input_paths, out_dir, date):
+    """Map each input file to a unique ``<name>_DailyPlanner_<date>.pdf``."""
+    used = set()
+    paths = []
+    for input_path in input_paths:
+        stem = os.path.splitext(os.path.basename(input_path))[0]
+        name = f"{stem}_DailyPlanner_{date}.pdf"
+        number = 1
+        while name in used:
+            number += 1
+            name = f"{stem}-{number}_DailyPlanner_{date}.pdf"
+        used.add(name)
+        paths.append(os.path.join(out_dir, name))
+    return paths
+
+
+def render_file(input_path, pdf_path, date, chunk_rows=None, backend=PLATYPUS):
+    """Load and render one planner file; returns the seconds it took."""
+    started = time.perf_counter()
+    tasks, goals = load_planner_file(input_path)
+    snapshot = PlannerSnapshot.from_dicts(tasks, goals, date)
+    render_planner(pdf_path, snapshot, chunk_rows=chunk_rows, backend=backend)
+    return time.perf_counter() - started
+
+
+def render_batch(
+    input_paths, out_dir, date=None, workers=None, chunk_rows=None, backend=PLATYPUS
+):
+    """Render every planner file in a process pool.
+
+    Yields ``(input_path, pdf_path, seconds, error)`` as files finish.
+    """
+    date = date or datetime.now().strftime("%Y-%m-%d")
+    os.makedirs(out_dir, exist_ok=True)
+    pdf_paths = output_paths(input_paths, out_dir, date)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(render_file, input_path, pdf_path, date, chunk_rows, backend): (
+                input_path,
+                pdf_path,
+            )
+            for input_path, pdf_path in zip(input_paths, pdf_paths)
+        }
+        for future in as_completed(futures):
+            input_path, pdf_path = futures[future]
+            try:
+                yield input_path, pdf_path, future.result(), None
+            except Exception as error:
+                yield input_path, pdf_path, None, error
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Render planner PDFs from JSON/CSV planner files."
+    )
+    parser.add_argument("files", nargs="+", help="planner .json or .csv files")
+    parser.add_argument("--out", default=".", help="output directory")
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count(), help="worker processes"
+    )
+    parser.add_argument("--date", help="planner date (YYYY-MM-DD), default today")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="stream large planners in page-sized tables",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default=PLATYPUS,
+        help="PDF renderer; canvas is much faster for large planners",
+    )
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args(argv)
+    instrumentation.configure_from(args)
+
+    started = time.perf_counter()
+    rendered = failed = 0
+    for input_path, pdf_path, seconds, error in render_batch(
+        args.files,
+        args.out,
+        args.date,
+        args.workers,
+        PAGE_ROWS if args.stream else None,
+        args.backend,
+    ):
+        if error is None:
+            rendered += 1
+            print(f"{seconds:8.3f}s  {input_path} -> {pdf_path}")
+        else:
+            failed += 1
+            print(f"  FAILED  {input_path}: {error}", file=sys.stderr)
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"Rendered {rendered} PDFs in {elapsed:.2f}s with {args.workers} workers "
+        f"({rendered / elapsed if elapsed else 0:.2f} PDFs/sec)"
+        + (f", {failed} failed" if failed else "")
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""Bulk import of tasks and goals from planner data files.
+
+Importing is split in two so the GUI can parse on a worker thread:
+
+* read_import streams the file (see planner_io), validates each row and
+  drops duplicates through a set of ``(frequency, task)`` keys. It touches
+  nothing but the file, so it is safe on a worker thread.
+* apply_import runs on the thread that owns the model. It inserts the
+  tasks with a single TaskStore.extend (which also skips tasks the store
+  already has) and journals the additions with one write.
+
+import_planner_file does both, for scripts:
+
+    store = TaskStore()
+    goals = {goal_type: [] for goal_type in GOAL_TYPES}
+    result = import_planner_file("tasks.csv", store, goals)
+"""
+
+import json
+import os
+from collections import namedtuple
+
+from background_jobs import Cancelled
+from planner_io import (
+    PROGRESS_ROWS,
+    InvalidRow,
+    iter_planner_rows,
+    normalize_task,
+    text_field,
+)
+from planner_storage import GOAL_TYPES
+from task_store import FREQUENCIES, IMPORTANCE_LEVELS
+
+# Invalid rows kept in ImportBatch.errors; the rest are only counted
+MAX_ERRORS = 20
+
+# tasks: task dicts; goals: (goal_type, goal) pairs; invalid: rows skipped;
+# duplicates: rows repeating an earlier row; errors: (row number, reason)
+ImportBatch = namedtuple("ImportBatch", "tasks goals invalid duplicates errors")
+# tasks: the added Task records; goals: the added (goal_type, goal) pairs
+ImportResult = namedtuple("ImportResult", "tasks goals skipped")
+
+
+def validate_row(row):
+    """Return ``(task_info or None, (goal_type, goal) or None)`` for a row.
+
+    Raises ValueError naming the first invalid field.
+    """
+    if isinstance(row, InvalidRow):
+        raise ValueError(row.error)
+    if not isinstance(row, dict):
+        raise ValueError("not a JSON object")
+    task_info = None
+    if text_field(row, "task"):
+        task_info = normalize_task(row)
+        if task_info["frequency"] not in FREQUENCIES:
+            raise ValueError(f"unknown frequency {task_info['frequency']!r}")
+        if task_info["importance"] not in IMPORTANCE_LEVELS:
+            raise ValueError(f"unknown importance {task_info['importance']!r}")
+    goal = None
+    goal_name = text_field(row, "goal")
+    if goal_name:
+        goal_type = text_field(row, "goal_type", "Week")
+        if goal_type not in GOAL_TYPES:
+            raise ValueError(f"unknown goal type {goal_type!r}")
+        goal = (goal_type, goal_name)
+    if task_info is None and goal is None:
+        raise ValueError("no task or goal")
+    return task_info, goal
+
+
+def iter_import_rows(path, progress=None):
+    # The snapshot layout (.json) is one document and is read whole;
+    # .csv and .jsonl are streamed.
+    if os.path.splitext(path)[1].lower() != ".json":
+        yield from iter_planner_rows(path, progress)
+        return
+    with open(path, encoding="utf-8") as planner_file:
+        data = json.load(planner_file)
+    yield from data.get("tasks", [])
+    for goal_type, goals_list in data.get("goals", {}).items():
+        for goal in goals_list:
+            yield {"goal_type": goal_type, "goal": goal}
+
+
+def read_import(path, progress=None, cancel_event=None):
+    """Parse, validate and dedup a planner file into an ImportBatch.
+
+    ``progress(fraction)`` is called as the file is read. Raises Cancelled
+    once ``cancel_event`` is set.
+    """
+    tasks = []
+    goals = []
+    seen_tasks = set()
+    seen_goals = set()
+    invalid = duplicates = 0
+    errors = []
+    for number, row in enumerate(iter_import_rows(path, progress), 1):
+        if (
+            cancel_event is not None
+            and number % PROGRESS_ROWS == 0
+            and cancel_event.is_set()
+        ):
+            raise Cancelled()
+        try:
+            task_info, goal = validate_row(row)
+        except ValueError as error:
+            invalid += 1
+            if len(errors) < MAX_ERRORS:
+                errors.append((number, str(error)))
+            continue
+        duplicate = True
+        if task_info is not None:
+            key = (task_info["frequency"], task_info["task"])
+            if key not in seen_tasks:
+                seen_tasks.add(key)
+                tasks.append(task_info)
+                duplicate = False
+        if goal is not None and goal not in seen_goals:
+            seen_goals.add(goal)
+            goals.append(goal)
+            duplicate = False
+        duplicates += duplicate
+    if progress is not None:
+        progress(1.0)
+    return ImportBatch(tasks, goals, invalid, duplicates, errors)
+
+
+def apply_import(batch, task_store, goals, storage=None):
+    """Insert an ImportBatch into the model in one go; returns an ImportResult.
+
+    Tasks and goals already present are skipped. ``goals`` maps each goal
+    type to its list of goals. Additions are journaled to ``storage`` if
+    given.
+    """
+    added_tasks = task_store.extend(batch.tasks)
+    existing = {goal_type: set(goals_list) for goal_type, goals_list in goals.items()}
+    added_goals = []
+    for goal_type, goal in batch.goals:
+        if goal not in existing.setdefault(goal_type, set()):
+            existing[goal_type].add(goal)
+            goals.setdefault(goal_type, []).append(goal)
+            added_goals.append((goal_type, goal))
+    if storage is not None:
+        storage.add_tasks(record.to_dict() for record in added_tasks)
+        storage.set_goals(added_goals)
+    skipped = (
+        batch.invalid
+        + batch.duplicates
+        + len(batch.tasks)
+        - len(added_tasks)
+        + len(batch.goals)
+        - len(added_goals)
+    )
+    return ImportResult(added_tasks, added_goals, skipped)
+
+
+def import_planner_file(path, task_store, goals, storage=None):
+    """Read ``path`` and apply it to ``task_store`` and ``goals``."""
+    return apply_import(read_import(path), task_store, goals, storage)
@@ -0,0 +1,138 @@
+"""Reading planner data files (JSON or CSV) without any GUI dependency.
+
+JSON files use the same layout as the storage snapshot::
+
+    {"tasks": [{"task": ..., "due_date": ..., "frequency": ...,
+                "schedule": ..., "importance": ...}, ...],
+     "goals": {"Week": [...], "Month": [...], "Year": [...]}}
+
+A task attached to a goal also has ``goal_type`` and ``goal``, and a done
+task has ``"done": true``.
+
+CSV files have a header row. A row with a ``task`` column adds a task (the
+other task columns are optional), a row with ``goal_type`` and ``goal``
+adds a goal; one row may do both, which attaches the task to the goal. An
+optional ``done`` column (``1``, ``yes``, ``x``...) marks the task done.
+JSON Lines files (``.jsonl``) hold one such row per line as a JSON object.
+
+``iter_planner_rows`` streams CSV and JSON Lines files row by row, reading
+bytes so it can report how far through the file it is. A JSON Lines row
+that is not valid JSON comes out as an InvalidRow, so one bad line does
+not stop the rest of the file.
+"""
+
+import csv
+import json
+import os
+from collections import namedtuple
+
+from planner_storage import GOAL_TYPES
+
+TASK_FIELDS = ("task", "due_date", "frequency", "schedule", "importance")
+# Values of the optional "done" field that mark a task done
+DONE_VALUES = ("1", "true", "yes", "x", "done")
+# Rows between progress reports while streaming a file
+PROGRESS_ROWS = 1000
+
+# A row of a planner file that could not be parsed; error says why
+InvalidRow = namedtuple("InvalidRow", "error")
+
+
+def load_planner_file(path):
+    """Return ``(tasks, goals)`` from a ``.json``, ``.csv`` or ``.jsonl`` file.
+
+    Raises ValueError for a row that cannot be read.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".json":
+        with open(path, encoding="utf-8") as planner_file:
+            data = json.load(planner_file)
+        tasks = [normalize_task(task_info) for task_info in data.get("tasks", [])]
+        goals = {goal_type: [] for goal_type in GOAL_TYPES}
+        for goal_type, goals_list in data.get("goals", {}).items():
+            goals.setdefault(goal_type, []).extend(goals_list)
+        return tasks, goals
+    tasks = []
+    goals = {goal_type: [] for goal_type in GOAL_TYPES}
+    for number, row in enumerate(iter_planner_rows(path), 1):
+        if isinstance(row, InvalidRow):
+            raise ValueError(f"row {number}: {row.error}")
+        if text_field(row, "task"):
+            tasks.append(normalize_task(row))
+        goal = text_field(row, "goal")
+        if goal:
+            goals.setdefault(text_field(row, "goal_type", "Week"), []).append(goal)
+    return tasks, goals
+
+
+def iter_planner_rows(path, progress=None):
+    """Yield the rows of a ``.csv`` or ``.jsonl`` planner file as dicts.
+
+    ``progress(fraction)``, if given, is called with the share of the file
+    read so far every PROGRESS_ROWS rows. A JSON Lines row that does not
+    parse is yielded as an InvalidRow instead.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in (".csv", ".jsonl"):
+        raise ValueError(f"Unsupported planner file type: {path}")
+    size = max(os.path.getsize(path), 1)
+    bytes_read = 0
+    with open(path, "rb") as planner_file:
+
+        def lines():
+            nonlocal bytes_read
+            for line in planner_file:
+                bytes_read += len(line)
+                yield line.decode("utf-8-sig" if bytes_read == len(line) else "utf-8")
+
+        if extension == ".csv":
+            rows = csv.DictReader(lines())
+        else:
+            rows = (_json_row(line) for line in lines() if line.strip())
+        for number, row in enumerate(rows):
+            if progress is not None and number % PROGRESS_ROWS == 0:
+                progress(bytes_read / size)
+            yield row
+
+
+def _json_row(line):
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as error:
+        return InvalidRow(f"invalid JSON: {error.msg} (column {error.colno})")
+
+
+def text_field(row, name, default=""):
+    """The stripped text of ``row[name]``, or ``default`` if it is missing or empty.
+
+    JSON rows may hold numbers, lists and so on; anything but text is a
+    ValueError naming the field.
+    """
+    value = row.get(name)
+    if value is None:
+        return default
+    if not isinstance(value, str):
+        raise ValueError(f"{name} must be text, not {type(value).__name__}")
+    return value.strip() or default
+
+
+def normalize_task(task_info):
+    """Return a task dict with every field present and stripped.
+
+    The goal the task is attached to and its done flag are kept when set.
+    Raises ValueError for a field that is not text.
+    """
+    normalized = {
+        "task": text_field(task_info, "task"),
+        "due_date": text_field(task_info, "due_date"),
+        "frequency": text_field(task_info, "frequency", "Daily"),
+        "schedule": text_field(task_info, "schedule"),
+        "importance": text_field(task_info, "importance", "Low"),
+    }
+    goal = text_field(task_info, "goal")
+    if goal:
+        normalized["goal_type"] = text_field(task_info, "goal_type", "Week")
+        normalized["goal"] = goal
+    if str(task_info.get("done") or "").strip().lower() in DONE_VALUES:
+        normalized["done"] = True
+    return normalized
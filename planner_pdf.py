@@ -0,0 +1,513 @@
+"""ReportLab rendering of the daily planner PDF.
+
+Everything here works on a PlannerSnapshot, never on live Tk state, so a
+render can run on a worker thread while the window keeps responding.
+Besides the single-day planner, a range of days can be rendered into one
+PDF or one file per day (see RangeStory). Every renderer takes an optional
+RenderCache; an export whose inputs were rendered before is then served
+from the cache instead of being rebuilt. Every renderer also takes a
+``backend``: "platypus" builds the document with SimpleDocTemplate,
+"canvas" draws the task and goal tables directly (see pdf_canvas), which
+is several times faster for planners with thousands of tasks.
+"""
+
+import os
+from datetime import date
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.platypus import PageBreak, SimpleDocTemplate, Table, Paragraph, Spacer
+
+import instrumentation
+from background_jobs import Cancelled
+from goal_progress import progress_text
+from pdf_canvas import (
+    CANVAS,
+    PLATYPUS,
+    GridRows,
+    WrappedText,
+    build_canvas,
+    check_backend,
+)
+from pdf_stream import PAGE_ROWS, FlowableStream, table_chunks
+from pdf_theme import (
+    GRID_TABLE_STYLE,
+    HEADER_LAYOUT_STYLE,
+    HEADING_STYLE,
+    LEGEND_TABLE_STYLE,
+    NORMAL_STYLE,
+    TITLE_STYLE,
+    importance_dot,
+    importance_mark,
+)
+from prayer_times import (
+    DEFAULT_SETTINGS,
+    PRAYERS,
+    TIMES,
+    day_times,
+    format_time,
+    sunnah_times,
+)
+from recurrence import Recurrence
+from render_cache import content_key, snapshot_digest
+
+# Part of every render cache key; bump it whenever the PDF layout changes so
+# PDFs cached by older code are not served
+LAYOUT_VERSION = 2
+
+TASK_HEADER = ["Frequency", "Task", "Due Date", "Schedule", "Importance"]
+TASK_COL_WIDTHS = [1.5 * inch, 2.5 * inch, 1 * inch, 1.5 * inch, 1.5 * inch]
+GOAL_HEADER = ["Goal Type", "Goal", "Progress"]
+GOAL_COL_WIDTHS = [1.5 * inch, 3 * inch, 1.5 * inch]
+
+
+def planner_file_name(snapshot):
+    return day_file_name(snapshot.date)
+
+
+def day_file_name(date_text):
+    return f"DailyPlanner_{date_text}.pdf"
+
+
+def range_file_name(first, last):
+    """File name of a one-PDF export from day ordinal ``first`` to ``last``."""
+    first_text = date.fromordinal(first).isoformat()
+    last_text = date.fromordinal(last).isoformat()
+    return f"DailyPlanner_{first_text}_to_{last_text}.pdf"
+
+
+def render_key(kind, digest, *options):
+    """Render cache key of an export of ``kind`` of the snapshot ``digest``."""
+    return content_key(LAYOUT_VERSION, kind, digest, DEFAULT_SETTINGS, *options)
+
+
+def build_story(snapshot, cancel_event=None):
+    """Return the platypus story for ``snapshot``."""
+    with instrumentation.span("planner_pdf.story"):
+        return list(iter_story(snapshot, cancel_event=cancel_event))
+
+
+def grid_tables(header, rows, col_widths, chunk_rows=None, backend=PLATYPUS):
+    """Yield ``rows`` under ``header`` as one table, or page-sized tables.
+
+    The canvas backend gets a single GridRows, which pages itself and
+    repeats its header like the chunks would.
+    """
+    if backend == CANVAS:
+        yield GridRows(header, rows, col_widths, repeat_header=bool(chunk_rows))
+    elif chunk_rows:
+        yield from table_chunks(header, rows, col_widths, GRID_TABLE_STYLE, chunk_rows)
+    else:
+        rows = list(rows)
+        instrumentation.count("pdf.table_rows", len(rows))
+        table = Table([header] + rows, colWidths=col_widths)
+        table.setStyle(GRID_TABLE_STYLE)
+        yield table
+
+
+def legend_table():
+    # Explanation Table
+    data = [["Importance", "Color"], ["Low", "•"], ["Medium", "•"], ["High", "•"]]
+    table = Table(data)
+    table.setStyle(LEGEND_TABLE_STYLE)
+    return table
+
+
+def header_table(date, legend):
+    # Create a two-column grid for the header section (day and explanation table)
+    header_grid = [[Paragraph(f"Daily Planner: {date}", TITLE_STYLE), legend]]
+    header_table = Table(header_grid, colWidths=[3 * inch, 2 * inch])
+    header_table.setStyle(HEADER_LAYOUT_STYLE)
+    return header_table
+
+
+def task_rows(frequency, frequency_tasks, backend=PLATYPUS):
+    if backend == CANVAS:
+        return (
+            [
+                frequency,
+                WrappedText(task_info.task),
+                task_info.due_date,
+                task_info.schedule,
+                importance_mark(task_info.importance),
+            ]
+            for task_info in frequency_tasks
+        )
+    return (
+        [
+            frequency,
+            Paragraph(task_info.task, NORMAL_STYLE),
+            task_info.due_date,
+            task_info.schedule,
+            importance_dot(task_info.importance),  # The colored dot
+        ]
+        for task_info in frequency_tasks
+    )
+
+
+def goal_sections(snapshot, tables, backend=PLATYPUS):
+    """Yield the goals section; ``tables(header, rows, col_widths)`` lays it out."""
+    # Spacer
+    yield Spacer(1, 20)  # Adds 20 units of vertical space
+
+    # Add a title above the goal table
+    yield Paragraph("Goals", HEADING_STYLE)
+
+    # Goals Table
+    if backend == CANVAS:
+        goal_rows = (
+            [goal_type, WrappedText(goal_row.goal), progress_text(goal_row)]
+            for goal_type, goals_list in snapshot.goals
+            for goal_row in goals_list
+        )
+    else:
+        goal_rows = (
+            [goal_type, Paragraph(goal_row.goal, NORMAL_STYLE), progress_text(goal_row)]
+            for goal_type, goals_list in snapshot.goals
+            for goal_row in goals_list
+        )
+    yield from tables(GOAL_HEADER, goal_rows, GOAL_COL_WIDTHS)
+
+
+def prayer_sections(day, settings=DEFAULT_SETTINGS):
+    """Yield the prayer schedule and sunnah prayers of the day ordinal ``day``."""
+    # Spacer
+    yield Spacer(1, 20)
+
+    # Prayer Schedule Table
+    times = dict(zip(TIMES, day_times(day, settings)))
+    Nwafel = ["2 before", "4 before and 2 after", "-", "2 after", "2 after"]
+
+    prayer_schedule_data = [
+        ["prayer Name", "prayer Time", "Nwafel", "Done", "Nwafel Done?"]
+    ]
+    for name, _ in zip(PRAYERS, Nwafel):
+        prayer_schedule_data.append([name, format_time(times[name]), _])
+
+    prayer_schedule_table = Table(prayer_schedule_data, colWidths=[1.5 * inch] * 5)
+    prayer_schedule_table.setStyle(GRID_TABLE_STYLE)
+    yield Paragraph("prayer Schedule", HEADING_STYLE)
+    yield prayer_schedule_table
+
+    # Spacer
+    yield Spacer(1, 20)
+
+    # Sunnah Prayers
+    sunnah_data = [["Sunnah prayer", "Scheduled Time", "Done"]]
+    for name, minutes in sunnah_times(day, settings):
+        sunnah_data.append([name, format_time(minutes), ""])
+
+    sunnah_table = Table(sunnah_data, colWidths=[2 * inch, 2 * inch, 1 * inch])
+    sunnah_table.setStyle(GRID_TABLE_STYLE)
+    yield Paragraph("Sunnah Prayers", HEADING_STYLE)
+    yield sunnah_table
+
+
+def iter_story(
+    snapshot, chunk_rows=None, cancel_event=None, progress=None, backend=PLATYPUS
+):
+    """Yield the flowables of the planner story for ``snapshot``.
+
+    With ``chunk_rows`` the task and goal tables are emitted as a series of
+    tables of at most that many rows, each with its own header, and rows are
+    only turned into flowables as the document build asks for them.
+    ``progress(fraction)`` is then reported per chunk from the rows emitted.
+    For the canvas backend the tables are GridRows, whose rows are pulled
+    as they are drawn, so progress is always reported as they are.
+    """
+
+    def check_cancelled():
+        if cancel_event is not None and cancel_event.is_set():
+            raise Cancelled()
+
+    total_rows = max(
+        sum(len(rows) for _, rows in snapshot.tasks_by_frequency)
+        + sum(len(goals_list) for _, goals_list in snapshot.goals),
+        1,
+    )
+    emitted_rows = [0]
+    # The canvas backend draws rows as they are pulled, so it always checks
+    check_rows = chunk_rows or (PAGE_ROWS if backend == CANVAS else None)
+
+    def counted(rows):
+        # Cancellation and progress are checked once per chunk of rows
+        for number, row in enumerate(rows):
+            if check_rows and number % check_rows == 0:
+                check_cancelled()
+                if progress is not None:
+                    progress(min(emitted_rows[0] / total_rows, 1.0))
+            emitted_rows[0] += 1
+            yield row
+
+    def tables(header, rows, col_widths):
+        check_cancelled()
+        return grid_tables(header, counted(rows), col_widths, chunk_rows, backend)
+
+    yield header_table(snapshot.date, legend_table())
+
+    # Spacer
+    yield Spacer(1, 20)
+
+    # Print tasks in separate tables for daily, weekly, and monthly; the
+    # snapshot keeps each frequency sorted by importance (High first)
+    for frequency, frequency_tasks in snapshot.tasks_by_frequency:
+        if frequency_tasks:
+            yield Paragraph(frequency, HEADING_STYLE)  # Frequency heading
+            yield from tables(
+                TASK_HEADER,
+                task_rows(frequency, frequency_tasks, backend),
+                TASK_COL_WIDTHS,
+            )
+            yield Spacer(1, 20)  # Add space between tables
+
+    yield from goal_sections(snapshot, tables, backend)
+    yield from prayer_sections(date.fromisoformat(snapshot.date).toordinal())
+
+
+def reused(flowables):
+    """Yield flowables shared between days, ready to be laid out again.
+
+    doc.build marks a flowable it had to move to the next frame with
+    ``_postponed`` and never clears the mark; postponing a marked flowable
+    again raises LayoutError, so the mark is dropped before each reuse.
+    """
+    for flowable in flowables:
+        flowable.__dict__.pop("_postponed", None)
+        yield flowable
+
+
+class RangeStory:
+    """Planner pages for a range of days, sharing work between the days.
+
+    The legend and the goal section are built once. Each day's
+    tasks come from a Recurrence index. The task tables of a bucket (all
+    daily tasks, the weekly tasks of a weekday, ...) are built the first
+    time a day shows them and reused by every later day. For the canvas
+    backend those are GridRows over a tuple of rows, so that they can be
+    drawn again.
+    """
+
+    def __init__(self, snapshot, chunk_rows=None, backend=PLATYPUS):
+        self.chunk_rows = chunk_rows
+        self.backend = backend
+        self.recurrence = Recurrence(snapshot.tasks_by_frequency)
+        self.legend = legend_table()
+        self.goals = tuple(goal_sections(snapshot, self._tables, backend))
+        self._sections = {}
+
+    def day_story(self, day):
+        """Yield the flowables of the planner for the day ordinal ``day``."""
+        yield header_table(date.fromordinal(day).isoformat(), self.legend)
+        yield Spacer(1, 20)
+        for frequency, frequency_tasks in self.recurrence.tasks_on(day):
+            if frequency_tasks:
+                yield from reused(self._section(frequency, frequency_tasks))
+        yield from reused(self.goals)
+        # A lookup into the memoized year of prayer times
+        yield from prayer_sections(day)
+
+    def _section(self, frequency, frequency_tasks):
+        # Buckets are shared tuples owned by self.recurrence, so their id is
+        # stable for as long as this story exists.
+        key = (frequency, id(frequency_tasks))
+        flowables = self._sections.get(key)
+        if flowables is None:
+            flowables = (
+                Paragraph(frequency, HEADING_STYLE),
+                *self._tables(
+                    TASK_HEADER,
+                    task_rows(frequency, frequency_tasks, self.backend),
+                    TASK_COL_WIDTHS,
+                ),
+                Spacer(1, 20),
+            )
+            self._sections[key] = flowables
+        return flowables
+
+    def _tables(self, header, rows, col_widths):
+        if self.backend == CANVAS:
+            rows = tuple(rows)
+        return grid_tables(header, rows, col_widths, self.chunk_rows, self.backend)
+
+
+def build_pdf(pdf_path, story, cancel_event=None, on_progress=None, backend=PLATYPUS):
+    """Build ``story`` into ``pdf_path`` via a temporary file.
+
+    A cancelled or failed build never leaves a partial file at ``pdf_path``.
+    ``on_progress(kind, value)`` receives ReportLab's progress callbacks
+    (platypus only).
+    """
+
+    def progress_callback(kind, value):
+        if cancel_event is not None and cancel_event.is_set():
+            raise Cancelled()
+        if on_progress is not None:
+            on_progress(kind, value)
+
+    temp_path = pdf_path + ".part"
+    try:
+        with instrumentation.span("planner_pdf.build"):
+            if backend == CANVAS:
+                build_canvas(temp_path, story, cancel_event)
+            else:
+                doc = SimpleDocTemplate(temp_path, pagesize=letter)
+                doc.setProgressCallBack(progress_callback)
+                doc.build(story)
+        instrumentation.count("pdf.files")
+        instrumentation.count("pdf.bytes_written", os.path.getsize(temp_path))
+        os.replace(temp_path, pdf_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return pdf_path
+
+
+@instrumentation.timed("planner_pdf.render_planner")
+def render_planner(
+    pdf_path,
+    snapshot,
+    progress=None,
+    cancel_event=None,
+    chunk_rows=None,
+    cache=None,
+    backend=PLATYPUS,
+):
+    """Render ``snapshot`` to ``pdf_path``.
+
+    ``progress(fraction)`` is called as the document is laid out; setting
+    ``cancel_event`` aborts the render. With ``chunk_rows`` (e.g.
+    ``PAGE_ROWS``) the story is streamed into the build in page-sized
+    tables, which keeps memory bounded for very large planners. The PDF is
+    written to a temporary file first, so a cancelled or failed render never
+    leaves a partial file at ``pdf_path``. ``backend="canvas"`` always
+    streams its rows; ``chunk_rows`` only makes its tables repeat their
+    header on every page.
+    """
+    check_backend(backend)
+    if cache is not None:
+        key = render_key(
+            "planner", snapshot_digest(snapshot), snapshot.date, chunk_rows, backend
+        )
+        if cache.fetch(key, pdf_path):
+            return pdf_path
+    if backend == CANVAS:
+        story = instrumentation.timed_iter(
+            "planner_pdf.story",
+            iter_story(snapshot, chunk_rows, cancel_event, progress, backend),
+        )
+        build_pdf(pdf_path, story, cancel_event, backend=backend)
+        if cache is not None:
+            cache.store(key, pdf_path)
+        return pdf_path
+    if chunk_rows:
+        story = FlowableStream(
+            instrumentation.timed_iter(
+                "planner_pdf.story",
+                iter_story(snapshot, chunk_rows, cancel_event, progress),
+            )
+        )
+    else:
+        story = build_story(snapshot, cancel_event)
+    size_estimate = [max(len(story), 1)]
+
+    def on_progress(kind, value):
+        if chunk_rows or progress is None:
+            return
+        if kind == "SIZE_EST":
+            size_estimate[0] = max(value, 1)
+        elif kind == "PROGRESS":
+            progress(min(value / size_estimate[0], 1.0))
+
+    build_pdf(pdf_path, story, cancel_event, on_progress)
+    if cache is not None:
+        cache.store(key, pdf_path)
+    return pdf_path
+
+
+@instrumentation.timed("planner_pdf.render_planner_range")
+def render_planner_range(
+    pdf_path,
+    snapshot,
+    first,
+    last,
+    progress=None,
+    cancel_event=None,
+    chunk_rows=None,
+    cache=None,
+    backend=PLATYPUS,
+):
+    """Render the days from ``first`` to ``last`` (date ordinals) into one PDF.
+
+    Every day starts on a new page. Progress is reported per day.
+    """
+    check_backend(backend)
+    if cache is not None:
+        key = render_key(
+            "range", snapshot_digest(snapshot), first, last, chunk_rows, backend
+        )
+        if cache.fetch(key, pdf_path):
+            return pdf_path
+    range_story = RangeStory(snapshot, chunk_rows, backend)
+    days = last - first + 1
+
+    def story():
+        for number, day in enumerate(range(first, last + 1)):
+            if cancel_event is not None and cancel_event.is_set():
+                raise Cancelled()
+            if progress is not None:
+                progress(number / days)
+            if number:
+                yield PageBreak()
+            yield from range_story.day_story(day)
+
+    story = instrumentation.timed_iter("planner_pdf.story", story())
+    if backend == PLATYPUS:
+        story = FlowableStream(story)
+    build_pdf(pdf_path, story, cancel_event, backend=backend)
+    if cache is not None:
+        cache.store(key, pdf_path)
+    return pdf_path
+
+
+@instrumentation.timed("planner_pdf.render_planner_days")
+def render_planner_days(
+    out_dir,
+    snapshot,
+    first,
+    last,
+    progress=None,
+    cancel_event=None,
+    chunk_rows=None,
+    cache=None,
+    backend=PLATYPUS,
+):
+    """Render one ``DailyPlanner_<date>.pdf`` per day from ``first`` to ``last``.
+
+    The files share one RangeStory, so static sections and task tables are
+    built once for the whole range; with a cache, only for the days it
+    misses. Returns the paths written.
+    """
+    check_backend(backend)
+    range_story = None
+    digest = None if cache is None else snapshot_digest(snapshot)
+    days = last - first + 1
+    paths = []
+    for number, day in enumerate(range(first, last + 1)):
+        if progress is not None:
+            progress(number / days)
+        pdf_path = os.path.join(
+            out_dir, day_file_name(date.fromordinal(day).isoformat())
+        )
+        paths.append(pdf_path)
+        if cache is not None:
+            key = render_key("day", digest, day, chunk_rows, backend)
+            if cache.fetch(key, pdf_path):
+                continue
+        if range_story is None:
+            range_story = RangeStory(snapshot, chunk_rows, backend)
+        with instrumentation.span("planner_pdf.story"):
+            story = list(range_story.day_story(day))
+        build_pdf(pdf_path, story, cancel_event, backend=backend)
+        if cache is not None:
+            cache.store(key, pdf_path)
+    return paths
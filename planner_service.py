@@ -0,0 +1,751 @@
+"""Local HTTP service for the planner and invoices, with a JSON API.
+
+The service keeps one planner, loaded from and journaled to the same data
+directory as the app (so run one or the other at a time), and serves:
+
+    GET    /tasks                      ?query=&frequency=&importance=
+                                       &due_from=&due_to=&offset=&limit=
+    POST   /tasks                      {"task": ..., "due_date": ..., ...}
+    PATCH  /tasks/<frequency>/<task>   {"done": true} and/or {"goal_type":
+                                       ..., "goal": ...} ("goal": null detaches)
+    DELETE /tasks/<frequency>/<task>
+    GET    /goals                      ?query=
+    POST   /goals                      {"goal_type": ..., "goal": ...}
+    DELETE /goals/<goal_type>/<goal>
+    POST   /planner.pdf                {"date": "YYYY-MM-DD", "range": ...,
+                                       "backend": "canvas"}
+    POST   /invoice.pdf                {"work_entries": [[date, description],
+                                       ...], "daily_rate": ..., "client": ...,
+                                       "project": ..., "materials": true,
+                                       "unit_prices": {item: price},
+                                       "backend": "canvas"}
+    GET    /metrics
+
+Path segments are URL-encoded. Errors come back as ``{"error": ...}`` with
+a 4xx or 5xx status.
+
+Everything runs on one asyncio event loop with the standard library's
+streams (HTTP/1.1 with keep-alive; request bodies need a Content-Length).
+Task and goal requests only touch the in-memory indexes and append to the
+journal, so they are answered on the loop. PDFs are rendered in a process
+pool from a PlannerSnapshot taken on the loop, so renders never block the
+other requests. Up to RENDERS_PER_WORKER renders per worker are queued in
+the pool; further PDF requests wait their turn without holding a worker.
+Planner PDFs go through the render cache, like "Save as PDF".
+
+``/metrics`` reports, per route, the request count, errors and latency
+percentiles of the last LATENCY_SAMPLES requests, measured from reading the
+request to writing the response. With ``--instrument`` the same latencies
+are recorded as ``service.<route>`` spans.
+
+    python planner_service.py --port 8765 --workers 4
+
+See ``benchmarks/bench_service.py`` for a load test against localhost.
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import math
+import os
+import signal
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import instrumentation
+from due_dates import EXPORT_RANGES, deadline_range, parse_due_date
+from goal_progress import GoalProgress
+from pdf_canvas import BACKENDS, PLATYPUS
+from pdf_stream import PAGE_ROWS
+from planner_import import validate_row
+from planner_io import text_field
+from planner_snapshot import PlannerSnapshot
+from planner_storage import DEFAULT_DATA_DIR, GOAL_TYPES, PlannerStorage
+from render_cache import DEFAULT_CACHE_DIR, RenderCache
+from search_index import PlannerSearch
+from task_store import FREQUENCIES, IMPORTANCE_LEVELS, TaskStore
+from work_quantities import unit_prices_from_json
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Renders queued in the pool per worker process
+RENDERS_PER_WORKER = 2
+# Latencies kept per route for the percentiles
+LATENCY_SAMPLES = 4096
+# Largest request body accepted, e.g. an invoice with many entries
+MAX_BODY_BYTES = 64 * 1024 * 1024
+DEFAULT_PAGE = 100
+MAX_PAGE = 1000
+# Fields a PATCH /tasks/<frequency>/<task> body may set
+TASK_CHANGES = frozenset(("done", "goal", "goal_type"))
+
+STATUS_TEXT = {
+    200: "OK",
+    201: "Created",
+    204: "No Content",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    411: "Length Required",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Request:
+    __slots__ = ("method", "path", "query", "headers", "body")
+
+    def __init__(self, method, path, query, headers, body):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except ValueError as error:
+            raise HTTPError(400, f"invalid JSON: {error}") from None
+        if not isinstance(data, dict):
+            raise HTTPError(400, "the body must be a JSON object")
+        return data
+
+
+class Response:
+    __slots__ = ("status", "body", "content_type", "headers")
+
+    def __init__(self, status=200, body=b"", content_type="application/json"):
+        self.status = status
+        self.body = body
+        self.content_type = content_type
+        self.headers = {}
+
+    @classmethod
+    def json(cls, data, status=200):
+        return cls(status, json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+    @classmethod
+    def pdf(cls, data, file_name):
+        response = cls(200, data, "application/pdf")
+        response.headers["Content-Disposition"] = f'attachment; filename="{file_name}"'
+        return response
+
+
+class LatencyStats:
+    def __init__(self, samples=LATENCY_SAMPLES):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.longest = 0.0
+        self.recent = deque(maxlen=samples)
+
+    def add(self, seconds, failed=False):
+        self.count += 1
+        self.errors += failed
+        self.total += seconds
+        self.longest = max(self.longest, seconds)
+        self.recent.append(seconds)
+
+    def summary(self):
+        recent = sorted(self.recent)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": round(self.total / self.count * 1e3, 3) if self.count else 0,
+            "p50_ms": round(percentile(recent, 0.50) * 1e3, 3),
+            "p90_ms": round(percentile(recent, 0.90) * 1e3, 3),
+            "p99_ms": round(percentile(recent, 0.99) * 1e3, 3),
+            "max_ms": round(self.longest * 1e3, 3),
+        }
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list (0 if empty)."""
+    if not ordered:
+        return 0.0
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+def render_planner_bytes(
+    snapshot, first=None, last=None, cache_dir=None, backend=PLATYPUS
+):
+    """Render a planner PDF in a pool worker and return its bytes.
+
+    Runs in a child process; ``first``/``last`` (date ordinals) select a
+    range export, otherwise the snapshot's own day is rendered.
+    """
+    from planner_pdf import render_planner, render_planner_range
+
+    cache = RenderCache(cache_dir) if cache_dir else None
+    with tempfile.TemporaryDirectory(prefix="planner-service-") as work_dir:
+        pdf_path = os.path.join(work_dir, "planner.pdf")
+        if first is None:
+            render_planner(
+                pdf_path,
+                snapshot,
+                chunk_rows=PAGE_ROWS,
+                cache=cache,
+                backend=backend,
+            )
+        else:
+            render_planner_range(
+                pdf_path,
+                snapshot,
+                first,
+                last,
+                chunk_rows=PAGE_ROWS,
+                cache=cache,
+                backend=backend,
+            )
+        with open(pdf_path, "rb") as pdf_file:
+            return pdf_file.read()
+
+
+def render_invoice_bytes(work_entries, daily_rate, invoice_date=None, **options):
+    """Render an invoice PDF in a pool worker and return its bytes.
+
+    ``options`` are further generate_invoice_pdf arguments, such as
+    ``client_name`` or ``unit_prices``.
+    """
+    from generate_invoice import generate_invoice_pdf
+
+    with tempfile.TemporaryDirectory(prefix="planner-service-") as work_dir:
+        pdf_path = os.path.join(work_dir, "invoice.pdf")
+        generate_invoice_pdf(
+            work_entries,
+            daily_rate,
+            chunk_rows=PAGE_ROWS,
+            output_path=pdf_path,
+            invoice_date=invoice_date,
+            **options,
+        )
+        with open(pdf_path, "rb") as pdf_file:
+            return pdf_file.read()
+
+
+class PlannerService:
+    def __init__(
+        self,
+        data_dir=DEFAULT_DATA_DIR,
+        workers=None,
+        cache_dir=DEFAULT_CACHE_DIR,
+    ):
+        self.storage = PlannerStorage(data_dir)
+        self.tasks = TaskStore()
+        self.goals = {goal_type: [] for goal_type in GOAL_TYPES}
+        saved_tasks, saved_goals = self.storage.load()
+        self.tasks.extend(saved_tasks)
+        for goal_type, goals_list in saved_goals.items():
+            self.goals.setdefault(goal_type, []).extend(goals_list)
+        self.search = PlannerSearch(self.tasks, self.goals)
+        self.goal_progress = GoalProgress(self.goals, self.tasks.records())
+        self.cache_dir = cache_dir
+
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        # Start the workers before any connection is open: a worker forked
+        # during a request inherits that socket and keeps it open after the
+        # response, so a Connection: close client never sees the end
+        self.pool.submit(os.getpid)
+        self.render_slots = asyncio.Semaphore(RENDERS_PER_WORKER * self.workers)
+        self.renders_in_flight = 0
+        self.compaction = None
+        self.latency = {}
+        self.started = time.perf_counter()
+        # (method, path pattern, route name, handler); None matches a segment
+        self.routes = (
+            ("GET", ("tasks",), "GET /tasks", self.list_tasks),
+            ("POST", ("tasks",), "POST /tasks", self.add_task),
+            ("PATCH", ("tasks", None, None), "PATCH /tasks/{key}", self.update_task),
+            ("DELETE", ("tasks", None, None), "DELETE /tasks/{key}", self.delete_task),
+            ("GET", ("goals",), "GET /goals", self.list_goals),
+            ("POST", ("goals",), "POST /goals", self.add_goal),
+            ("DELETE", ("goals", None, None), "DELETE /goals/{key}", self.delete_goal),
+            ("POST", ("planner.pdf",), "POST /planner.pdf", self.planner_pdf),
+            ("POST", ("invoice.pdf",), "POST /invoice.pdf", self.invoice_pdf),
+            ("GET", ("metrics",), "GET /metrics", self.metrics),
+        )
+
+    # --- HTTP ---
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request_line = await reader.readline()
+                except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+                    break
+                if not request_line.strip():
+                    break
+                started = time.perf_counter()
+                route = "other"
+                keep_alive = False
+                try:
+                    request, keep_alive = await read_request(request_line, reader)
+                    route, handler, arguments = self.route(request)
+                    response = await handler(request, *arguments)
+                except HTTPError as error:
+                    response = Response.json({"error": str(error)}, error.status)
+                except Exception as error:
+                    response = Response.json({"error": repr(error)}, 500)
+                try:
+                    await write_response(writer, response, keep_alive)
+                except ConnectionError:
+                    break
+                finally:
+                    seconds = time.perf_counter() - started
+                    stats = self.latency.get(route)
+                    if stats is None:
+                        stats = self.latency[route] = LatencyStats()
+                    stats.add(seconds, response.status >= 400)
+                    if instrumentation.INSTRUMENTS.enabled:
+                        instrumentation.INSTRUMENTS.add_time(
+                            f"service.{route}", seconds
+                        )
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    def route(self, request):
+        """Return ``(route name, handler, path arguments)`` for a request."""
+        segments = [unquote(part) for part in request.path.strip("/").split("/")]
+        path_found = False
+        for method, pattern, name, handler in self.routes:
+            if len(pattern) != len(segments) or any(
+                part is not None and part != segment
+                for part, segment in zip(pattern, segments)
+            ):
+                continue
+            path_found = True
+            if method == request.method:
+                arguments = [
+                    segment for part, segment in zip(pattern, segments) if part is None
+                ]
+                return name, handler, arguments
+        if path_found:
+            raise HTTPError(405, f"{request.method} is not allowed on {request.path}")
+        raise HTTPError(404, f"no such resource: {request.path}")
+
+    # --- Tasks ---
+
+    async def list_tasks(self, request):
+        query = request.query
+        frequency = query.get("frequency") or None
+        importance = query.get("importance") or None
+        if frequency is not None and frequency not in FREQUENCIES:
+            raise HTTPError(400, f"unknown frequency {frequency!r}")
+        if importance is not None and importance not in IMPORTANCE_LEVELS:
+            raise HTTPError(400, f"unknown importance {importance!r}")
+        offset = int_param(query, "offset", 0)
+        limit = min(int_param(query, "limit", DEFAULT_PAGE), MAX_PAGE)
+        rows = self.search.find_tasks(
+            query=query.get("query", ""),
+            frequency=frequency,
+            importance=importance,
+            due_from=parse_due_date(query.get("due_from", "")),
+            due_to=parse_due_date(query.get("due_to", "")),
+        )
+        return Response.json(
+            {
+                "total": len(rows),
+                "tasks": [record.to_dict() for record in rows[offset : offset + limit]],
+            }
+        )
+
+    async def add_task(self, request):
+        task_info = self.task_from(request.json())
+        if (task_info["frequency"], task_info["task"]) in self.tasks:
+            raise HTTPError(409, f"task {task_info['task']!r} already exists")
+        self.storage.add_task(task_info)
+        record = self.tasks.add(**task_info)
+        self.search.add_task(record)
+        self.goal_progress.add_task(record)
+        self.changed()
+        return Response.json(record.to_dict(), 201)
+
+    async def update_task(self, request, frequency, task):
+        record = self.task_record(frequency, task)
+        changes = request.json()
+        # Check the whole body first, so a bad field changes nothing
+        unknown = set(changes) - TASK_CHANGES
+        if unknown:
+            raise HTTPError(400, f"unknown fields: {', '.join(sorted(unknown))}")
+        if "goal_type" in changes and "goal" not in changes:
+            raise HTTPError(400, "goal_type needs a goal")
+        goal = record.goal
+        if "goal" in changes and changes["goal"] is not None:
+            goal = self.existing_goal(
+                changes.get("goal_type") or "Week", changes["goal"], 400
+            )
+        elif "goal" in changes:
+            goal = None
+        done = changes.get("done", record.done)
+        if not isinstance(done, bool):
+            raise HTTPError(400, "done must be true or false")
+
+        if goal != record.goal:
+            self.storage.attach_task(frequency, task, goal)
+            record, previous_goal = self.tasks.attach(frequency, task, goal)
+            self.goal_progress.moved(record, previous_goal)
+        if done != record.done:
+            self.storage.set_task_done(frequency, task, done)
+            record, was_done = self.tasks.set_done(frequency, task, done)
+            self.goal_progress.marked(record, was_done)
+        self.changed()
+        return Response.json(record.to_dict())
+
+    async def delete_task(self, request, frequency, task):
+        self.task_record(frequency, task)
+        self.storage.delete_task(frequency, task)
+        record = self.tasks.remove(frequency, task)
+        self.search.remove_task(record)
+        self.goal_progress.remove_task(record)
+        self.changed()
+        return Response(204)
+
+    def task_from(self, row):
+        try:
+            if not text_field(row, "task"):
+                raise HTTPError(400, "task is required")
+            task_info, _ = validate_row(row)
+        except ValueError as error:
+            raise HTTPError(400, str(error)) from None
+        if "goal" in task_info:
+            self.existing_goal(task_info["goal_type"], task_info["goal"], 400)
+        return task_info
+
+    def task_record(self, frequency, task):
+        record = self.tasks.get(frequency, task)
+        if record is None:
+            raise HTTPError(404, f"no {frequency} task {task!r}")
+        return record
+
+    # --- Goals ---
+
+    async def list_goals(self, request):
+        return Response.json(
+            [
+                {
+                    "goal_type": goal_type,
+                    "goal": goal,
+                    **self.goal_progress.progress(goal_type, goal)._asdict(),
+                }
+                for goal_type, goal in self.search.find_goals(
+                    request.query.get("query", "")
+                )
+            ]
+        )
+
+    async def add_goal(self, request):
+        data = request.json()
+        try:
+            goal_type = text_field(data, "goal_type", "Week")
+            goal = text_field(data, "goal")
+        except ValueError as error:
+            raise HTTPError(400, str(error)) from None
+        if goal_type not in GOAL_TYPES:
+            raise HTTPError(400, f"unknown goal type {goal_type!r}")
+        if not goal:
+            raise HTTPError(400, "goal is required")
+        if self.search.has_goal(goal_type, goal):
+            raise HTTPError(409, f"{goal_type} goal {goal!r} already exists")
+        self.storage.set_goal(goal_type, goal)
+        self.goals[goal_type].append(goal)
+        self.search.add_goal(goal_type, goal)
+        self.goal_progress.add_goal(goal_type, goal)
+        self.changed()
+        return Response.json({"goal_type": goal_type, "goal": goal}, 201)
+
+    async def delete_goal(self, request, goal_type, goal):
+        self.existing_goal(goal_type, goal)
+        # As in the app, the journal's delete_goal detaches the tasks on replay
+        self.storage.delete_goal(goal_type, goal)
+        self.goals[goal_type].remove(goal)
+        self.search.remove_goal(goal_type, goal)
+        for record in self.goal_progress.remove_goal(goal_type, goal):
+            self.tasks.attach(record.frequency, record.task, None)
+        self.changed()
+        return Response(204)
+
+    def existing_goal(self, goal_type, goal, status=404):
+        if not (isinstance(goal, str) and self.search.has_goal(goal_type, goal)):
+            raise HTTPError(status, f"no {goal_type} goal {goal!r}")
+        return (goal_type, goal)
+
+    # --- PDFs ---
+
+    async def planner_pdf(self, request):
+        data = request.json()
+        date_text = data.get("date") or datetime.now().strftime("%Y-%m-%d")
+        try:
+            day = datetime.strptime(date_text, "%Y-%m-%d").date()
+        except (TypeError, ValueError):
+            raise HTTPError(400, f"date must be YYYY-MM-DD, not {date_text!r}")
+        pdf_range = data.get("range") or "Today"
+        if pdf_range not in EXPORT_RANGES:
+            raise HTTPError(400, f"unknown range {pdf_range!r}")
+        backend = backend_param(data)
+
+        # Captured on the loop, so the worker renders a consistent planner
+        snapshot = PlannerSnapshot.capture(
+            self.tasks, self.goals, date_text, progress=self.goal_progress
+        )
+        if pdf_range == "Today":
+            first = last = None
+            file_name = f"DailyPlanner_{date_text}.pdf"
+        else:
+            first, last = deadline_range(pdf_range, today=day)
+            file_name = f"DailyPlanner_{date_text}_{pdf_range.replace(' ', '_')}.pdf"
+        data = await self.render(
+            render_planner_bytes, snapshot, first, last, self.cache_dir, backend
+        )
+        return Response.pdf(data, file_name)
+
+    async def invoice_pdf(self, request):
+        data = request.json()
+        work_entries = data.get("work_entries")
+        if not isinstance(work_entries, list) or not all(
+            isinstance(entry, list)
+            and len(entry) == 2
+            and all(isinstance(part, str) for part in entry)
+            for entry in work_entries
+        ):
+            raise HTTPError(
+                400, "work_entries must be a list of [date, description] pairs"
+            )
+        daily_rate = data.get("daily_rate")
+        if not isinstance(daily_rate, (int, float)) or daily_rate < 0:
+            raise HTTPError(400, "daily_rate must be a number of at least 0")
+        invoice_date = None
+        if data.get("invoice_date"):
+            try:
+                invoice_date = datetime.strptime(data["invoice_date"], "%Y-%m-%d")
+            except (TypeError, ValueError):
+                raise HTTPError(400, "invoice_date must be YYYY-MM-DD")
+        options = {
+            "materials": bool(data.get("materials")),
+            "backend": backend_param(data),
+        }
+        if data.get("unit_prices") is not None:
+            try:
+                options["unit_prices"] = unit_prices_from_json(data["unit_prices"])
+            except (AttributeError, TypeError, ValueError):
+                raise HTTPError(
+                    400, "unit_prices must map items to prices or {size: price}"
+                ) from None
+        names = {}
+        if data.get("client"):
+            names["client_name"] = str(data["client"])
+        if data.get("project"):
+            names["project_name"] = str(data["project"])
+        try:
+            pdf = await self.render(
+                functools.partial(render_invoice_bytes, **names, **options),
+                [tuple(entry) for entry in work_entries],
+                daily_rate,
+                invoice_date,
+            )
+        except ValueError as error:
+            # A work date that is not d/m/yy, or an item without a unit price
+            raise HTTPError(400, str(error)) from None
+        return Response.pdf(pdf, "invoice.pdf")
+
+    async def render(self, function, *args):
+        async with self.render_slots:
+            self.renders_in_flight += 1
+            try:
+                return await asyncio.get_running_loop().run_in_executor(
+                    self.pool, function, *args
+                )
+            finally:
+                self.renders_in_flight -= 1
+
+    # --- Metrics and upkeep ---
+
+    async def metrics(self, request):
+        return Response.json(
+            {
+                "uptime_s": round(time.perf_counter() - self.started, 3),
+                "tasks": len(self.tasks),
+                "goals": sum(len(goals_list) for goals_list in self.goals.values()),
+                "workers": self.workers,
+                "renders_in_flight": self.renders_in_flight,
+                "routes": {
+                    route: stats.summary()
+                    for route, stats in sorted(self.latency.items())
+                },
+            }
+        )
+
+    def changed(self):
+        """Fold the journal into a snapshot in a thread once it grows long."""
+        if self.storage.needs_compaction and self.compaction is None:
+            covered = self.storage.begin_compaction()
+            records = self.tasks.records()
+            goals = {
+                goal_type: list(goals_list)
+                for goal_type, goals_list in self.goals.items()
+            }
+            self.compaction = asyncio.get_running_loop().run_in_executor(
+                None,
+                lambda: self.storage.finish_compaction(
+                    covered, (record.to_dict() for record in records), goals
+                ),
+            )
+            self.compaction.add_done_callback(self.compacted)
+
+    def compacted(self, future):
+        self.compaction = None
+        if not future.cancelled() and future.exception() is not None:
+            print(f"Could not save the planner: {future.exception()}", file=sys.stderr)
+
+    async def close(self):
+        if self.compaction is not None:
+            await self.compaction
+        self.pool.shutdown()
+        self.storage.compact(
+            [record.to_dict() for record in self.tasks.records()], self.goals
+        )
+        self.storage.close()
+
+
+async def read_request(request_line, reader):
+    """Read the rest of a request; returns ``(Request, keep_alive)``."""
+    try:
+        method, target, version = request_line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(400, "malformed request line") from None
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if not line.strip():
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise HTTPError(411, "send the body with a Content-Length")
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise HTTPError(400, "Content-Length must be a whole number") from None
+    if length < 0:
+        raise HTTPError(400, "Content-Length must not be negative")
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, f"request bodies are limited to {MAX_BODY_BYTES} bytes")
+    body = await reader.readexactly(length) if length else b""
+
+    connection = headers.get("connection", "").lower()
+    keep_alive = (
+        connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+    )
+    url = urlsplit(target)
+    query = dict(parse_qsl(url.query))
+    return Request(method.upper(), url.path, query, headers, body), keep_alive
+
+
+async def write_response(writer, response, keep_alive):
+    head = [
+        f"HTTP/1.1 {response.status} {STATUS_TEXT.get(response.status, '')}",
+        f"Content-Type: {response.content_type}",
+        f"Content-Length: {len(response.body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+    ]
+    head.extend(f"{name}: {value}" for name, value in response.headers.items())
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + response.body)
+    await writer.drain()
+
+
+def int_param(query, name, default):
+    try:
+        value = int(query.get(name, default))
+    except ValueError:
+        raise HTTPError(400, f"{name} must be a whole number") from None
+    if value < 0:
+        raise HTTPError(400, f"{name} must not be negative")
+    return value
+
+
+def backend_param(data):
+    backend = data.get("backend") or PLATYPUS
+    if backend not in BACKENDS:
+        raise HTTPError(400, f"backend must be one of {', '.join(BACKENDS)}")
+    return backend
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, **service_options):
+    """Run the service until SIGINT/SIGTERM, then save the planner."""
+    service = PlannerService(**service_options)
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    host, port = server.sockets[0].getsockname()[:2]
+    # The load test reads this line to find the port when started with 0
+    print(f"Serving on http://{host}:{port}", flush=True)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signal_number, stop.set)
+        except (NotImplementedError, RuntimeError):
+            # Windows: Ctrl+C raises KeyboardInterrupt instead
+            pass
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Serve the planner and invoice generators over local HTTP."
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument(
+        "--port", type=int, default=DEFAULT_PORT, help="0 picks a free port"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count(), help="PDF render processes"
+    )
+    parser.add_argument(
+        "--data-dir", default=DEFAULT_DATA_DIR, help="planner data directory"
+    )
+    parser.add_argument(
+        "--cache-dir", default=DEFAULT_CACHE_DIR, help="planner PDF render cache"
+    )
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args(argv)
+    instrumentation.configure_from(args)
+    try:
+        asyncio.run(
+            serve(
+                args.host,
+                args.port,
+                data_dir=args.data_dir,
+                workers=args.workers,
+                cache_dir=args.cache_dir,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""Immutable snapshots of the planner, safe to hand to worker threads."""
+
+from collections import namedtuple
+from datetime import datetime
+
+from goal_progress import GoalProgress
+from task_store import FREQUENCIES, TaskStore
+
+TaskRow = namedtuple("TaskRow", "task due_date schedule importance frequency")
+# done and total count the tasks attached to the goal
+GoalRow = namedtuple("GoalRow", "goal done total")
+
+
+class PlannerSnapshot(namedtuple("PlannerSnapshot", "date tasks_by_frequency goals")):
+    """Planner state frozen at one moment.
+
+    ``tasks_by_frequency`` is a tuple of ``(frequency, (TaskRow, ...))`` pairs
+    in report order and ``goals`` a tuple of ``(goal_type, (GoalRow, ...))``
+    pairs. ``date`` is the ``YYYY-MM-DD`` day the planner is for.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def capture(cls, task_store, goals, date=None, progress=None):
+        """Snapshot a TaskStore and goal lists.
+
+        ``progress`` is the GoalProgress kept alongside them; without one the
+        progress is counted from the tasks.
+        """
+        if progress is None:
+            progress = GoalProgress(goals, task_store.records())
+        return cls(
+            date or datetime.now().strftime("%Y-%m-%d"),
+            tuple(
+                (
+                    frequency,
+                    tuple(
+                        TaskRow(
+                            task_info.task,
+                            task_info.due_date,
+                            task_info.schedule,
+                            task_info.importance,
+                            task_info.frequency,
+                        )
+                        for task_info in task_store.frequency_tasks(frequency)
+                    ),
+                )
+                for frequency in FREQUENCIES
+            ),
+            tuple(
+                (
+                    goal_type,
+                    tuple(
+                        GoalRow(goal, *progress.progress(goal_type, goal))
+                        for goal in goals_list
+                    ),
+                )
+                for goal_type, goals_list in goals.items()
+            ),
+        )
+
+    @classmethod
+    def from_dicts(cls, tasks, goals, date=None):
+        """Snapshot plain task dicts and goal lists, e.g. from a data file."""
+        task_store = TaskStore()
+        task_store.extend(tasks)
+        return cls.capture(task_store, goals, date)
@@ -0,0 +1,253 @@
+"""Journaled on-disk storage for planner tasks and goals.
+
+The data directory holds a snapshot (``snapshot.json``) and numbered journal
+segments (``journal-<n>.log``). Every mutation is appended to the current
+segment as a single JSON line, so saving a change never rewrites the whole
+planner. Startup loads the snapshot and replays the segments written after
+it. Compaction writes a fresh snapshot (temp file + rename) and removes the
+segments it covers. The snapshot can be written on a worker thread: only
+rotating to a new segment has to happen on the thread that journals.
+"""
+
+import json
+import os
+
+DEFAULT_DATA_DIR = os.environ.get(
+    "DAILY_PLANNER_DATA", os.path.join(os.path.expanduser("~"), ".daily_planner")
+)
+SNAPSHOT_NAME = "snapshot.json"
+GOAL_TYPES = ("Week", "Month", "Year")
+
+
+def segment_name(number):
+    return f"journal-{number:06d}.log"
+
+
+class PlannerStorage:
+    def __init__(self, data_dir=DEFAULT_DATA_DIR, compact_after=10000, fsync=False):
+        self.data_dir = data_dir
+        # Number of journal records after which a new snapshot is worthwhile
+        self.compact_after = compact_after
+        # Flushing protects against an application crash; fsync also against
+        # power loss, at the price of a disk round trip per mutation.
+        self.fsync = fsync
+        self.journal_records = 0
+        self.segment = 0
+        self._journal = None
+        os.makedirs(data_dir, exist_ok=True)
+
+    @property
+    def snapshot_path(self):
+        return os.path.join(self.data_dir, SNAPSHOT_NAME)
+
+    @property
+    def needs_compaction(self):
+        return self.journal_records >= self.compact_after
+
+    def segments(self):
+        numbers = []
+        for name in os.listdir(self.data_dir):
+            if name.startswith("journal-") and name.endswith(".log"):
+                try:
+                    numbers.append(int(name[len("journal-") : -len(".log")]))
+                except ValueError:
+                    continue
+        return sorted(numbers)
+
+    def load(self):
+        """Return ``(tasks, goals)`` from the last snapshot plus the journal tail.
+
+        ``tasks`` is a list of task dicts in the order they were added and
+        ``goals`` maps each goal type to its list of goals.
+        """
+        tasks = {}
+        goals = {goal_type: {} for goal_type in GOAL_TYPES}
+        self.segment = 0
+
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as snapshot_file:
+                snapshot = json.load(snapshot_file)
+            self.segment = snapshot["segment"]
+            for task_info in snapshot["tasks"]:
+                tasks[(task_info["frequency"], task_info["task"])] = task_info
+            for goal_type, goals_list in snapshot["goals"].items():
+                goals.setdefault(goal_type, {}).update(dict.fromkeys(goals_list))
+
+        self.journal_records = 0
+        for number in self.segments():
+            path = os.path.join(self.data_dir, segment_name(number))
+            if number < self.segment:
+                # Already folded into the snapshot; left over from a crash
+                # between writing the snapshot and cleaning up.
+                os.remove(path)
+                continue
+            self.journal_records += self._replay(path, tasks, goals)
+            self.segment = number
+
+        self._open_segment()
+        return (
+            list(tasks.values()),
+            {goal_type: list(goals_list) for goal_type, goals_list in goals.items()},
+        )
+
+    def add_task(self, task_info):
+        self._append({"op": "add_task", "task": task_info})
+
+    def add_tasks(self, task_infos):
+        """Journal many added tasks with a single write."""
+        self._append_many(
+            {"op": "add_task", "task": task_info} for task_info in task_infos
+        )
+
+    def delete_task(self, frequency, task):
+        self._append({"op": "delete_task", "frequency": frequency, "task": task})
+
+    def set_task_done(self, frequency, task, done):
+        self._append(
+            {"op": "set_task_done", "frequency": frequency, "task": task, "done": done}
+        )
+
+    def attach_task(self, frequency, task, goal):
+        """Journal attaching a task to ``(goal_type, goal)``, or detaching (None)."""
+        goal_type, goal = goal or (None, None)
+        self._append(
+            {
+                "op": "attach_task",
+                "frequency": frequency,
+                "task": task,
+                "goal_type": goal_type,
+                "goal": goal,
+            }
+        )
+
+    def set_goal(self, goal_type, goal):
+        self._append({"op": "set_goal", "goal_type": goal_type, "goal": goal})
+
+    def set_goals(self, goal_pairs):
+        """Journal many ``(goal_type, goal)`` pairs with a single write."""
+        self._append_many(
+            {"op": "set_goal", "goal_type": goal_type, "goal": goal}
+            for goal_type, goal in goal_pairs
+        )
+
+    def delete_goal(self, goal_type, goal):
+        self._append({"op": "delete_goal", "goal_type": goal_type, "goal": goal})
+
+    def compact(self, tasks, goals):
+        """Write ``tasks`` (task dicts) and ``goals`` as the new snapshot."""
+        self.finish_compaction(self.begin_compaction(), tasks, goals)
+
+    def begin_compaction(self):
+        """Start a new journal segment and return its number.
+
+        Changes journaled from now on go to the new segment. Pass the number
+        to finish_compaction together with the state as of this call.
+        """
+        covered = self.segment + 1
+        self._close_segment()
+        self.segment = covered
+        self._open_segment()
+        self.journal_records = 0
+        return covered
+
+    def finish_compaction(self, covered, tasks, goals):
+        """Write the snapshot that replaces every segment before ``covered``.
+
+        Safe to call from another thread while journaling goes on, as long as
+        compactions do not overlap.
+        """
+        write_snapshot(self.snapshot_path, covered, tasks, goals)
+        for number in self.segments():
+            if number < covered:
+                os.remove(os.path.join(self.data_dir, segment_name(number)))
+
+    def close(self):
+        self._close_segment()
+
+    def _append(self, record):
+        self._append_many((record,))
+
+    def _append_many(self, records):
+        lines = [json.dumps(record, separators=(",", ":")) + "\n" for record in records]
+        if not lines:
+            return
+        self._journal.write("".join(lines))
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+        self.journal_records += len(lines)
+
+    def _open_segment(self):
+        path = os.path.join(self.data_dir, segment_name(self.segment))
+        self._journal = open(path, "a", encoding="utf-8")
+
+    def _close_segment(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def _replay(self, path, tasks, goals):
+        # A torn write can only sit at the tail; it and anything after it
+        # are dropped so later appends start on a clean line.
+        count = 0
+        good_size = 0
+        with open(path, "rb") as journal:
+            for line in journal:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                apply_record(record, tasks, goals)
+                good_size += len(line)
+                count += 1
+        if good_size != os.path.getsize(path):
+            with open(path, "r+b") as journal:
+                journal.truncate(good_size)
+        return count
+
+
+def apply_record(record, tasks, goals):
+    op = record["op"]
+    if op == "add_task":
+        task_info = record["task"]
+        tasks.setdefault((task_info["frequency"], task_info["task"]), task_info)
+    elif op == "delete_task":
+        tasks.pop((record["frequency"], record["task"]), None)
+    elif op == "set_task_done":
+        task_info = tasks.get((record["frequency"], record["task"]))
+        if task_info is not None:
+            task_info["done"] = record["done"]
+    elif op == "attach_task":
+        task_info = tasks.get((record["frequency"], record["task"]))
+        if task_info is not None:
+            task_info["goal_type"] = record["goal_type"]
+            task_info["goal"] = record["goal"]
+    elif op == "set_goal":
+        goals.setdefault(record["goal_type"], {})[record["goal"]] = None
+    elif op == "delete_goal":
+        goals.get(record["goal_type"], {}).pop(record["goal"], None)
+        # Deleting a goal detaches its tasks; rare, so a scan is fine here
+        for task_info in tasks.values():
+            if (
+                task_info.get("goal") == record["goal"]
+                and task_info.get("goal_type") == record["goal_type"]
+            ):
+                task_info["goal_type"] = task_info["goal"] = None
+    else:
+        raise ValueError(f"Unknown journal record: {op!r}")
+
+
+def write_snapshot(path, segment, tasks, goals):
+    """Atomically replace the snapshot at ``path``."""
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as snapshot_file:
+        json.dump(
+            {"segment": segment, "tasks": list(tasks), "goals": goals},
+            snapshot_file,
+            separators=(",", ":"),
+        )
+        snapshot_file.flush()
+        os.fsync(snapshot_file.fileno())
+    os.replace(temp_path, path)
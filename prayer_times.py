@@ -0,0 +1,225 @@
+"""Offline prayer times for the planner PDF.
+
+Times come from the sun's position, using the usual astronomical formulas
+(declination and equation of time from the Julian date), so no network is
+needed. The location, time zone and calculation method come from the
+environment:
+
+    PLANNER_LATITUDE / PLANNER_LONGITUDE   degrees, north/east positive
+    PLANNER_TIMEZONE                       IANA name (Africa/Cairo) or UTC
+                                           offset in hours (+2, -5.5)
+    PLANNER_PRAYER_METHOD                  one of METHODS (default Egypt)
+    PLANNER_ASR                            Standard or Hanafi
+
+A whole year is computed at once into an array of minutes after local
+midnight (six times a day), memoized per settings and year, so looking up
+a day is an index into that array.
+"""
+
+import math
+import os
+from array import array
+from collections import namedtuple
+from datetime import date, datetime
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+# Fajr and Isha twilight angles in degrees; an Isha of ("minutes", n) means
+# n minutes after Maghrib instead of an angle.
+METHODS = {
+    "MWL": (18.0, 17.0),
+    "ISNA": (15.0, 15.0),
+    "Egypt": (19.5, 17.5),
+    "Makkah": (18.5, ("minutes", 90)),
+    "Karachi": (18.0, 18.0),
+}
+ASR_FACTORS = {"Standard": 1, "Hanafi": 2}
+TIMES = ("Fajr", "Sunrise", "Dhuhr", "Asr", "Maghrib", "Isha")
+PRAYERS = ("Fajr", "Dhuhr", "Asr", "Maghrib", "Isha")
+# Stored for times that do not exist that day (e.g. no sunrise near the poles)
+NO_TIME = -1
+# Duha starts once the sun has risen well clear of the horizon
+DUHA_AFTER_SUNRISE = 20
+
+PrayerSettings = namedtuple("PrayerSettings", "latitude longitude timezone method asr")
+
+
+def settings_from_env(environ=os.environ):
+    """Read PrayerSettings from the environment; the default is Cairo."""
+    settings = PrayerSettings(
+        float(environ.get("PLANNER_LATITUDE", "30.0444")),
+        float(environ.get("PLANNER_LONGITUDE", "31.2357")),
+        environ.get("PLANNER_TIMEZONE", "Africa/Cairo"),
+        environ.get("PLANNER_PRAYER_METHOD", "Egypt"),
+        environ.get("PLANNER_ASR", "Standard"),
+    )
+    if settings.method not in METHODS:
+        raise ValueError(f"Unknown prayer time method: {settings.method!r}")
+    if settings.asr not in ASR_FACTORS:
+        raise ValueError(f"Unknown Asr method: {settings.asr!r}")
+    return settings
+
+
+DEFAULT_SETTINGS = settings_from_env()
+
+
+def day_times(day, settings=DEFAULT_SETTINGS):
+    """Minutes after local midnight of each of TIMES on the day ordinal ``day``.
+
+    A time that does not exist that day is NO_TIME.
+    """
+    when = date.fromordinal(day)
+    table = year_table(settings, when.year)
+    start = (day - date(when.year, 1, 1).toordinal()) * len(TIMES)
+    return tuple(table[start : start + len(TIMES)])
+
+
+def sunnah_times(day, settings=DEFAULT_SETTINGS):
+    """``(name, minutes)`` of the sunnah prayers on the day ordinal ``day``.
+
+    Tahajjud starts with the last third of the night, from Maghrib to the
+    next day's Fajr. Shuruq is sunrise and Duha follows it.
+    """
+    fajr, sunrise, _, _, maghrib, _ = day_times(day, settings)
+    next_fajr = day_times(day + 1, settings)[0]
+    if NO_TIME in (maghrib, next_fajr):
+        tahajjud = NO_TIME
+    else:
+        night = next_fajr + 24 * 60 - maghrib
+        tahajjud = (maghrib + night * 2 // 3) % (24 * 60)
+    duha = NO_TIME if sunrise == NO_TIME else sunrise + DUHA_AFTER_SUNRISE
+    return (("Duha", duha), ("Tahajjud", tahajjud), ("shroq", sunrise))
+
+
+def format_time(minutes):
+    """``7:19 PM`` style text for minutes after midnight."""
+    if minutes == NO_TIME:
+        return "-"
+    hours, minutes = divmod(minutes % (24 * 60), 60)
+    return f"{(hours - 1) % 12 + 1}:{minutes:02d} {'AM' if hours < 12 else 'PM'}"
+
+
+@lru_cache(maxsize=16)
+def year_table(settings, year):
+    """Minutes after local midnight of TIMES for every day of ``year``.
+
+    The array holds ``len(TIMES)`` entries per day, starting with January 1.
+    """
+    table = array("h")
+    first = date(year, 1, 1).toordinal()
+    last = date(year, 12, 31).toordinal()
+    for day in range(first, last + 1):
+        table.extend(
+            NO_TIME if math.isnan(hours) else round(hours * 60) % (24 * 60)
+            for hours in compute_times(date.fromordinal(day), settings)
+        )
+    return table
+
+
+def compute_times(when, settings):
+    """Local clock hours (floats) of TIMES on ``when``; NaN when undefined."""
+    latitude, longitude = settings.latitude, settings.longitude
+    fajr_angle, isha_angle = METHODS[settings.method]
+    julian_date = _julian_date(when) - longitude / (15 * 24)
+
+    def sun_angle_time(angle, hours, before_noon=False):
+        declination = _sun_position(julian_date + hours / 24)[0]
+        noon = _mid_day(julian_date, hours)
+        cos_hour_angle = (-_sin(angle) - _sin(declination) * _sin(latitude)) / (
+            _cos(declination) * _cos(latitude)
+        )
+        if not -1 <= cos_hour_angle <= 1:
+            return math.nan
+        offset = math.degrees(math.acos(cos_hour_angle)) / 15
+        return noon - offset if before_noon else noon + offset
+
+    def asr_time(factor, hours):
+        declination = _sun_position(julian_date + hours / 24)[0]
+        angle = -math.degrees(
+            math.atan(1 / (factor + _tan(abs(latitude - declination))))
+        )
+        return sun_angle_time(angle, hours)
+
+    fajr = sun_angle_time(fajr_angle, 5, before_noon=True)
+    sunrise = sun_angle_time(0.833, 6, before_noon=True)
+    dhuhr = _mid_day(julian_date, 12)
+    asr = asr_time(ASR_FACTORS[settings.asr], 13)
+    maghrib = sun_angle_time(0.833, 18)
+    if isinstance(isha_angle, tuple):
+        isha = maghrib + isha_angle[1] / 60
+    else:
+        isha = sun_angle_time(isha_angle, 18)
+
+    # High latitudes: twilight may never end, so Fajr and Isha are kept
+    # within a night portion proportional to their angle (angle-based rule).
+    if not math.isnan(sunrise) and not math.isnan(maghrib):
+        night = 24 - (maghrib - sunrise)
+        fajr_limit = sunrise - fajr_angle / 60 * night
+        if math.isnan(fajr) or sunrise - fajr > fajr_angle / 60 * night:
+            fajr = fajr_limit
+        if not isinstance(isha_angle, tuple):
+            isha_limit = maghrib + isha_angle / 60 * night
+            if math.isnan(isha) or isha - maghrib > isha_angle / 60 * night:
+                isha = isha_limit
+
+    offset = _utc_offset(settings.timezone, when) - longitude / 15
+    return tuple(hours + offset for hours in (fajr, sunrise, dhuhr, asr, maghrib, isha))
+
+
+def _utc_offset(timezone, when):
+    try:
+        return float(timezone)
+    except ValueError:
+        noon = datetime(when.year, when.month, when.day, 12, tzinfo=ZoneInfo(timezone))
+        return noon.utcoffset().total_seconds() / 3600
+
+
+def _julian_date(when):
+    year, month = when.year, when.month
+    if month <= 2:
+        year -= 1
+        month += 12
+    century = year // 100
+    correction = 2 - century + century // 4
+    return (
+        math.floor(365.25 * (year + 4716))
+        + math.floor(30.6001 * (month + 1))
+        + when.day
+        + correction
+        - 1524.5
+    )
+
+
+def _sun_position(julian_date):
+    """Return ``(declination, equation of time)`` in degrees and hours."""
+    days = julian_date - 2451545.0
+    mean_anomaly = (357.529 + 0.98560028 * days) % 360
+    mean_longitude = (280.459 + 0.98564736 * days) % 360
+    longitude = (
+        mean_longitude + 1.915 * _sin(mean_anomaly) + 0.020 * _sin(2 * mean_anomaly)
+    ) % 360
+    obliquity = 23.439 - 0.00000036 * days
+    right_ascension = (
+        math.degrees(math.atan2(_cos(obliquity) * _sin(longitude), _cos(longitude)))
+        / 15
+    ) % 24
+    declination = math.degrees(math.asin(_sin(obliquity) * _sin(longitude)))
+    equation_of_time = mean_longitude / 15 - right_ascension
+    return declination, equation_of_time
+
+
+def _mid_day(julian_date, hours):
+    equation_of_time = _sun_position(julian_date + hours / 24)[1]
+    return (12 - equation_of_time) % 24
+
+
+def _sin(degrees):
+    return math.sin(math.radians(degrees))
+
+
+def _cos(degrees):
+    return math.cos(math.radians(degrees))
+
+
+def _tan(degrees):
+    return math.tan(math.radians(degrees))
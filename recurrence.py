@@ -0,0 +1,91 @@
+"""Concrete dates of Daily, Weekly and Monthly tasks.
+
+Daily tasks happen every day. A weekly task happens on the weekday of its
+due date, and a monthly task on the day of the month of its due date (on
+the last day in shorter months). Undated weekly tasks fall on Mondays and
+undated monthly tasks on the 1st. The due date only sets the phase. Nothing
+happens before it or stops after it.
+
+``Recurrence`` sorts the tasks into buckets once (daily, by weekday, by day
+of month), so the tasks of any day are three bucket lookups. The buckets
+are shared tuples in report order and are never copied per day. Windows are
+expanded lazily with generators.
+"""
+
+import calendar
+from collections import namedtuple
+from datetime import date
+
+from due_dates import parse_due_date
+
+Occurrence = namedtuple("Occurrence", "day task")
+# The tasks of one day: day ordinal plus the (frequency, tasks) sections
+DayPlan = namedtuple("DayPlan", "day sections")
+
+
+class Recurrence:
+    def __init__(self, tasks_by_frequency):
+        """``tasks_by_frequency`` is ``(frequency, tasks)`` pairs in report order.
+
+        Tasks are Task records or snapshot TaskRows; only ``due_date`` is
+        read. PlannerSnapshot.tasks_by_frequency fits as is.
+        """
+        tasks = dict(tasks_by_frequency)
+        self.daily = tuple(tasks.get("Daily", ()))
+        weekly = [[] for _ in range(7)]
+        monthly = [[] for _ in range(32)]
+        for task_info in tasks.get("Weekly", ()):
+            due = parse_due_date(task_info.due_date)
+            weekday = 0 if due is None else date.fromordinal(due).weekday()
+            weekly[weekday].append(task_info)
+        self._monthly_tasks = tuple(tasks.get("Monthly", ()))
+        for task_info in self._monthly_tasks:
+            due = parse_due_date(task_info.due_date)
+            monthly[1 if due is None else date.fromordinal(due).day].append(task_info)
+        # Report order is kept, since each bucket is filled in that order
+        self.weekly = tuple(tuple(bucket) for bucket in weekly)
+        self.monthly = tuple(tuple(bucket) for bucket in monthly)
+        self._month_ends = {}
+
+    def tasks_on(self, day):
+        """Return the ``(frequency, tasks)`` sections of the day ordinal ``day``."""
+        when = date.fromordinal(day)
+        month_length = calendar.monthrange(when.year, when.month)[1]
+        if when.day == month_length and month_length < 31:
+            monthly = self._month_end(month_length)
+        else:
+            monthly = self.monthly[when.day]
+        return (
+            ("Daily", self.daily),
+            ("Weekly", self.weekly[when.weekday()]),
+            ("Monthly", monthly),
+        )
+
+    def expand(self, first, last):
+        """Yield a DayPlan for every day from ``first`` to ``last`` inclusive."""
+        for day in range(first, last + 1):
+            yield DayPlan(day, self.tasks_on(day))
+
+    def occurrences(self, first, last):
+        """Yield every Occurrence from ``first`` to ``last``, day by day."""
+        for day, sections in self.expand(first, last):
+            for _, tasks in sections:
+                for task_info in tasks:
+                    yield Occurrence(day, task_info)
+
+    def _month_end(self, month_length):
+        # Tasks on the 29th-31st move to the last day of shorter months
+        tasks = self._month_ends.get(month_length)
+        if tasks is None:
+            members = {
+                id(task_info)
+                for bucket in self.monthly[month_length:]
+                for task_info in bucket
+            }
+            tasks = tuple(
+                task_info
+                for task_info in self._monthly_tasks
+                if id(task_info) in members
+            )
+            self._month_ends[month_length] = tasks
+        return tasks
@@ -0,0 +1,113 @@
+"""On-disk cache of rendered PDFs, keyed by a hash of their inputs.
+
+A key is the SHA-256 of everything that decides a PDF's bytes: the layout
+version of the renderer, what kind of export it is, the snapshot contents,
+the date(s) and the options. Rendering the same planner twice, such as
+"Save as PDF" followed by closing the window with nothing changed, becomes
+a lookup and a hard link (or a copy, where links are not supported).
+
+The cache directory keeps up to ``max_entries`` PDFs and ``max_bytes`` in
+total. Each hit touches the file's mtime, and the least recently used files
+are evicted first, so recent variants of the planner stay cached.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import instrumentation
+from planner_storage import DEFAULT_DATA_DIR
+
+DEFAULT_CACHE_DIR = os.path.join(DEFAULT_DATA_DIR, "render-cache")
+MAX_ENTRIES = 64
+MAX_BYTES = 256 * 1024 * 1024
+
+
+def content_key(*parts):
+    """Stable hex digest of JSON-serializable ``parts`` (tuples hash as lists)."""
+    data = json.dumps(parts, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def snapshot_digest(snapshot):
+    """Digest of a PlannerSnapshot's tasks and goals; its date is left out."""
+    return content_key(snapshot.tasks_by_frequency, snapshot.goals)
+
+
+class RenderCache:
+    def __init__(
+        self, cache_dir=DEFAULT_CACHE_DIR, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES
+    ):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pdf")
+
+    def fetch(self, key, pdf_path):
+        """Place the PDF cached under ``key`` at ``pdf_path``; False on a miss."""
+        cached = self.path(key)
+        try:
+            # Marks the entry as recently used
+            os.utime(cached)
+        except FileNotFoundError:
+            instrumentation.count("render_cache.misses")
+            return False
+        instrumentation.count("render_cache.hits")
+        if not (os.path.exists(pdf_path) and os.path.samefile(cached, pdf_path)):
+            place(cached, pdf_path)
+        return True
+
+    def store(self, key, pdf_path):
+        """Keep the rendered ``pdf_path`` under ``key`` and evict old entries."""
+        place(pdf_path, self.path(key))
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".pdf"):
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort(reverse=True)
+        kept = kept_bytes = 0
+        for _, size, path in entries:
+            if kept < self.max_entries and kept_bytes + size <= self.max_bytes:
+                kept += 1
+                kept_bytes += size
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".pdf"):
+                os.remove(os.path.join(self.cache_dir, name))
+
+
+def place(source, target):
+    """Atomically make ``target`` a hard link to (or copy of) ``source``."""
+    handle, temp_path = tempfile.mkstemp(
+        suffix=".part", dir=os.path.dirname(os.path.abspath(target))
+    )
+    os.close(handle)
+    try:
+        os.remove(temp_path)
+        try:
+            os.link(source, temp_path)
+        except OSError:
+            shutil.copyfile(source, temp_path)
+        os.replace(temp_path, target)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
@@ -0,0 +1,270 @@
+"""Type-ahead search over planner tasks and goals.
+
+``SearchIndex`` is an inverted index from lowercase words to the keys of the
+items containing them. The distinct words are also kept in a sorted list, so
+every word of a query can match as a prefix with a bisect instead of a scan.
+Prefixes of up to three letters match too many words to merge on every
+keystroke, so their key sets are kept ready instead. Adding or removing an
+item only touches that item's words.
+
+``PlannerSearch`` keeps one index over task names and schedules and one over
+goals, plus the tasks of each frequency and importance. A query is answered
+with set intersections. The matching tasks come back as a lazy view in
+task-table order, so the first screenful is ready without ordering every
+match. The search has to be told about every add and delete, as
+PlannerStorage is.
+"""
+
+import re
+from bisect import bisect_left, insort
+from operator import attrgetter
+
+from task_store import FREQUENCIES, IMPORTANCE_LEVELS
+
+WORD_RE = re.compile(r"\w+")
+# Prefixes up to this length get their own key sets
+SHORT_PREFIX = 3
+# Result sets up to this size are sorted outright instead of viewed lazily
+SORT_MATCHES = 2000
+
+
+def tokenize(text):
+    return WORD_RE.findall(text.lower())
+
+
+def short_prefixes(words):
+    return {word[:length] for word in words for length in range(1, SHORT_PREFIX + 1)}
+
+
+class SearchIndex:
+    def __init__(self):
+        # word -> set of keys, the sorted distinct words, key -> its words
+        self._postings = {}
+        self._words = []
+        self._item_words = {}
+        self._prefixes = {}
+
+    def __len__(self):
+        return len(self._item_words)
+
+    def __contains__(self, key):
+        return key in self._item_words
+
+    def add(self, key, *texts):
+        for word in self._index(key, texts):
+            insort(self._words, word)
+
+    def extend(self, items):
+        """Index many ``(key, texts)`` pairs, sorting the word list once."""
+        new_words = False
+        for key, texts in items:
+            for _ in self._index(key, texts):
+                new_words = True
+        if new_words:
+            self._words = sorted(self._postings)
+
+    def remove(self, key):
+        words = self._item_words.pop(key)
+        for word in words:
+            keys = self._postings[word]
+            keys.discard(key)
+            if not keys:
+                del self._postings[word]
+                del self._words[bisect_left(self._words, word)]
+        for prefix in short_prefixes(words):
+            keys = self._prefixes[prefix]
+            keys.discard(key)
+            if not keys:
+                del self._prefixes[prefix]
+
+    def search(self, query):
+        """Return the keys matching every word of ``query`` as a prefix.
+
+        The result may be one of the index's own sets and must not be mutated.
+        An empty query matches nothing.
+        """
+        matches = None
+        # Longer words usually match fewer items, so they narrow things first
+        for word in sorted(set(tokenize(query)), key=len, reverse=True):
+            if matches is not None and len(matches) < 64:
+                matches = {
+                    key
+                    for key in matches
+                    if any(
+                        item_word.startswith(word)
+                        for item_word in self._item_words[key]
+                    )
+                }
+            else:
+                found = self._prefix_matches(word)
+                if matches is None:
+                    matches = found
+                elif len(found) < len(self._item_words):
+                    matches = matches & found
+            if not matches:
+                break
+        return matches if matches is not None else set()
+
+    def _index(self, key, texts):
+        # Yields the words seen for the first time
+        words = set()
+        for text in texts:
+            words.update(tokenize(text))
+        self._item_words[key] = tuple(words)
+        postings = self._postings
+        for word in words:
+            keys = postings.get(word)
+            if keys is None:
+                keys = postings[word] = set()
+                yield word
+            keys.add(key)
+        prefixes = self._prefixes
+        for prefix in short_prefixes(words):
+            keys = prefixes.get(prefix)
+            if keys is None:
+                keys = prefixes[prefix] = set()
+            keys.add(key)
+
+    def _prefix_matches(self, prefix):
+        if len(prefix) <= SHORT_PREFIX:
+            return self._prefixes.get(prefix, set())
+        words = self._words
+        postings = []
+        position = bisect_left(words, prefix)
+        while position < len(words) and words[position].startswith(prefix):
+            postings.append(self._postings[words[position]])
+            position += 1
+        if len(postings) == 1:
+            return postings[0]
+        return set().union(*postings)
+
+
+class OrderedMatches:
+    """The items of ``ordered`` that are in ``matches``, found as needed.
+
+    Supports ``len()``, indexing, slicing and iteration like a list. Neither
+    ``ordered`` nor ``matches`` may change while the view is in use.
+    """
+
+    def __init__(self, ordered, matches, chunk=1024):
+        self._ordered = ordered
+        self._matches = matches
+        self._chunk = chunk
+        self._found = []
+        self._position = 0
+
+    def __len__(self):
+        return len(self._matches)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            if index.stop is None or index.stop < 0 or (index.start or 0) < 0:
+                self._fill(len(self._matches))
+            else:
+                self._fill(index.stop)
+        elif index < 0:
+            self._fill(len(self._matches))
+        else:
+            self._fill(index + 1)
+        return self._found[index]
+
+    def __iter__(self):
+        self._fill(len(self._matches))
+        return iter(self._found)
+
+    def _fill(self, count):
+        found = self._found
+        ordered = self._ordered
+        contains = self._matches.__contains__
+        while len(found) < count and self._position < len(ordered):
+            end = self._position + self._chunk
+            found.extend(filter(contains, ordered[self._position : end]))
+            self._position = end
+
+
+class PlannerSearch:
+    def __init__(self, task_store, goals):
+        self.tasks = task_store
+        self.goals = goals
+        self.task_index = SearchIndex()
+        self.goal_index = SearchIndex()
+        self.by_frequency = {frequency: set() for frequency in FREQUENCIES}
+        self.by_importance = {importance: set() for importance in IMPORTANCE_LEVELS}
+        self.add_tasks(task_store)
+        for goal_type, goals_list in goals.items():
+            for goal in goals_list:
+                self.add_goal(goal_type, goal)
+
+    def add_task(self, record):
+        self.task_index.add(record, record.task, record.schedule)
+        self._add_facets(record)
+
+    def add_tasks(self, records):
+        records = list(records)
+        self.task_index.extend(
+            (record, (record.task, record.schedule)) for record in records
+        )
+        for record in records:
+            self._add_facets(record)
+
+    def remove_task(self, record):
+        self.task_index.remove(record)
+        self.by_frequency[record.frequency].discard(record)
+        self.by_importance[record.importance].discard(record)
+
+    def add_goal(self, goal_type, goal):
+        self.goal_index.add((goal_type, goal), goal)
+
+    def remove_goal(self, goal_type, goal):
+        self.goal_index.remove((goal_type, goal))
+
+    def has_goal(self, goal_type, goal):
+        return (goal_type, goal) in self.goal_index
+
+    def find_tasks(
+        self, query="", frequency=None, importance=None, due_from=None, due_to=None
+    ):
+        """Tasks matching ``query`` and the filters, in task-table order.
+
+        ``due_from`` and ``due_to`` are inclusive date ordinals; when either
+        is given, tasks without a readable due date are left out. The result
+        is a read-only sequence that is only valid until the next change to
+        the tasks.
+        """
+        ordered = self.tasks.sorted_tasks()
+        candidate_sets = []
+        if query.strip():
+            candidate_sets.append(self.task_index.search(query))
+        if frequency:
+            candidate_sets.append(self.by_frequency[frequency])
+        if importance:
+            candidate_sets.append(self.by_importance[importance])
+        if due_from is not None or due_to is not None:
+            candidate_sets.append(set(self.tasks.due_between(due_from, due_to)))
+        if not candidate_sets:
+            return ordered
+
+        candidate_sets.sort(key=len)
+        matches = candidate_sets[0]
+        for candidates in candidate_sets[1:]:
+            if not matches:
+                break
+            matches = matches & candidates
+        if len(matches) <= SORT_MATCHES:
+            return sorted(matches, key=attrgetter("table_key"))
+        return OrderedMatches(ordered, matches)
+
+    def find_goals(self, query="", goal_type=None):
+        """``(goal_type, goal)`` pairs matching ``query``, in goal order."""
+        matches = self.goal_index.search(query) if query.strip() else None
+        return [
+            (each_type, goal)
+            for each_type, goals_list in self.goals.items()
+            if goal_type in (None, each_type)
+            for goal in goals_list
+            if matches is None or (each_type, goal) in matches
+        ]
+
+    def _add_facets(self, record):
+        self.by_frequency[record.frequency].add(record)
+        self.by_importance[record.importance].add(record)
@@ -0,0 +1,323 @@
+"""Indexed in-memory storage for planner tasks.
+
+Tasks are kept in a hash index on (frequency, name) for O(1) lookups and in
+sorted lists that are maintained on every add/remove, so the task table and
+the PDF export can read an already-sorted view instead of re-sorting. Due
+dates are parsed once when a task is added. Tasks with a readable due date
+also sit in a deadline list sorted by date, which answers date-range
+queries with two bisects. A task may be attached to one goal and marked
+done; neither affects the sort order.
+"""
+
+from bisect import bisect_left, bisect_right
+
+from due_dates import parse_due_date
+
+FREQUENCIES = ("Daily", "Weekly", "Monthly")
+IMPORTANCE_LEVELS = ("Low", "Medium", "High")
+IMPORTANCE_RANK = {"Low": 0, "Medium": 1, "High": 2}
+IMPORTANCE_COLORS = {"Low": "green", "Medium": "yellow", "High": "red"}
+FREQUENCY_RANK = {frequency: rank for rank, frequency in enumerate(FREQUENCIES)}
+# Sorts tasks without a readable due date after every dated task
+NO_DUE_DATE = float("inf")
+
+
+class Task:
+    __slots__ = (
+        "uid",
+        "task",
+        "due_date",
+        "schedule",
+        "importance",
+        "frequency",
+        "goal",
+        "done",
+        "due",
+        "table_key",
+        "report_key",
+    )
+
+    def __init__(
+        self,
+        uid,
+        task,
+        due_date,
+        schedule,
+        importance,
+        frequency,
+        goal=None,
+        done=False,
+    ):
+        self.uid = uid
+        self.task = task
+        self.due_date = due_date
+        self.schedule = schedule
+        self.importance = importance
+        self.frequency = frequency
+        # (goal_type, goal) the task counts towards, or None
+        self.goal = goal
+        self.done = done
+        # Date ordinal of due_date, or None if it is empty or not a date
+        self.due = parse_due_date(due_date)
+        rank = IMPORTANCE_RANK[importance]
+        # Task table: Low first, then by due date; ties keep the order in
+        # which the frequencies and tasks were added.
+        self.table_key = (
+            rank,
+            NO_DUE_DATE if self.due is None else self.due,
+            FREQUENCY_RANK[frequency],
+            uid,
+        )
+        # PDF report (per frequency): High first, then insertion order.
+        self.report_key = (-rank, uid)
+
+    @property
+    def key(self):
+        return (self.frequency, self.task)
+
+    def to_dict(self):
+        task_info = {
+            "task": self.task,
+            "due_date": self.due_date,
+            "schedule": self.schedule,
+            "importance": self.importance,
+            "frequency": self.frequency,
+        }
+        # Only set fields are written, so older files read the same way
+        if self.goal is not None:
+            task_info["goal_type"], task_info["goal"] = self.goal
+        if self.done:
+            task_info["done"] = True
+        return task_info
+
+    def __repr__(self):
+        return f"Task({self.frequency!r}, {self.task!r}, {self.importance!r})"
+
+
+def task_goal(task_info):
+    """The ``(goal_type, goal)`` a task dict is attached to, or None."""
+    goal = task_info.get("goal")
+    return (task_info.get("goal_type") or "Week", goal) if goal else None
+
+
+def _table_key(record):
+    return record.table_key
+
+
+def _report_key(record):
+    return record.report_key
+
+
+def _deadline_key(record):
+    return (record.due, record.uid)
+
+
+class TaskStore:
+    """Tasks indexed by (frequency, name) and kept in sorted order."""
+
+    def __init__(self):
+        self._next_uid = 0
+        # Bumped on every change, so derived views know when to rebuild
+        self.version = 0
+        self._index = {}
+        self._table_keys = []
+        self._table_order = []
+        self._report_keys = {frequency: [] for frequency in FREQUENCIES}
+        self._report_order = {frequency: [] for frequency in FREQUENCIES}
+        self._deadline_keys = []
+        self._deadline_order = []
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __iter__(self):
+        return iter(self._table_order)
+
+    def __getitem__(self, position):
+        return self._table_order[position]
+
+    def get(self, frequency, task):
+        return self._index.get((frequency, task))
+
+    def add(
+        self,
+        task,
+        due_date="",
+        frequency="Daily",
+        schedule="",
+        importance="Low",
+        goal_type=None,
+        goal=None,
+        done=False,
+    ):
+        if frequency not in FREQUENCY_RANK:
+            raise ValueError(f"Unknown frequency: {frequency!r}")
+        if importance not in IMPORTANCE_RANK:
+            raise ValueError(f"Unknown importance: {importance!r}")
+        key = (frequency, task)
+        if key in self._index:
+            raise ValueError(f"The task '{task}' has already been added.")
+
+        self._next_uid += 1
+        self.version += 1
+        record = Task(
+            self._next_uid,
+            task,
+            due_date,
+            schedule,
+            importance,
+            frequency,
+            task_goal({"goal_type": goal_type, "goal": goal}),
+            bool(done),
+        )
+        self._index[key] = record
+        self._insert(self._table_keys, self._table_order, record.table_key, record)
+        self._insert(
+            self._report_keys[frequency],
+            self._report_order[frequency],
+            record.report_key,
+            record,
+        )
+        if record.due is not None:
+            self._insert(
+                self._deadline_keys,
+                self._deadline_order,
+                _deadline_key(record),
+                record,
+            )
+        return record
+
+    def extend(self, task_dicts):
+        """Add many tasks at once, sorting the views once instead of per task.
+
+        Duplicates of tasks already in the store are skipped. Returns the
+        list of added Task records.
+        """
+        added = []
+        for task_info in task_dicts:
+            frequency = task_info.get("frequency", "Daily")
+            importance = task_info.get("importance", "Low")
+            if frequency not in FREQUENCY_RANK:
+                raise ValueError(f"Unknown frequency: {frequency!r}")
+            if importance not in IMPORTANCE_RANK:
+                raise ValueError(f"Unknown importance: {importance!r}")
+            key = (frequency, task_info["task"])
+            if key in self._index:
+                continue
+            self._next_uid += 1
+            record = Task(
+                self._next_uid,
+                task_info["task"],
+                task_info.get("due_date", ""),
+                task_info.get("schedule", ""),
+                importance,
+                frequency,
+                task_goal(task_info),
+                bool(task_info.get("done")),
+            )
+            self._index[key] = record
+            added.append(record)
+
+        if added:
+            self.version += 1
+            self._table_order.extend(added)
+            self._table_order.sort(key=_table_key)
+            self._table_keys = [record.table_key for record in self._table_order]
+            for frequency in {record.frequency for record in added}:
+                records = self._report_order[frequency]
+                records.extend(
+                    record for record in added if record.frequency == frequency
+                )
+                records.sort(key=_report_key)
+                self._report_keys[frequency] = [record.report_key for record in records]
+            self._deadline_order.extend(
+                record for record in added if record.due is not None
+            )
+            self._deadline_order.sort(key=_deadline_key)
+            self._deadline_keys = [
+                _deadline_key(record) for record in self._deadline_order
+            ]
+        return added
+
+    def remove(self, frequency, task):
+        record = self._index.pop((frequency, task))
+        self.version += 1
+        self._delete(self._table_keys, self._table_order, record.table_key)
+        self._delete(
+            self._report_keys[frequency],
+            self._report_order[frequency],
+            record.report_key,
+        )
+        if record.due is not None:
+            self._delete(
+                self._deadline_keys, self._deadline_order, _deadline_key(record)
+            )
+        return record
+
+    def set_done(self, frequency, task, done=True):
+        """Mark a task done or not done; returns the record and its old state."""
+        record = self._index[(frequency, task)]
+        previous = record.done
+        record.done = done
+        self.version += 1
+        return record, previous
+
+    def attach(self, frequency, task, goal):
+        """Attach a task to ``goal`` (``(goal_type, goal)``, or None to detach).
+
+        Returns the record and the goal it was attached to before.
+        """
+        record = self._index[(frequency, task)]
+        previous = record.goal
+        record.goal = goal
+        self.version += 1
+        return record, previous
+
+    def to_dicts(self):
+        """Task dicts in the order the tasks were added."""
+        return [record.to_dict() for record in self._index.values()]
+
+    def records(self):
+        """A new list of the Task records in the order they were added."""
+        return list(self._index.values())
+
+    def sorted_tasks(self):
+        """All tasks in task-table order. The returned list must not be mutated."""
+        return self._table_order
+
+    def frequency_tasks(self, frequency):
+        """Tasks of one frequency in report order. Must not be mutated."""
+        return self._report_order[frequency]
+
+    def due_between(self, first=None, last=None):
+        """Tasks due from ``first`` to ``last`` (inclusive date ordinals), by date.
+
+        Either bound may be None for an open range. Tasks without a readable
+        due date are never included.
+        """
+        start = 0 if first is None else bisect_left(self._deadline_keys, (first,))
+        if last is None:
+            end = len(self._deadline_keys)
+        else:
+            end = bisect_right(self._deadline_keys, (last, NO_DUE_DATE))
+        return self._deadline_order[start:end]
+
+    def next_due(self, today, count=1):
+        """The first ``count`` tasks due on or after ``today``, by date."""
+        start = bisect_left(self._deadline_keys, (today,))
+        return self._deadline_order[start : start + count]
+
+    @staticmethod
+    def _insert(keys, records, key, record):
+        position = bisect_left(keys, key)
+        keys.insert(position, key)
+        records.insert(position, record)
+
+    @staticmethod
+    def _delete(keys, records, key):
+        position = bisect_left(keys, key)
+        del keys[position]
+        del records[position]
@@ -0,0 +1,117 @@
+import itertools
+
+from autosave import AUTOSAVE_DELAY_MS, MAX_RETRY_DELAY_MS, Autosaver
+
+
+class FakeRoot:
+    """Stands in for Tk: ``after`` callbacks run one at a time on request."""
+
+    def __init__(self):
+        self.now = 0
+        self.timers = {}
+        self.ids = itertools.count()
+        self.scheduled = []
+
+    def after(self, ms, callback):
+        after_id = next(self.ids)
+        self.timers[after_id] = (self.now + ms, after_id, callback)
+        self.scheduled.append((ms, callback))
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.timers.pop(after_id, None)
+
+    def run_next(self):
+        when, after_id, callback = min(self.timers.values())
+        del self.timers[after_id]
+        self.now = when
+        callback()
+
+
+class FailingStorage:
+    """Snapshot writes fail while ``failures`` is above zero."""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.begun = 0
+        self.written = 0
+
+    def begin_compaction(self):
+        self.begun += 1
+        return self.begun
+
+    def finish_compaction(self, covered, tasks, goals):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk full")
+        self.written += 1
+
+
+def autosaver(storage, delay_ms=AUTOSAVE_DELAY_MS):
+    root = FakeRoot()
+    errors = []
+    saver = Autosaver(
+        root, storage, lambda: ([], {}), delay_ms=delay_ms, on_error=errors.append
+    )
+    return root, saver, errors
+
+
+def run_until_saved(root, saver, storage, writes):
+    """Run timers until ``writes`` snapshots are written and nothing is pending."""
+    while storage.written < writes or saver.pending:
+        if saver._job is not None:
+            # Let the worker finish before the Tk poll looks for its result
+            saver._job.join()
+        root.run_next()
+
+
+def save_delays(root, saver):
+    return [ms for ms, callback in root.scheduled if callback == saver.save]
+
+
+def test_retry_delay_doubles_up_to_the_cap_and_resets():
+    storage = FailingStorage(failures=8)
+    root, saver, errors = autosaver(storage)
+    saver.changed()
+    run_until_saved(root, saver, storage, 1)
+
+    assert save_delays(root, saver) == [
+        AUTOSAVE_DELAY_MS,
+        2000,
+        4000,
+        8000,
+        16000,
+        32000,
+        MAX_RETRY_DELAY_MS,
+        MAX_RETRY_DELAY_MS,
+        MAX_RETRY_DELAY_MS,
+    ]
+    assert len(errors) == 1 and isinstance(errors[0], OSError)
+    assert not saver.pending
+
+    # After a success the next failure starts again from the short delay
+    # and is reported again
+    root.scheduled.clear()
+    storage.failures = 1
+    saver.changed()
+    run_until_saved(root, saver, storage, 2)
+    assert save_delays(root, saver) == [AUTOSAVE_DELAY_MS, AUTOSAVE_DELAY_MS]
+    assert len(errors) == 2
+
+
+def test_change_during_a_write_is_saved_after_it():
+    storage = FailingStorage()
+    # A delay shorter than the job's 50 ms poll, so the second timer fires
+    # while the first write is still in flight
+    root, saver, errors = autosaver(storage, delay_ms=10)
+    saver.changed()
+    root.run_next()
+    saver.changed()
+    root.run_next()
+    assert saver._dirty
+    assert storage.begun == 1
+
+    run_until_saved(root, saver, storage, 2)
+    assert storage.begun == 2
+    assert not saver._dirty
+    assert not errors
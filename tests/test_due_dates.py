@@ -0,0 +1,54 @@
+from datetime import date
+
+import pytest
+
+from due_dates import DEADLINE_VIEWS, EXPORT_RANGES, deadline_range, parse_due_date
+
+TODAY = date(2025, 6, 18)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("5/7", date(2025, 7, 5)),
+        ("05/07/25", date(2025, 7, 5)),
+        ("5/7/2026", date(2026, 7, 5)),
+        ("2025-07-05", date(2025, 7, 5)),
+        ("  2025-07-05  ", date(2025, 7, 5)),
+        ("29/2", None),
+        ("31/4/25", None),
+        ("7/13/25", None),
+        ("tomorrow", None),
+        ("", None),
+    ],
+)
+def test_parse_due_date(text, expected):
+    expected = None if expected is None else expected.toordinal()
+    assert parse_due_date(text, TODAY) == expected
+
+
+def test_day_and_month_take_the_year_of_today():
+    assert parse_due_date("29/2", date(2024, 1, 1)) == date(2024, 2, 29).toordinal()
+    assert parse_due_date("1/1", date(2030, 5, 5)) == date(2030, 1, 1).toordinal()
+
+
+def test_deadline_ranges():
+    today = TODAY.toordinal()
+    assert deadline_range("Overdue", TODAY) == (None, today - 1)
+    assert deadline_range("Today", TODAY) == (today, today)
+    # 18 June 2025 is a Wednesday
+    assert deadline_range("This week", TODAY) == (today - 2, today + 4)
+    assert deadline_range("This month", TODAY) == (
+        date(2025, 6, 1).toordinal(),
+        date(2025, 6, 30).toordinal(),
+    )
+    assert deadline_range("This month", date(2024, 2, 10))[1] == (
+        date(2024, 2, 29).toordinal()
+    )
+
+
+def test_every_named_range_is_known():
+    for view in set(DEADLINE_VIEWS) | set(EXPORT_RANGES):
+        deadline_range(view, TODAY)
+    with pytest.raises(ValueError):
+        deadline_range("Next year", TODAY)
@@ -0,0 +1,91 @@
+from datetime import datetime
+
+import pytest
+
+from generate_invoice import (
+    WorkSummary,
+    generate_invoice_pdf,
+    price_materials,
+    summarize_work_entries,
+)
+
+
+def test_summarize_work_entries_groups_by_day():
+    entries = [
+        ("2/5/25", "5 joints for 225mm pipes"),
+        ("1/5/25", "3 joints for 225mm pipes"),
+        ("01/05/25", "1 joint for 90mm"),
+        ("2/5/25", "cleared the trench"),
+        ("1/5/25", "2 joints for 110mm pipes"),
+    ]
+    assert summarize_work_entries(entries, 10000) == WorkSummary(
+        2,
+        20000,
+        [
+            (
+                datetime(2025, 5, 1),
+                [
+                    "3 joints for 225mm pipes",
+                    "1 joint for 90mm",
+                    "2 joints for 110mm pipes",
+                ],
+            ),
+            (
+                datetime(2025, 5, 2),
+                ["5 joints for 225mm pipes", "cleared the trench"],
+            ),
+        ],
+    )
+
+
+def test_summarize_work_entries_with_another_format():
+    summary = summarize_work_entries([("2025-05-01", "site meeting")], 500, "%Y-%m-%d")
+    assert summary == WorkSummary(1, 500, [(datetime(2025, 5, 1), ["site meeting"])])
+    assert summarize_work_entries([], 500) == WorkSummary(0, 0, [])
+    with pytest.raises(ValueError):
+        summarize_work_entries([("2025-05-01", "site meeting")], 500)
+
+
+def test_price_materials():
+    unit_prices = {
+        "joint": 1500.0,
+        ("reducer joint", "110mm to 90mm"): 2500.0,
+    }
+    rows, total = price_materials(
+        [("90mm", "joint", 2), ("110mm to 90mm", "reducer joint", 1)], unit_prices
+    )
+    assert rows == [
+        ["90mm", "joint", "1,500.00", "2", "3,000.00"],
+        ["110mm to 90mm", "reducer joint", "2,500.00", "1", "2,500.00"],
+    ]
+    assert total == 5500.0
+
+
+def test_price_materials_names_every_unpriced_item():
+    with pytest.raises(ValueError) as error:
+        price_materials(
+            [
+                ("90mm", "joint", 2),
+                ("225mm", "t joint", 3),
+                ("160mm to 110mm", "reducer joint", 1),
+            ],
+            {"joint": 1500.0},
+        )
+    assert str(error.value) == (
+        "No unit price for: t joint (225mm), reducer joint (160mm to 110mm)"
+    )
+
+
+@pytest.mark.parametrize("backend", ["platypus", "canvas"])
+def test_generate_invoice_pdf_returns_days_and_total(tmp_path, backend):
+    output_path = str(tmp_path / "invoice.pdf")
+    days, total = generate_invoice_pdf(
+        [("1/5/25", "2 joints for 90mm"), ("2/5/25", "1 joint for 90mm")],
+        10000,
+        output_path=output_path,
+        materials=True,
+        backend=backend,
+    )
+    assert (days, total) == (2, 20000)
+    with open(output_path, "rb") as pdf_file:
+        assert pdf_file.read(5) == b"%PDF-"
@@ -0,0 +1,80 @@
+import random
+
+from goal_progress import GoalProgress, Progress, progress_text
+from task_store import TaskStore
+
+GOALS = {"Week": ["ship", "plan"], "Month": ["grow"], "Year": []}
+GOAL_KEYS = [(goal_type, goal) for goal_type, goals in GOALS.items() for goal in goals]
+
+
+def counted(store, goal):
+    """A goal's progress by scanning every task."""
+    attached = [record for record in store.records() if record.goal == goal]
+    return Progress(sum(record.done for record in attached), len(attached))
+
+
+def test_progress_text():
+    assert progress_text(Progress(0, 0)) == "-"
+    assert progress_text(Progress(3, 4)) == "3/4 (75%)"
+    assert progress_text(Progress(1, 3)) == "1/3 (33%)"
+
+
+def test_initial_counts_from_existing_tasks():
+    store = TaskStore()
+    store.add("a", goal_type="Week", goal="ship", done=True)
+    store.add("b", goal_type="Week", goal="ship")
+    store.add("c", goal_type="Month", goal="gone", done=True)
+    progress = GoalProgress(GOALS, store.records())
+
+    assert progress.progress("Week", "ship") == Progress(1, 2)
+    assert progress.progress("Week", "plan") == Progress(0, 0)
+    # A task attached to an unknown goal is not counted anywhere
+    assert progress.progress("Month", "gone") == Progress(0, 0)
+
+
+def test_counts_follow_random_changes():
+    rng = random.Random(0)
+    store = TaskStore()
+    progress = GoalProgress(GOALS)
+    for step in range(2000):
+        records = store.records()
+        action = rng.random()
+        if action < 0.3 or not records:
+            goal = rng.choice(GOAL_KEYS + [None])
+            goal_type, goal_name = goal or (None, None)
+            record = store.add(
+                f"task {step}",
+                goal_type=goal_type,
+                goal=goal_name,
+                done=rng.random() < 0.5,
+            )
+            progress.add_task(record)
+        elif action < 0.45:
+            progress.remove_task(store.remove(*rng.choice(records).key))
+        elif action < 0.75:
+            record = rng.choice(records)
+            progress.marked(*store.set_done(*record.key, not record.done))
+        else:
+            record = rng.choice(records)
+            goal = rng.choice(GOAL_KEYS + [None])
+            progress.moved(*store.attach(*record.key, goal))
+
+    for goal in GOAL_KEYS:
+        assert progress.progress(*goal) == counted(store, goal), goal
+        assert set(progress.tasks(*goal)) == {
+            record for record in store.records() if record.goal == goal
+        }
+
+
+def test_remove_goal_returns_its_tasks():
+    store = TaskStore()
+    first = store.add("a", goal_type="Week", goal="ship")
+    second = store.add("b", goal_type="Week", goal="ship", done=True)
+    store.add("c", goal_type="Month", goal="grow")
+    progress = GoalProgress(GOALS, store.records())
+
+    assert set(progress.remove_goal("Week", "ship")) == {first, second}
+    assert progress.progress("Week", "ship") == Progress(0, 0)
+    assert progress.progress("Month", "grow") == Progress(0, 1)
+    # Detaching a task from the removed goal must not fail
+    progress.moved(*store.attach(*first.key, None))
@@ -0,0 +1,71 @@
+import json
+import os
+
+from invoice_batch import MANIFEST_NAME, generate_invoices, group_ledger
+
+
+def ledger_row(client, date, description="2 joints for 90mm", project="Mains"):
+    return {
+        "client": client,
+        "project": project,
+        "date": date,
+        "description": description,
+    }
+
+
+def test_group_ledger_by_month_skips_bad_dates():
+    rows = [
+        ledger_row("Acme", "1/5/25"),
+        ledger_row("Acme", "2025-05-02"),
+        ledger_row("Acme", "3/6/25"),
+        ledger_row("Bolt", "1/5/25", "site meeting"),
+        ledger_row("Acme", "31/5/25"),
+        ledger_row("Bolt", ""),
+    ]
+    errors = []
+    groups = group_ledger(rows, errors=errors)
+
+    assert list(groups) == [
+        ("Acme", "Mains", "2025-05"),
+        ("Acme", "Mains", "2025-06"),
+        ("Bolt", "Mains", "2025-05"),
+    ]
+    assert groups[("Acme", "Mains", "2025-05")] == [
+        ("1/5/25", "2 joints for 90mm"),
+        ("31/5/25", "2 joints for 90mm"),
+    ]
+    assert [(number, row["date"]) for number, row, _ in errors] == [
+        (2, "2025-05-02"),
+        (6, ""),
+    ]
+    assert "2025-05-02" in errors[0][2]
+
+
+def test_group_ledger_all_still_checks_dates():
+    groups = group_ledger(
+        [ledger_row("Acme", "1/5/25"), ledger_row("Acme", "soon")], period="all"
+    )
+    assert dict(groups) == {("Acme", "Mains", "all"): [("1/5/25", "2 joints for 90mm")]}
+
+
+def test_bad_rows_are_reported_in_the_manifest(tmp_path):
+    out_dir = str(tmp_path / "invoices")
+    manifest = generate_invoices(
+        [
+            ledger_row("Acme", "1/5/25"),
+            ledger_row("Acme", "32/5/25"),
+            ledger_row("Acme", "2/5/25"),
+        ],
+        out_dir,
+        1000,
+        workers=1,
+    )
+
+    invoice, bad_row = manifest
+    assert invoice["entries"] == 2 and invoice["days"] == 2
+    assert os.path.exists(invoice["path"])
+    assert bad_row["row"] == 2
+    assert bad_row["path"] is None and bad_row["period"] is None
+    assert "32/5/25" in bad_row["error"]
+    with open(os.path.join(out_dir, MANIFEST_NAME), encoding="utf-8") as f:
+        assert json.load(f) == manifest
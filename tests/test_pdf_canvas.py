@@ -0,0 +1,133 @@
+import random
+
+import pytest
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import Paragraph
+
+from pdf_canvas import (
+    CELL_BOTTOM_PADDING,
+    CELL_TOP_PADDING,
+    FONT,
+    FONT_SIZE,
+    FRAME_BOTTOM,
+    FRAME_TOP,
+    HEADER_HEIGHT,
+    LEADING,
+    CanvasDocument,
+    GridRows,
+    WrappedText,
+    build_canvas,
+    cell_lines,
+    check_backend,
+    wrap_text,
+)
+
+CELL_STYLE = ParagraphStyle("cell", fontName=FONT, fontSize=FONT_SIZE, leading=LEADING)
+ROW_HEIGHT = LEADING + CELL_TOP_PADDING + CELL_BOTTOM_PADDING
+PAGE_HEIGHT = FRAME_TOP - FRAME_BOTTOM
+
+
+def paragraph_lines(text, width):
+    paragraph = Paragraph(text, CELL_STYLE)
+    paragraph.wrap(width, 10**6)
+    return [" ".join(words) for _, words in paragraph.blPara.lines]
+
+
+@pytest.mark.parametrize("width", [60, 80, 150, 204])
+def test_wrap_text_breaks_lines_like_a_paragraph(width):
+    rng = random.Random(width)
+    words = ["joint", "pipes", "225mm", "a", "reducer", "the", "trench", "WWW", "for"]
+    for _ in range(200):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(1, 30)))
+        assert wrap_text(text, width) == paragraph_lines(text, width), text
+
+
+def test_wrap_text_widths():
+    lines = wrap_text("  2 joints   for\n225mm pipes, cleared the trench ", 70)
+    assert lines == ["2 joints for", "225mm pipes,", "cleared the", "trench"]
+    space = stringWidth(" ", FONT, FONT_SIZE)
+    for line in lines:
+        assert stringWidth(line, FONT, FONT_SIZE) <= 70 + space * line.count(" ")
+    # A word wider than the column is kept whole on its own line
+    assert wrap_text("a reducerjoint b", 40) == ["a", "reducerjoint", "b"]
+
+
+def test_cell_lines():
+    assert cell_lines(WrappedText("short"), 100) == (True, ("short",))
+    assert cell_lines(WrappedText("cleared the trench"), 38) == (
+        True,
+        ["cleared", "the", "trench"],
+    )
+    assert cell_lines("9:00\n10:00", 10) == (False, ["9:00", "10:00"])
+    assert cell_lines(12.5, 100) == (False, ("12.5",))
+
+
+class RecordingDocument(CanvasDocument):
+    """Keeps ``(header drawn, row heights)`` of every grid segment drawn."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.segments = []
+
+    def draw_segment(self, grid, segment, header=True):
+        self.segments.append((header, [height for height, _, _ in segment]))
+        super().draw_segment(grid, segment, header)
+
+
+def lay_out(tmp_path, grid):
+    document = RecordingDocument(str(tmp_path / "grid.pdf"))
+    document.add(grid)
+    document.canvas.save()
+    return document
+
+
+@pytest.mark.parametrize("repeat_header", [False, True])
+def test_grid_rows_break_across_pages(tmp_path, repeat_header):
+    rows = [(str(number), "row") for number in range(100)]
+    grid = GridRows(["N", "Text"], iter(rows), [50, 100], repeat_header=repeat_header)
+    document = lay_out(tmp_path, grid)
+
+    first_page = int((PAGE_HEIGHT - HEADER_HEIGHT) // ROW_HEIGHT)
+    later_pages = int(
+        (PAGE_HEIGHT - (HEADER_HEIGHT if repeat_header else 0)) // ROW_HEIGHT
+    )
+    counts = [len(heights) for _, heights in document.segments]
+    assert counts[:2] == [first_page, later_pages]
+    assert sum(counts) == len(rows)
+    assert document.pages == len(counts)
+    assert [header for header, _ in document.segments] == [True] + [repeat_header] * (
+        len(counts) - 1
+    )
+
+
+def test_a_wrapped_row_that_does_not_fit_moves_to_the_next_page(tmp_path):
+    available = PAGE_HEIGHT - HEADER_HEIGHT
+    single_rows = int(available // ROW_HEIGHT) - 1
+    rows = [("1", "row")] * single_rows
+    # Three lines tall: more than is left after the single rows
+    rows.append(("2", WrappedText("cleared the trench")))
+    rows.append(("3", "last"))
+    grid = GridRows(["N", "Text"], rows, [50, 50], repeat_header=True)
+    document = lay_out(tmp_path, grid)
+
+    tall_row = 3 * LEADING + CELL_TOP_PADDING + CELL_BOTTOM_PADDING
+    assert available - single_rows * ROW_HEIGHT < tall_row
+    assert document.segments == [
+        (True, [ROW_HEIGHT] * single_rows),
+        (True, [tall_row, ROW_HEIGHT]),
+    ]
+
+
+def test_build_canvas_writes_the_story(tmp_path):
+    path = str(tmp_path / "story.pdf")
+    story = [
+        Paragraph("Daily planner", CELL_STYLE),
+        GridRows(["N"], [("1",)] * 80, [50]),
+    ]
+    assert build_canvas(path, story) == 3
+    with open(path, "rb") as pdf_file:
+        assert pdf_file.read(5) == b"%PDF-"
+    assert check_backend("canvas") == "canvas"
+    with pytest.raises(ValueError):
+        check_backend("fast")
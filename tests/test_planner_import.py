@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from planner_import import read_import
+from planner_io import load_planner_file
+
+
+def write_lines(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_bad_json_lines_are_counted_as_invalid(tmp_path):
+    path = write_lines(
+        tmp_path / "tasks.jsonl",
+        [
+            json.dumps({"task": "Order pipes", "frequency": "Weekly"}),
+            '{"task": "cut off',
+            "",
+            json.dumps({"task": 5}),
+            "[1, 2]",
+            json.dumps({"goal": "Ship", "goal_type": "Month"}),
+            json.dumps({"task": "Order pipes", "frequency": "Weekly"}),
+        ],
+    )
+    batch = read_import(path)
+
+    assert [task["task"] for task in batch.tasks] == ["Order pipes"]
+    assert batch.goals == [("Month", "Ship")]
+    assert batch.invalid == 3
+    assert batch.duplicates == 1
+    assert [number for number, _ in batch.errors] == [2, 3, 4]
+    assert batch.errors[0][1].startswith("invalid JSON")
+
+
+def test_load_planner_file_names_the_bad_row(tmp_path):
+    path = write_lines(
+        tmp_path / "tasks.jsonl", [json.dumps({"task": "Order pipes"}), "{oops"]
+    )
+    with pytest.raises(ValueError, match="row 2: invalid JSON"):
+        load_planner_file(path)
@@ -0,0 +1,172 @@
+import asyncio
+import json
+
+import pytest
+
+from planner_service import PlannerService
+
+
+def call(service, *requests):
+    """Send HTTP requests to ``service``, one connection each.
+
+    Each request is ``(method, path, body)``, where body is a JSON-ready
+    value or None; bytes are sent as raw header lines instead. Returns
+    ``(status, decoded body)`` pairs.
+    """
+
+    async def exchange():
+        server = await asyncio.start_server(service.handle_connection, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        responses = []
+        try:
+            for method, path, body in requests:
+                responses.append(await send(port, method, path, body))
+        finally:
+            server.close()
+            await server.wait_closed()
+        return responses
+
+    return asyncio.run(exchange())
+
+
+async def send(port, method, path, body):
+    head = f"{method} {path} HTTP/1.1\r\nConnection: close\r\n".encode()
+    if isinstance(body, bytes):
+        head += body
+        payload = b""
+    else:
+        payload = b"" if body is None else json.dumps(body).encode()
+        head += f"Content-Length: {len(payload)}\r\n".encode()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(head + b"\r\n" + payload)
+    response = await reader.read()
+    writer.close()
+    status_line, _, rest = response.partition(b"\r\n")
+    _, _, content = rest.partition(b"\r\n\r\n")
+    status = int(status_line.split()[1])
+    if content and not content.startswith(b"%PDF"):
+        content = json.loads(content)
+    return status, content
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = PlannerService(
+        data_dir=str(tmp_path / "data"), workers=1, cache_dir=str(tmp_path / "cache")
+    )
+    yield service
+    asyncio.run(service.close())
+
+
+def test_task_and_goal_round_trip(service):
+    responses = call(
+        service,
+        ("POST", "/goals", {"goal": "Ship pipes"}),
+        ("POST", "/tasks", {"task": "Order pipes", "frequency": "Weekly"}),
+        ("PATCH", "/tasks/Weekly/Order%20pipes", {"goal": "Ship pipes", "done": True}),
+        ("GET", "/tasks?query=ord", None),
+        ("GET", "/goals", None),
+        ("DELETE", "/tasks/Weekly/Order%20pipes", None),
+        ("GET", "/tasks", None),
+    )
+    assert [status for status, _ in responses] == [201, 201, 200, 200, 200, 204, 200]
+    assert responses[3][1]["tasks"][0]["goal"] == "Ship pipes"
+    assert responses[4][1] == [
+        {"goal_type": "Week", "goal": "Ship pipes", "done": 1, "total": 1}
+    ]
+    assert responses[6][1] == {"total": 0, "tasks": []}
+
+
+@pytest.mark.parametrize(
+    "path, body",
+    [
+        ("/tasks", {"task": 5}),
+        ("/tasks", {"task": "Valid", "goal": 5}),
+        ("/tasks", {"task": "Valid", "due_date": ["2025-01-01"]}),
+        ("/tasks", {"task": "Valid", "frequency": "Hourly"}),
+        ("/tasks", {"task": "  "}),
+        ("/tasks", [1, 2]),
+        ("/goals", {"goal": 5}),
+        ("/goals", {"goal": "Valid", "goal_type": 5}),
+        ("/goals", {"goal": "Valid", "goal_type": "Decade"}),
+        ("/goals", {}),
+    ],
+)
+def test_invalid_bodies_are_rejected(service, path, body):
+    [(status, content)] = call(service, ("POST", path, body))
+    assert status == 400
+    assert content["error"]
+    assert len(service.tasks) == 0
+    assert not service.search.find_goals()
+
+
+def test_rejected_patch_changes_nothing(service):
+    call(
+        service,
+        ("POST", "/goals", {"goal": "Ship"}),
+        ("POST", "/tasks", {"task": "Order"}),
+    )
+    responses = call(
+        service,
+        ("PATCH", "/tasks/Daily/Order", {"goal": "Ship", "done": "yes"}),
+        ("PATCH", "/tasks/Daily/Order", {"goal": "Ship", "extra": 1}),
+        ("PATCH", "/tasks/Daily/Order", {"goal": "Missing", "done": True}),
+        ("PATCH", "/tasks/Daily/Order", {"goal_type": "Week"}),
+        ("PATCH", "/tasks/Daily/Missing", {"done": True}),
+    )
+    assert [status for status, _ in responses] == [400, 400, 400, 400, 404]
+    record = service.tasks.get("Daily", "Order")
+    assert record.goal is None and not record.done
+    assert service.goal_progress.progress("Week", "Ship").total == 0
+
+
+@pytest.mark.parametrize("length", [b"abc", b"-5"])
+def test_bad_content_length_is_a_400(service, length):
+    request = b"Content-Length: " + length + b"\r\n"
+    [(status, content)] = call(service, ("POST", "/tasks", request))
+    assert status == 400
+    assert "Content-Length" in content["error"]
+
+
+def test_unknown_routes_and_methods(service):
+    responses = call(
+        service,
+        ("GET", "/nothing", None),
+        ("PUT", "/tasks", None),
+        ("GET", "/tasks?limit=x", None),
+    )
+    assert [status for status, _ in responses] == [404, 405, 400]
+
+
+def test_planner_pdf_and_metrics(service):
+    responses = call(
+        service,
+        ("POST", "/tasks", {"task": "Order pipes"}),
+        ("POST", "/planner.pdf", {"date": "2025-06-18", "backend": "canvas"}),
+        ("POST", "/planner.pdf", {"date": 20250618}),
+        ("POST", "/planner.pdf", {"backend": "fast"}),
+        ("POST", "/invoice.pdf", {"work_entries": [["1/5/25", 5]], "daily_rate": 1}),
+        ("GET", "/metrics", None),
+    )
+    assert [status for status, _ in responses] == [201, 200, 400, 400, 400, 200]
+    assert responses[1][1].startswith(b"%PDF")
+    assert responses[5][1]["tasks"] == 1
+    assert responses[5][1]["routes"]["POST /planner.pdf"]["errors"] == 2
+
+
+def test_changes_survive_a_restart(service, tmp_path):
+    call(
+        service,
+        ("POST", "/goals", {"goal": "Ship", "goal_type": "Month"}),
+        ("POST", "/tasks", {"task": "Order", "goal": "Ship", "goal_type": "Month"}),
+    )
+    asyncio.run(service.close())
+
+    restarted = PlannerService(
+        data_dir=str(tmp_path / "data"), workers=1, cache_dir=str(tmp_path / "cache")
+    )
+    try:
+        assert restarted.tasks.get("Daily", "Order").goal == ("Month", "Ship")
+        assert restarted.goal_progress.progress("Month", "Ship").total == 1
+    finally:
+        asyncio.run(restarted.close())
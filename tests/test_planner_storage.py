@@ -0,0 +1,160 @@
+import json
+import os
+
+import pytest
+
+from planner_storage import SNAPSHOT_NAME, PlannerStorage, segment_name
+
+
+def task(name, frequency="Daily"):
+    return {
+        "task": name,
+        "due_date": "",
+        "schedule": "",
+        "importance": "Low",
+        "frequency": frequency,
+    }
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    return str(tmp_path / "planner")
+
+
+def reopen(data_dir):
+    """Load the directory as a fresh start would, as after a crash."""
+    storage = PlannerStorage(data_dir)
+    tasks, goals = storage.load()
+    storage.close()
+    return tasks, goals
+
+
+def journal_path(data_dir, storage):
+    return os.path.join(data_dir, segment_name(storage.segment))
+
+
+def test_journal_replay_applies_every_operation(data_dir):
+    storage = PlannerStorage(data_dir)
+    storage.load()
+    storage.add_tasks([task("a"), task("b"), task("c", "Weekly")])
+    storage.set_goals([("Week", "ship"), ("Month", "plan")])
+    storage.set_task_done("Daily", "a", True)
+    storage.attach_task("Daily", "b", ("Week", "ship"))
+    storage.attach_task("Weekly", "c", ("Month", "plan"))
+    storage.delete_task("Daily", "a")
+    storage.delete_goal("Month", "plan")
+    storage.set_goal("Year", "grow")
+    storage.close()
+
+    tasks, goals = reopen(data_dir)
+    assert tasks == [
+        {**task("b"), "goal_type": "Week", "goal": "ship"},
+        {**task("c", "Weekly"), "goal_type": None, "goal": None},
+    ]
+    assert goals == {"Week": ["ship"], "Month": [], "Year": ["grow"]}
+
+
+def test_empty_directory_loads_empty(data_dir):
+    assert reopen(data_dir) == ([], {"Week": [], "Month": [], "Year": []})
+
+
+def test_torn_last_line_is_truncated(data_dir):
+    storage = PlannerStorage(data_dir)
+    storage.load()
+    storage.add_task(task("kept"))
+    path = journal_path(data_dir, storage)
+    storage.close()
+    good_size = os.path.getsize(path)
+    with open(path, "a", encoding="utf-8") as journal:
+        journal.write('{"op":"add_task","task":{"task":"torn"')
+
+    tasks, _ = reopen(data_dir)
+    assert [task_info["task"] for task_info in tasks] == ["kept"]
+    assert os.path.getsize(path) == good_size
+
+    # Appends after the truncation start on a clean line
+    storage = PlannerStorage(data_dir)
+    storage.load()
+    storage.add_task(task("after"))
+    storage.close()
+    tasks, _ = reopen(data_dir)
+    assert [task_info["task"] for task_info in tasks] == ["kept", "after"]
+
+
+def test_corrupt_line_drops_it_and_the_rest(data_dir):
+    storage = PlannerStorage(data_dir)
+    storage.load()
+    storage.add_task(task("kept"))
+    path = journal_path(data_dir, storage)
+    storage.close()
+    with open(path, "a", encoding="utf-8") as journal:
+        journal.write("not json\n")
+        journal.write(json.dumps({"op": "add_task", "task": task("lost")}) + "\n")
+
+    tasks, _ = reopen(data_dir)
+    assert [task_info["task"] for task_info in tasks] == ["kept"]
+
+
+def test_compaction_writes_snapshot_and_removes_covered_segments(data_dir):
+    storage = PlannerStorage(data_dir)
+    storage.load()
+    storage.add_task(task("a"))
+    storage.set_goal("Week", "ship")
+    covered = storage.begin_compaction()
+    storage.add_task(task("b"))
+    storage.finish_compaction(covered, [task("a")], {"Week": ["ship"]})
+    storage.close()
+
+    assert storage.segments() == [covered]
+    assert storage.journal_records == 1
+    tasks, goals = reopen(data_dir)
+    assert [task_info["task"] for task_info in tasks] == ["a", "b"]
+    assert goals["Week"] == ["ship"]
+
+
+def test_crash_before_the_snapshot_is_written(data_dir):
+    storage = PlannerStorage(data_dir)
+    storage.load()
+    storage.add_task(task("a"))
+    storage.begin_compaction()
+    storage.add_task(task("b"))
+    # The worker never wrote the snapshot; both segments are still there
+
+    tasks, _ = reopen(data_dir)
+    assert [task_info["task"] for task_info in tasks] == ["a", "b"]
+    assert not os.path.exists(os.path.join(data_dir, SNAPSHOT_NAME))
+
+
+def test_crash_while_writing_the_snapshot(data_dir):
+    storage = PlannerStorage(data_dir)
+    storage.load()
+    storage.add_task(task("a"))
+    storage.compact([task("a")], {"Week": []})
+    storage.add_task(task("b"))
+    covered = storage.begin_compaction()
+    # A half-written temp file next to the intact previous snapshot
+    with open(os.path.join(data_dir, SNAPSHOT_NAME + ".tmp"), "w") as temp_file:
+        temp_file.write('{"segment": %d, "tasks": [' % covered)
+
+    tasks, _ = reopen(data_dir)
+    assert [task_info["task"] for task_info in tasks] == ["a", "b"]
+
+
+def test_crash_after_the_snapshot_before_cleanup(data_dir):
+    storage = PlannerStorage(data_dir)
+    storage.load()
+    storage.add_task(task("a"))
+    storage.delete_task("Daily", "a")
+    covered = storage.begin_compaction()
+    storage.add_task(task("b"))
+    old_segments = [number for number in storage.segments() if number < covered]
+    # The snapshot was replaced but the old segments were not yet removed
+    storage.finish_compaction(covered, [], {})
+    for number in old_segments:
+        with open(os.path.join(data_dir, segment_name(number)), "w") as segment:
+            segment.write(json.dumps({"op": "add_task", "task": task("a")}) + "\n")
+
+    tasks, _ = reopen(data_dir)
+    # The covered segment would bring "a" back; it is removed, not replayed
+    assert [task_info["task"] for task_info in tasks] == ["b"]
+    assert all(number >= covered for number in storage.segments())
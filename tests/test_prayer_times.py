@@ -0,0 +1,103 @@
+import math
+from datetime import date, timedelta
+
+import pytest
+
+from prayer_times import (
+    NO_TIME,
+    TIMES,
+    PrayerSettings,
+    compute_times,
+    day_times,
+    format_time,
+    settings_from_env,
+    sunnah_times,
+    year_table,
+)
+
+CAIRO = PrayerSettings(30.0444, 31.2357, "Africa/Cairo", "Egypt", "Standard")
+TROMSO = PrayerSettings(69.65, 18.96, "Europe/Oslo", "MWL", "Standard")
+
+
+def minutes(text):
+    hours, rest = text.split(":")
+    return int(hours) * 60 + int(rest)
+
+
+@pytest.mark.parametrize(
+    "day, expected",
+    [
+        # Published Egyptian General Authority of Survey times for Cairo
+        (date(2025, 6, 18), ("4:08", "5:53", "12:56", "16:32", "19:59", "21:32")),
+        (date(2025, 1, 1), ("5:18", "6:51", "11:59", "14:48", "17:07", "18:29")),
+    ],
+)
+def test_cairo_matches_the_published_times(day, expected):
+    times = day_times(day.toordinal(), CAIRO)
+    for name, computed, published in zip(TIMES, times, expected):
+        assert abs(computed - minutes(published)) <= 2, name
+
+
+def test_year_table_round_trip():
+    for year in (2024, 2025):
+        table = year_table(CAIRO, year)
+        days = (date(year + 1, 1, 1) - date(year, 1, 1)).days
+        assert table.typecode == "h"
+        assert len(table) == days * len(TIMES)
+        assert year_table(CAIRO, year) is table
+
+        first = date(year, 1, 1)
+        for offset in range(days):
+            when = first + timedelta(days=offset)
+            expected = tuple(
+                round(hours * 60) % (24 * 60) for hours in compute_times(when, CAIRO)
+            )
+            assert day_times(when.toordinal(), CAIRO) == expected, when
+
+
+def test_times_that_do_not_happen_are_no_time():
+    midsummer = date(2025, 6, 21)
+    hours = compute_times(midsummer, TROMSO)
+    assert math.isnan(hours[1]) and math.isnan(hours[4])
+
+    fajr, sunrise, dhuhr, asr, maghrib, isha = day_times(midsummer.toordinal(), TROMSO)
+    assert (fajr, sunrise, maghrib, isha) == (NO_TIME,) * 4
+    assert NO_TIME not in (dhuhr, asr)
+    assert dict(sunnah_times(midsummer.toordinal(), TROMSO)) == {
+        "Duha": NO_TIME,
+        "Tahajjud": NO_TIME,
+        "shroq": NO_TIME,
+    }
+
+
+def test_sunnah_times_follow_the_day():
+    day = date(2025, 6, 18).toordinal()
+    fajr, sunrise, _, _, maghrib, _ = day_times(day, CAIRO)
+    next_fajr = day_times(day + 1, CAIRO)[0]
+    sunnah = dict(sunnah_times(day, CAIRO))
+
+    assert sunnah["shroq"] == sunrise
+    assert sunnah["Duha"] == sunrise + 20
+    # The last third of the night, which runs past midnight
+    night = next_fajr + 24 * 60 - maghrib
+    assert sunnah["Tahajjud"] == (maghrib + night * 2 // 3) % (24 * 60)
+    assert 0 < sunnah["Tahajjud"] < fajr
+
+
+def test_format_time():
+    assert format_time(0) == "12:00 AM"
+    assert format_time(7 * 60 + 5) == "7:05 AM"
+    assert format_time(12 * 60) == "12:00 PM"
+    assert format_time(19 * 60 + 59) == "7:59 PM"
+    assert format_time(NO_TIME) == "-"
+
+
+def test_settings_from_env():
+    settings = settings_from_env(
+        {"PLANNER_LATITUDE": "51.5", "PLANNER_TIMEZONE": "+1", "PLANNER_ASR": "Hanafi"}
+    )
+    assert settings == PrayerSettings(51.5, 31.2357, "+1", "Egypt", "Hanafi")
+    with pytest.raises(ValueError):
+        settings_from_env({"PLANNER_PRAYER_METHOD": "Lunar"})
+    with pytest.raises(ValueError):
+        settings_from_env({"PLANNER_ASR": "Late"})
@@ -0,0 +1,93 @@
+import calendar
+from datetime import date, timedelta
+
+from due_dates import parse_due_date
+from recurrence import DayPlan, Occurrence, Recurrence
+from task_store import FREQUENCIES, TaskStore
+
+
+def happens_on(record, when):
+    """Whether ``record`` falls on ``when``, straight from the rules."""
+    due = parse_due_date(record.due_date)
+    due = None if due is None else date.fromordinal(due)
+    if record.frequency == "Daily":
+        return True
+    if record.frequency == "Weekly":
+        return when.weekday() == (0 if due is None else due.weekday())
+    day = 1 if due is None else due.day
+    return when.day == min(day, calendar.monthrange(when.year, when.month)[1])
+
+
+def planner():
+    store = TaskStore()
+    store.add("every day")
+    store.add("undated weekly", frequency="Weekly")
+    store.add("thursday", due_date="2025-01-02", frequency="Weekly", importance="High")
+    store.add("undated monthly", frequency="Monthly")
+    for day in (15, 29, 30, 31):
+        store.add(f"on the {day}th", due_date=f"2025-01-{day}", frequency="Monthly")
+    store.add("unreadable", due_date="soon", frequency="Monthly")
+    return store
+
+
+def recurrence_of(store):
+    return Recurrence(
+        (frequency, store.frequency_tasks(frequency)) for frequency in FREQUENCIES
+    )
+
+
+def test_tasks_on_matches_the_rules_over_two_years():
+    store = planner()
+    recurrence = recurrence_of(store)
+    first = date(2024, 1, 1)
+    for offset in range(731):
+        when = first + timedelta(days=offset)
+        sections = recurrence.tasks_on(when.toordinal())
+        assert [frequency for frequency, _ in sections] == list(FREQUENCIES)
+        for frequency, tasks in sections:
+            assert list(tasks) == [
+                record
+                for record in store.frequency_tasks(frequency)
+                if happens_on(record, when)
+            ], (when, frequency)
+
+
+def test_month_end_gathers_the_late_days_in_report_order():
+    recurrence = recurrence_of(planner())
+    february = dict(recurrence.tasks_on(date(2025, 2, 28).toordinal()))["Monthly"]
+    april = dict(recurrence.tasks_on(date(2025, 4, 30).toordinal()))["Monthly"]
+    leap = dict(recurrence.tasks_on(date(2024, 2, 29).toordinal()))["Monthly"]
+
+    assert [record.task for record in february] == [
+        "on the 29th",
+        "on the 30th",
+        "on the 31th",
+    ]
+    assert [record.task for record in april] == ["on the 30th", "on the 31th"]
+    assert [record.task for record in leap] == [
+        "on the 29th",
+        "on the 30th",
+        "on the 31th",
+    ]
+
+
+def test_expand_and_occurrences_cover_the_window():
+    recurrence = recurrence_of(planner())
+    first = date(2025, 3, 1).toordinal()
+    last = first + 30
+
+    plans = list(recurrence.expand(first, last))
+    assert [plan.day for plan in plans] == list(range(first, last + 1))
+    assert all(isinstance(plan, DayPlan) for plan in plans)
+
+    occurrences = list(recurrence.occurrences(first, last))
+    assert occurrences == [
+        Occurrence(plan.day, record)
+        for plan in plans
+        for _, tasks in plan.sections
+        for record in tasks
+    ]
+    assert (
+        sum(1 for occurrence in occurrences if occurrence.task.task == "every day")
+        == 31
+    )
@@ -0,0 +1,101 @@
+import os
+
+from planner_pdf import render_key
+from planner_snapshot import PlannerSnapshot
+from render_cache import RenderCache, snapshot_digest
+from task_store import TaskStore
+
+GOALS = {"Week": ["ship"], "Month": [], "Year": []}
+
+
+def snapshot(store, date="2025-06-18"):
+    return PlannerSnapshot.capture(store, GOALS, date)
+
+
+def write_pdf(path, content):
+    with open(path, "wb") as pdf_file:
+        pdf_file.write(content)
+    return str(path)
+
+
+def read(path):
+    with open(path, "rb") as pdf_file:
+        return pdf_file.read()
+
+
+def test_keys_follow_the_inputs():
+    store = TaskStore()
+    store.add("Order pipes", goal_type="Week", goal="ship")
+    digest = snapshot_digest(snapshot(store))
+
+    assert snapshot_digest(snapshot(store, "2025-06-19")) == digest
+    key = render_key("planner", digest, "2025-06-18", None, "platypus")
+    assert render_key("planner", digest, "2025-06-18", None, "platypus") == key
+    assert render_key("planner", digest, "2025-06-19", None, "platypus") != key
+    assert render_key("planner", digest, "2025-06-18", None, "canvas") != key
+    assert render_key("range", digest, "2025-06-18", None, "platypus") != key
+
+    # Any change to the tasks or the goal progress makes a new digest
+    store.set_done("Daily", "Order pipes", True)
+    done_digest = snapshot_digest(snapshot(store))
+    assert done_digest != digest
+    store.add("Lay pipes", schedule="9:00")
+    assert snapshot_digest(snapshot(store)) not in (digest, done_digest)
+
+
+def test_fetch_links_the_cached_pdf(tmp_path):
+    cache = RenderCache(str(tmp_path / "cache"))
+    rendered = write_pdf(tmp_path / "rendered.pdf", b"%PDF planner")
+    target = str(tmp_path / "out.pdf")
+
+    assert not cache.fetch("key", target)
+    assert not os.path.exists(target)
+    cache.store("key", rendered)
+    assert cache.fetch("key", target)
+    assert read(target) == b"%PDF planner"
+    assert os.path.samefile(target, cache.path("key"))
+    # Fetching onto the cached file itself leaves it alone
+    assert cache.fetch("key", target)
+    assert read(target) == b"%PDF planner"
+
+
+def test_fetch_copies_where_links_fail(tmp_path, monkeypatch):
+    cache = RenderCache(str(tmp_path / "cache"))
+    cache.store("key", write_pdf(tmp_path / "rendered.pdf", b"%PDF planner"))
+
+    def no_links(source, target):
+        raise OSError("links not supported")
+
+    monkeypatch.setattr(os, "link", no_links)
+    target = write_pdf(tmp_path / "out.pdf", b"old")
+    assert cache.fetch("key", target)
+    assert read(target) == b"%PDF planner"
+    assert not os.path.samefile(target, cache.path("key"))
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".part")] == []
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = RenderCache(str(tmp_path / "cache"), max_entries=2)
+    for number, key in enumerate(("a", "b")):
+        cache.store(key, write_pdf(tmp_path / f"{key}.pdf", b"%PDF " + key.encode()))
+        # Stored long ago, "a" before "b"
+        os.utime(cache.path(key), (1000 + number, 1000 + number))
+
+    assert cache.fetch("a", str(tmp_path / "out.pdf"))
+    cache.store("c", write_pdf(tmp_path / "c.pdf", b"%PDF c"))
+
+    assert os.path.exists(cache.path("a"))
+    assert not os.path.exists(cache.path("b"))
+    assert os.path.exists(cache.path("c"))
+
+
+def test_eviction_keeps_within_max_bytes(tmp_path):
+    cache = RenderCache(str(tmp_path / "cache"), max_bytes=10)
+    cache.store("old", write_pdf(tmp_path / "old.pdf", b"x" * 6))
+    os.utime(cache.path("old"), (1000, 1000))
+    cache.store("new", write_pdf(tmp_path / "new.pdf", b"y" * 6))
+
+    assert not os.path.exists(cache.path("old"))
+    assert read(cache.path("new")) == b"y" * 6
+    cache.clear()
+    assert os.listdir(cache.cache_dir) == []
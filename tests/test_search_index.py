@@ -0,0 +1,153 @@
+import random
+
+from due_dates import parse_due_date
+from search_index import OrderedMatches, PlannerSearch, SearchIndex, tokenize
+from task_store import FREQUENCIES, IMPORTANCE_LEVELS, TaskStore
+
+WORDS = ("call", "calendar", "site", "office", "pipe", "pipeline", "order", "a1")
+
+
+def scan(items, query):
+    """What SearchIndex.search should return, by brute force."""
+    words = tokenize(query)
+    if not words:
+        return set()
+    return {
+        key
+        for key, texts in items.items()
+        if all(
+            any(item_word.startswith(word) for item_word in tokenize(" ".join(texts)))
+            for word in words
+        )
+    }
+
+
+def test_tokenize_lowercases_and_splits_on_non_words():
+    assert tokenize("Call Site-Office, 225mm!") == ["call", "site", "office", "225mm"]
+
+
+def test_prefix_search_matches_every_query_word():
+    index = SearchIndex()
+    index.add(1, "Call site office")
+    index.add(2, "Order pipes", "calendar")
+    index.add(3, "Pipeline order")
+
+    assert index.search("ca") == {1, 2}
+    assert index.search("call") == {1}
+    assert index.search("pipe ord") == {2, 3}
+    assert index.search("PIPELINE") == {3}
+    assert index.search("missing") == set()
+    assert index.search("  ") == set()
+
+
+def test_search_matches_a_scan_through_adds_and_removes():
+    rng = random.Random(0)
+    index = SearchIndex()
+    items = {}
+    for key in range(400):
+        items[key] = (" ".join(rng.sample(WORDS, 3)), rng.choice(WORDS))
+    index.extend(items.items())
+    for key in rng.sample(sorted(items), 200):
+        index.remove(key)
+        del items[key]
+    for key in range(400, 450):
+        items[key] = (rng.choice(WORDS),)
+        index.add(key, *items[key])
+
+    assert len(index) == len(items)
+    for query in ("c", "ca", "cal", "cale", "pipe", "pipel", "o s", "a1", "zz", ""):
+        assert index.search(query) == scan(items, query), query
+
+
+def test_removing_the_last_item_of_a_word_forgets_it():
+    index = SearchIndex()
+    index.add("a", "unique")
+    index.add("b", "other")
+    index.remove("a")
+
+    assert "a" not in index
+    assert index.search("uni") == set()
+    assert "unique" not in index._words
+    assert "u" not in index._prefixes
+
+
+def test_ordered_matches_behaves_like_the_filtered_list():
+    ordered = list(range(5000))
+    matches = set(range(0, 5000, 7))
+    expected = [number for number in ordered if number in matches]
+    view = OrderedMatches(ordered, matches, chunk=64)
+
+    assert view[:10] == expected[:10]
+    assert view[3] == expected[3]
+    assert len(view) == len(expected)
+    assert view[-1] == expected[-1]
+    assert list(view) == expected
+
+
+def planner(count=500, seed=1):
+    rng = random.Random(seed)
+    store = TaskStore()
+    for number in range(count):
+        store.add(
+            f"{rng.choice(WORDS)} {number}",
+            due_date=rng.choice(["", "2025-06-01", "2025-06-15", "2025-07-01"]),
+            frequency=rng.choice(FREQUENCIES),
+            schedule=rng.choice(["", "morning", "evening"]),
+            importance=rng.choice(IMPORTANCE_LEVELS),
+        )
+    return store
+
+
+def test_find_tasks_filters_in_table_order():
+    store = planner()
+    search = PlannerSearch(store, {})
+    first, last = parse_due_date("2025-06-01"), parse_due_date("2025-06-30")
+
+    found = search.find_tasks(
+        "pipe", frequency="Weekly", importance="High", due_from=first, due_to=last
+    )
+    assert list(found) == [
+        record
+        for record in store.sorted_tasks()
+        if any(word.startswith("pipe") for word in tokenize(record.task))
+        and record.frequency == "Weekly"
+        and record.importance == "High"
+        and record.due is not None
+        and first <= record.due <= last
+    ]
+    assert search.find_tasks() is store.sorted_tasks()
+    assert [record.task for record in search.find_tasks("morn")] == [
+        record.task for record in store.sorted_tasks() if record.schedule == "morning"
+    ]
+
+
+def test_find_tasks_follows_adds_and_removes():
+    store = planner(50)
+    search = PlannerSearch(store, {})
+    record = store.add("Unusual errand", schedule="noon")
+    search.add_task(record)
+    assert list(search.find_tasks("unus")) == [record]
+
+    search.remove_task(store.remove(*record.key))
+    assert list(search.find_tasks("unus")) == []
+    assert record not in search.by_frequency[record.frequency]
+
+
+def test_find_goals_keeps_goal_order():
+    goals = {"Week": ["Ship pipes", "Call office"], "Month": ["Pipeline survey"]}
+    search = PlannerSearch(TaskStore(), goals)
+
+    assert search.find_goals("pipe") == [
+        ("Week", "Ship pipes"),
+        ("Month", "Pipeline survey"),
+    ]
+    assert search.find_goals("", goal_type="Week") == [
+        ("Week", "Ship pipes"),
+        ("Week", "Call office"),
+    ]
+    assert search.has_goal("Month", "Pipeline survey")
+
+    goals["Week"].remove("Call office")
+    search.remove_goal("Week", "Call office")
+    assert not search.has_goal("Week", "Call office")
+    assert search.find_goals("call") == []
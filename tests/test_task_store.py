@@ -0,0 +1,189 @@
+import random
+
+import pytest
+
+from due_dates import parse_due_date
+from task_store import FREQUENCIES, IMPORTANCE_LEVELS, TaskStore
+
+
+def make_store(count, seed=0):
+    rng = random.Random(seed)
+    store = TaskStore()
+    for number in range(count):
+        due_date = rng.choice(
+            ["", "not a date", f"2025-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}"]
+        )
+        store.add(
+            f"task {number}",
+            due_date=due_date,
+            frequency=rng.choice(FREQUENCIES),
+            importance=rng.choice(IMPORTANCE_LEVELS),
+        )
+    return store
+
+
+def assert_consistent(store):
+    """Every view holds exactly the indexed tasks, in its own sort order."""
+    records = store.records()
+    assert len(store) == len(records)
+    for record in records:
+        assert store.get(*record.key) is record
+        assert record.key in store
+
+    table = store.sorted_tasks()
+    assert table == sorted(records, key=lambda record: record.table_key)
+    assert list(store) == table
+    assert store._table_keys == [record.table_key for record in table]
+
+    for frequency in FREQUENCIES:
+        expected = sorted(
+            (record for record in records if record.frequency == frequency),
+            key=lambda record: record.report_key,
+        )
+        assert store.frequency_tasks(frequency) == expected
+        assert store._report_keys[frequency] == [
+            record.report_key for record in expected
+        ]
+
+    dated = sorted(
+        (record for record in records if record.due is not None),
+        key=lambda record: (record.due, record.uid),
+    )
+    assert store.due_between() == dated
+    assert store._deadline_keys == [(record.due, record.uid) for record in dated]
+
+
+def test_table_order_is_importance_then_due_date_then_frequency():
+    store = TaskStore()
+    store.add("later", due_date="2025-05-02", importance="Low")
+    store.add("undated", importance="Low")
+    store.add("weekly", due_date="2025-05-01", frequency="Weekly", importance="Low")
+    store.add("daily", due_date="2025-05-01", importance="Low")
+    store.add("high", due_date="2025-01-01", importance="High")
+    store.add("medium", importance="Medium")
+
+    assert [record.task for record in store] == [
+        "daily",
+        "weekly",
+        "later",
+        "undated",
+        "medium",
+        "high",
+    ]
+
+
+def test_report_order_is_high_first_then_insertion():
+    store = TaskStore()
+    for task, importance in (
+        ("a", "Low"),
+        ("b", "High"),
+        ("c", "Medium"),
+        ("d", "High"),
+    ):
+        store.add(task, importance=importance)
+
+    assert [record.task for record in store.frequency_tasks("Daily")] == [
+        "b",
+        "d",
+        "c",
+        "a",
+    ]
+    assert store.frequency_tasks("Weekly") == []
+
+
+def test_add_rejects_duplicates_and_unknown_values():
+    store = TaskStore()
+    store.add("task")
+    with pytest.raises(ValueError):
+        store.add("task")
+    with pytest.raises(ValueError):
+        store.add("other", frequency="Hourly")
+    with pytest.raises(ValueError):
+        store.add("other", importance="Urgent")
+    # The same name under another frequency is a different task
+    store.add("task", frequency="Weekly")
+    assert len(store) == 2
+
+
+def test_extend_matches_adding_one_by_one():
+    task_dicts = [record.to_dict() for record in make_store(200).records()]
+    store = TaskStore()
+    added = store.extend(task_dicts + task_dicts[:10])
+
+    assert len(added) == 200
+    assert store.to_dicts() == task_dicts
+    assert_consistent(store)
+
+
+def test_views_stay_consistent_through_adds_and_removes():
+    rng = random.Random(1)
+    store = make_store(300)
+    assert_consistent(store)
+
+    for record in rng.sample(store.records(), 150):
+        removed = store.remove(*record.key)
+        assert removed is record
+        assert record.key not in store
+    assert_consistent(store)
+
+    store.extend(
+        [{"task": f"new {number}", "due_date": "2025-03-03"} for number in range(50)]
+    )
+    store.add("last", due_date="2025-03-03", importance="High")
+    assert_consistent(store)
+
+
+def test_set_done_and_attach_keep_the_order():
+    store = make_store(100)
+    order = list(store)
+    versions = [store.version]
+
+    for record in order[::3]:
+        changed, previous = store.set_done(*record.key, True)
+        assert changed is record and previous is False and record.done
+        versions.append(store.version)
+    for record in order[::4]:
+        changed, previous = store.attach(*record.key, ("Week", "goal"))
+        assert changed is record and previous is None
+        versions.append(store.version)
+    record, previous = store.attach(*order[0].key, None)
+    assert previous == ("Week", "goal") and record.goal is None
+
+    assert list(store) == order
+    assert versions == sorted(set(versions))
+    assert_consistent(store)
+
+
+def test_to_dict_only_writes_set_fields():
+    store = TaskStore()
+    record = store.add("task", goal_type="Month", goal="ship", done=True)
+    assert record.goal == ("Month", "ship")
+    assert record.to_dict() == {
+        "task": "task",
+        "due_date": "",
+        "schedule": "",
+        "importance": "Low",
+        "frequency": "Daily",
+        "goal_type": "Month",
+        "goal": "ship",
+        "done": True,
+    }
+    assert "done" not in store.add("plain").to_dict()
+
+
+def test_due_between_and_next_due():
+    store = TaskStore()
+    for day in (5, 1, 3, 3, 9):
+        store.add(f"due {day} {len(store)}", due_date=f"2025-06-0{day}")
+    store.add("undated")
+    first, last = parse_due_date("2025-06-02"), parse_due_date("2025-06-05")
+
+    assert [record.due_date for record in store.due_between(first, last)] == [
+        "2025-06-03",
+        "2025-06-03",
+        "2025-06-05",
+    ]
+    assert len(store.due_between(None, last)) == 4
+    assert [record.due_date for record in store.next_due(first, 2)] == [
+        "2025-06-03"
+    ] * 2
@@ -0,0 +1,114 @@
+import pytest
+
+from work_quantities import (
+    MaterialSummary,
+    ParsedDescription,
+    WorkItem,
+    iter_work_items,
+    parse_description,
+    read_description,
+    size_key,
+    summarize_materials,
+    unit_price,
+    unit_prices_from_json,
+)
+
+
+@pytest.mark.parametrize(
+    "text, items",
+    [
+        ("6 joints for 225mm pipes", [WorkItem(6, "joint", "225mm")]),
+        ("1 joint for 90mm", [WorkItem(1, "joint", "90mm")]),
+        ("3 t joints for 225mm pipes", [WorkItem(3, "t joint", "225mm")]),
+        (
+            "2 joints reducer for 110mm to 90mm",
+            [WorkItem(2, "reducer joint", "110mm to 90mm")],
+        ),
+        (
+            "2 joints for reducer 160mm to 110mm",
+            [WorkItem(2, "reducer joint", "160mm to 110mm")],
+        ),
+        ("joints for 160mm pipes", [WorkItem(None, "joint", "160mm")]),
+        (
+            "7 Joints for 225MM pipes, 2 joints for 90mm; 1 joint for 110 mm",
+            [
+                WorkItem(7, "joint", "225mm"),
+                WorkItem(2, "joint", "90mm"),
+                WorkItem(1, "joint", "110mm"),
+            ],
+        ),
+        (
+            "4 joints for 160mm pipes and 3 joints for 225mm pipes.",
+            [WorkItem(4, "joint", "160mm"), WorkItem(3, "joint", "225mm")],
+        ),
+    ],
+)
+def test_read_description(text, items):
+    assert read_description(text) == ParsedDescription(tuple(items), ())
+
+
+def test_clauses_that_are_not_quantities_are_kept_unparsed():
+    parsed = read_description("cleared the trench, 2 joints for 90mm, , site meeting")
+    assert parsed.items == (WorkItem(2, "joint", "90mm"),)
+    assert parsed.unparsed == ("cleared the trench", "site meeting")
+
+
+def test_parse_description_is_cached():
+    text = "5 joints for 110mm pipes"
+    assert parse_description(text) is parse_description(text)
+    assert parse_description(text) == read_description(text)
+
+
+def test_iter_work_items_streams_every_quantity():
+    entries = [("1/5/25", "1 joint for 90mm, 2 joints for 225mm"), ("2/5/25", "rest")]
+    assert list(iter_work_items(iter(entries))) == [
+        ("1/5/25", WorkItem(1, "joint", "90mm")),
+        ("1/5/25", WorkItem(2, "joint", "225mm")),
+    ]
+
+
+def test_summarize_materials_totals_per_size_and_item():
+    descriptions = [
+        "6 joints for 225mm pipes",
+        "2 joints reducer for 110mm to 90mm, 4 joints for 225mm pipes",
+        "6 joints for 225mm pipes",
+        "1 joint for 90mm, joints for 160mm pipes",
+        "3 t joints for 225mm pipes, cleared the trench",
+        "cleared the trench",
+    ]
+    assert summarize_materials(iter(descriptions)) == MaterialSummary(
+        rows=(
+            ("90mm", "joint", 1),
+            ("110mm to 90mm", "reducer joint", 2),
+            ("225mm", "joint", 16),
+            ("225mm", "t joint", 3),
+        ),
+        unquantified=1,
+        unparsed=2,
+    )
+
+
+def test_size_key_orders_by_millimetres():
+    sizes = ["225mm", "90mm", "160mm to 110mm", "110mm", "160mm"]
+    assert sorted(sizes, key=size_key) == [
+        "90mm",
+        "110mm",
+        "160mm",
+        "160mm to 110mm",
+        "225mm",
+    ]
+
+
+def test_unit_prices_by_size_then_item():
+    unit_prices = unit_prices_from_json(
+        {"joint": 1500, "reducer joint": {"110mm to 90mm": "2500", "*": 2200}}
+    )
+    assert unit_prices == {
+        "joint": 1500.0,
+        ("reducer joint", "110mm to 90mm"): 2500.0,
+        "reducer joint": 2200.0,
+    }
+    assert unit_price(unit_prices, "joint", "90mm") == 1500.0
+    assert unit_price(unit_prices, "reducer joint", "110mm to 90mm") == 2500.0
+    assert unit_price(unit_prices, "reducer joint", "160mm to 110mm") == 2200.0
+    assert unit_price(unit_prices, "t joint", "225mm") is None
@@ -0,0 +1,166 @@
+"""A virtual-scrolling table on top of ttk.Treeview.
+
+The Treeview only ever holds the rows in view plus a small buffer. The rows
+come from a backing sequence (e.g. TaskStore.sorted_tasks()) that is sliced
+as the user scrolls, so memory and redraw cost do not depend on how many
+rows the sequence has. Rows keep stable iids while they stay in the window,
+and each refresh only inserts, moves, edits or removes the rows that
+changed, as the full-table version of the task list did.
+"""
+
+from tkinter import ttk
+
+import instrumentation
+
+# Fallback row height in pixels until the Treeview has drawn a row
+DEFAULT_ROW_HEIGHT = 20
+
+
+class VirtualTable:
+    def __init__(self, parent, columns, render_row, row_id, buffer_rows=5, **kwargs):
+        # render_row(item) -> (values, tags); row_id(item) -> stable hashable id
+        self.render_row = render_row
+        self.row_id = row_id
+        self.buffer_rows = buffer_rows
+        self.source = []
+        self.offset = 0
+        self.visible_rows = 10
+        self.selected_item = None
+        # iid -> (item, values, tags) as last written, plus on-screen order
+        self.rows = {}
+        self.order = []
+
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=columns, **kwargs)
+        self.scrollbar = ttk.Scrollbar(
+            self.frame, orient="vertical", command=self.on_scrollbar
+        )
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", expand=True, fill="both")
+
+        self.tree.bind("<Configure>", self.on_resize)
+        self.tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", lambda event: self.scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda event: self.scroll_by(3))
+        self.tree.bind("<Prior>", lambda event: self.scroll_by(-self.visible_rows))
+        self.tree.bind("<Next>", lambda event: self.scroll_by(self.visible_rows))
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def set_source(self, source):
+        """Show ``source``, any sequence supporting ``len()`` and slicing."""
+        self.source = source
+        self.refresh()
+
+    def selected(self):
+        """Return the selected item, even if it has been scrolled out of view."""
+        return self.selected_item
+
+    def select(self, item):
+        """Select ``item``, or clear the selection with ``None``."""
+        self.selected_item = item
+        self.refresh()
+
+    def scroll_by(self, rows):
+        self.scroll_to(self.offset + rows)
+        return "break"
+
+    def scroll_to(self, offset):
+        last_offset = max(len(self.source) - self.visible_rows, 0)
+        offset = min(max(int(offset), 0), last_offset)
+        if offset != self.offset:
+            self.offset = offset
+            self.refresh()
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(float(amount) * len(self.source))
+        elif unit == "pages":
+            self.scroll_by(int(amount) * self.visible_rows)
+        else:
+            self.scroll_by(int(amount))
+
+    def on_mousewheel(self, event):
+        return self.scroll_by(-3 if event.delta > 0 else 3)
+
+    def on_resize(self, event=None):
+        visible_rows = self.measure_visible_rows()
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.refresh()
+
+    def on_select(self, event=None):
+        selection = self.tree.selection()
+        if selection and selection[0] in self.rows:
+            self.selected_item = self.rows[selection[0]][0]
+
+    def measure_visible_rows(self):
+        row_height = DEFAULT_ROW_HEIGHT
+        top = 0
+        if self.order:
+            box = self.tree.bbox(self.order[0])
+            if box:
+                top, row_height = box[1], box[3]
+        height = self.tree.winfo_height() - top
+        return max(height // max(row_height, 1), 1)
+
+    @instrumentation.timed("virtual_table.refresh")
+    def refresh(self):
+        """Bring the rows in view up to date with the source."""
+        total = len(self.source)
+        self.offset = min(self.offset, max(total - self.visible_rows, 0))
+        window = self.source[
+            self.offset : self.offset + self.visible_rows + self.buffer_rows
+        ]
+
+        wanted = []
+        rows = {}
+        for item in window:
+            iid = str(self.row_id(item))
+            values, tags = self.render_row(item)
+            wanted.append(iid)
+            rows[iid] = (item, values, tags)
+
+        instrumentation.count("virtual_table.rows_rendered", len(wanted))
+        stale = [iid for iid in self.rows if iid not in rows]
+        if stale:
+            self.tree.delete(*stale)
+            for iid in stale:
+                del self.rows[iid]
+            self.order = [iid for iid in self.order if iid in rows]
+
+        for index, iid in enumerate(wanted):
+            item, values, tags = rows[iid]
+            if iid not in self.rows:
+                self.tree.insert("", index, iid=iid, values=values, tags=tags)
+                instrumentation.count("virtual_table.rows_inserted")
+                self.order.insert(index, iid)
+            else:
+                if self.order[index] != iid:
+                    self.tree.move(iid, "", index)
+                    self.order.remove(iid)
+                    self.order.insert(index, iid)
+                if self.rows[iid][1:] != (values, tags):
+                    self.tree.item(iid, values=values, tags=tags)
+            self.rows[iid] = rows[iid]
+
+        # Keep the remembered selection highlighted while it is in view
+        selected_iid = None
+        if self.selected_item is not None:
+            selected_iid = str(self.row_id(self.selected_item))
+        if selected_iid in self.rows:
+            if self.tree.selection() != (selected_iid,):
+                self.tree.selection_set(selected_iid)
+        elif self.tree.selection():
+            self.tree.selection_set(())
+        self.tree.yview_moveto(0)
+
+        if total:
+            self.scrollbar.set(
+                self.offset / total,
+                min(self.offset + self.visible_rows, total) / total,
+            )
+        else:
+            self.scrollbar.set(0, 1)
@@ -0,0 +1,172 @@
+"""Quantities of material in invoice work descriptions.
+
+Work descriptions are free text such as ``"7 joints for 225mm pipes, 2
+joints for 90mm"`` or ``"2 joints reducer for 110mm to 90mm"``. A
+description is lowercased and split into clauses at commas, semicolons and
+"and", and each clause is matched by one precompiled pattern:
+
+    [quantity] item words for [item word] <size>mm [to <size>mm] [pipe(s)]
+
+Each clause becomes a ``WorkItem(quantity, item, size)``:
+
+* quantity: the leading number, or None when the clause has none
+  ("joints for 160mm pipes")
+* item: the item words in the singular, with ``joint`` last, e.g.
+  ``joint``, ``t joint`` or ``reducer joint``
+* size: ``225mm``, or ``160mm to 110mm`` for a reducer
+
+Clauses that do not match are kept as ``unparsed`` text. Ledgers repeat
+the same few descriptions over and over. summarize_materials therefore
+counts the descriptions first and parses each distinct one once.
+parse_description caches its results for callers that go entry by entry.
+"""
+
+import re
+from collections import Counter, namedtuple
+from functools import lru_cache
+
+# Distinct descriptions remembered by parse_description
+PARSE_CACHE_SIZE = 65536
+
+# quantity None: the clause names no number
+WorkItem = namedtuple("WorkItem", "quantity item size")
+ParsedDescription = namedtuple("ParsedDescription", "items unparsed")
+# rows: ((size, item, quantity), ...) by size; unquantified: clauses with no
+# number; unparsed: clauses that are not quantities at all
+MaterialSummary = namedtuple("MaterialSummary", "rows unquantified unparsed")
+
+# Descriptions are lowercased before matching, so no IGNORECASE is needed
+CLAUSE = re.compile(
+    r"(?:(?P<quantity>\d+)\s+)?"
+    r"(?P<item>[a-z][a-z\s-]*?)\s+for\s+"
+    r"(?:(?P<extra>[a-z]+)\s+)?"
+    r"(?P<size>\d+)\s*mm(?:\s+to\s+(?P<size_to>\d+)\s*mm)?"
+    r"(?:\s+pipes?)?\.?"
+)
+SIZE_NUMBERS = re.compile(r"\d+")
+
+
+def singular(word):
+    return word[:-1] if len(word) > 3 and word.endswith("s") else word
+
+
+@lru_cache(maxsize=None)
+def item_name(item, extra=None):
+    """``joints reducer`` -> ``reducer joint``; ``t joints`` -> ``t joint``.
+
+    ``extra`` is a word after "for", as in "joints for reducer 160mm".
+    """
+    words = item.split()
+    if extra:
+        words.append(extra)
+    words = [singular(word) for word in words]
+    if "joint" in words:
+        words = [word for word in words if word != "joint"] + ["joint"]
+    return " ".join(words)
+
+
+def split_clauses(text):
+    """Split lowercased ``text`` at commas, semicolons and "and"."""
+    clauses = text.replace(";", ",").split(",")
+    if " and " in text:
+        clauses = [part for clause in clauses for part in clause.split(" and ")]
+    return clauses
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_description(text):
+    """Return the ParsedDescription of one work description (cached)."""
+    return read_description(text)
+
+
+def read_description(text):
+    """parse_description without the cache."""
+    items = []
+    unparsed = []
+    for clause in split_clauses(text.lower()):
+        clause = clause.strip()
+        if not clause:
+            continue
+        match = CLAUSE.fullmatch(clause)
+        if match is None:
+            unparsed.append(clause)
+            continue
+        quantity, item, extra, size, size_to = match.groups()
+        size = f"{size}mm" if size_to is None else f"{size}mm to {size_to}mm"
+        items.append(
+            WorkItem(
+                None if quantity is None else int(quantity),
+                item_name(item, extra),
+                size,
+            )
+        )
+    return ParsedDescription(tuple(items), tuple(unparsed))
+
+
+def iter_work_items(work_entries):
+    """Yield ``(date, WorkItem)`` for every quantity in ``(date, description)`` pairs.
+
+    Streams, so it can run over a ledger of any size.
+    """
+    for date_str, description in work_entries:
+        for work_item in parse_description(description).items:
+            yield date_str, work_item
+
+
+def size_key(size):
+    """Sort sizes by their millimetres, largest reducer end first."""
+    return tuple(int(number) for number in SIZE_NUMBERS.findall(size))
+
+
+def summarize_materials(descriptions):
+    """Total quantity per size and item over an iterable of descriptions.
+
+    Returns a MaterialSummary. The iterable is consumed once. Each distinct
+    description is parsed once and its quantities are multiplied by the
+    number of times it occurs.
+    """
+    totals = {}
+    unquantified = 0
+    unparsed = 0
+    # Counting first means every distinct description is read exactly once,
+    # so the parse cache would only add overhead here
+    for description, occurrences in Counter(descriptions).items():
+        parsed = read_description(description)
+        unparsed += len(parsed.unparsed) * occurrences
+        for work_item in parsed.items:
+            if work_item.quantity is None:
+                unquantified += occurrences
+                continue
+            key = (work_item.size, work_item.item)
+            totals[key] = totals.get(key, 0) + work_item.quantity * occurrences
+    rows = tuple(
+        (size, item, quantity)
+        for (size, item), quantity in sorted(
+            totals.items(), key=lambda entry: (size_key(entry[0][0]), entry[0][1])
+        )
+    )
+    return MaterialSummary(rows, unquantified, unparsed)
+
+
+def unit_price(unit_prices, item, size):
+    """Price of one ``item`` of ``size``: by ``(item, size)``, else by ``item``.
+
+    Returns None when ``unit_prices`` has neither.
+    """
+    price = unit_prices.get((item, size))
+    return unit_prices.get(item) if price is None else price
+
+
+def unit_prices_from_json(data):
+    """Unit prices from JSON: item -> price, or item -> {size: price}.
+
+    Within an item, a ``"*"`` size is the price of every other size.
+    """
+    unit_prices = {}
+    for item, price in data.items():
+        if isinstance(price, dict):
+            for size, size_price in price.items():
+                unit_prices[item if size == "*" else (item, size)] = float(size_price)
+        else:
+            unit_prices[item] = float(price)
+    return unit_prices